@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""
+Benchmarks ALE parsing throughput in rows per second.
+
+The ASC_SOP fields of a synthetic ALE are first split on their own, both
+with the precompiled tokenizer ``parse_ale`` uses and with the
+``ast.literal_eval`` approach it replaced. Then the whole ALE is parsed with
+``parse_ale``, which includes building every ColorCorrection.
+
+Finally a wide ALE, with 80 unused columns after the ones we read, is parsed
+with ``parse_ale``. Splitting its rows in full is timed against splitting
+them only up to the last column read, as ``parse_ale`` does.
+
+Usage:
+
+    $ python benchmarks/bench_ale.py [rows]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+from ast import literal_eval
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+from cdl_convert import parse  # pylint: disable=C0413
+from bench_fast_math import build_ale  # pylint: disable=C0413
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+WIDE_COLUMNS = ['Name', 'Tape', 'Start', 'End', 'ASC_SAT', 'ASC_SOP'] + [
+    'Extra{0}'.format(i) for i in range(80)
+]
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def build_wide_ale(rows):
+    """Writes an ALE with 86 columns and returns its path"""
+    rand = random.Random(1)
+    ale_file, path = tempfile.mkstemp(suffix='.ale')
+    with os.fdopen(ale_file, 'w') as ale:
+        ale.write(
+            'Heading\nFIELD_DELIM\tTABS\nFPS\t24\n\nColumn\n' +
+            '\t'.join(WIDE_COLUMNS) + '\n\nData\n'
+        )
+        extra = '\t'.join('value{0}'.format(i) for i in range(80))
+        for i in range(rows):
+            values = ['{0:.6f}'.format(rand.uniform(0.5, 1.5)) for j in range(9)]
+            ale.write(
+                'A{0:06d}C001\tTAPE{1}\t01:00:00:00\t01:00:10:00\t{2:.6f}\t'
+                '({3} {4} {5})({6} {7} {8})({9} {10} {11})\t{12}\n'.format(
+                    i, i % 40, rand.uniform(0.5, 1.5), *(values + [extra])
+                )
+            )
+    return path
+
+
+def literal_eval_sop(sop):
+    """Splits an ASC_SOP field the way parse_ale used to"""
+    sop = sop.replace(' ', ', ')
+    sop = sop.replace(')(', ')|(')
+    sop = sop.split('|')
+    return literal_eval(sop[0]), literal_eval(sop[1]), literal_eval(sop[2])
+
+
+def read_sops(ale_path):
+    """Returns the ASC_SOP field of every data row in the ALE"""
+    with open(ale_path, 'r') as ale:
+        lines = ale.read().split('Data\n', 1)[1].splitlines()
+    return [line.split('\t')[4] for line in lines]
+
+
+def time_rows(func, rows):
+    """Calls func on every row, returns seconds taken"""
+    start = time.time()
+    for row, sop in enumerate(rows, 1):
+        func(sop, row)
+    return time.time() - start
+
+
+def time_parse(ale_path, **kwargs):
+    """Parses the ALE, returns seconds taken"""
+    cdl_convert.reset_all()
+    start = time.time()
+    cdl_convert.parse_ale(ale_path, **kwargs)
+    return time.time() - start
+
+
+def time_wide(count):
+    """Times splitting and parsing a wide ALE"""
+    ale_path = build_wide_ale(count)
+    try:
+        with open(ale_path, 'r') as ale:
+            rows = ale.read().split('Data\n', 1)[1].splitlines()
+        last = WIDE_COLUMNS.index('ASC_SOP')
+        return [
+            (
+                'split all',
+                time_rows(lambda line, row: line.split('\t'), rows)
+            ),
+            (
+                'split needed',
+                time_rows(lambda line, row: line.split('\t', last + 1), rows)
+            ),
+            ('wide parse', time_parse(ale_path)),
+            (
+                'wide + meta',
+                time_parse(ale_path, columns=['Tape', 'Start', 'End'])
+            ),
+        ]
+    finally:
+        os.remove(ale_path)
+
+
+def main():
+    """Times the tokenizers and a full parse"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ale_path = build_ale(count)
+
+    try:
+        sops = read_sops(ale_path)
+        results = [
+            (
+                'literal_eval',
+                time_rows(lambda sop, row: literal_eval_sop(sop), sops)
+            ),
+            (
+                'tokenizer',
+                time_rows(
+                    lambda sop, row: parse._split_sop(sop, ale_path, row),  # pylint: disable=W0212
+                    sops
+                )
+            ),
+        ]
+
+        results.append(('parse_ale', time_parse(ale_path)))
+    finally:
+        os.remove(ale_path)
+
+    results.extend(time_wide(count))
+
+    print('{0} ALE rows'.format(count))
+    print('{0:>14} {1:>10} {2:>12}'.format('step', 'seconds', 'rows/s'))
+    for step, elapsed in results:
+        print(
+            '{0:>14} {1:>10.3f} {2:>12,.0f}'.format(
+                step, elapsed, count / elapsed
+            )
+        )
+
+if __name__ == '__main__':
+    main()
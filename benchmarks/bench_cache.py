@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmarks loading a .ccc through a ParseCache against parsing it.
+
+A synthetic .ccc is parsed with ``parse_file`` , then loaded through a
+``ParseCache`` twice: once into an empty cache, which parses the file and
+stores the entry, and once more, which rebuilds the collection from that
+entry without touching the XML.
+
+Usage:
+
+    $ python benchmarks/bench_cache.py [count]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+from bench_slots import build_ccc  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def time_load(filepath, cache=None):
+    """Parses or loads the file, returns seconds taken"""
+    cdl_convert.reset_all()
+    start = time.time()
+    cdl_convert.parse_file(filepath, cache=cache)
+    return time.time() - start
+
+
+def main():
+    """Times parsing, a cache miss and a cache hit"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    filepath = build_ccc(count)
+    directory = tempfile.mkdtemp()
+
+    try:
+        cache = cdl_convert.ParseCache(directory)
+        results = [
+            ('parse', time_load(filepath)),
+            ('cache miss', time_load(filepath, cache)),
+            ('cache hit', time_load(filepath, cache)),
+        ]
+        entry_size = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in os.listdir(directory)
+        )
+        source_size = os.path.getsize(filepath)
+    finally:
+        os.remove(filepath)
+        shutil.rmtree(directory)
+
+    print('{0} corrections'.format(count))
+    print('{0:>12} {1:>10} {2:>12}'.format('step', 'seconds', 'cc/s'))
+    for step, elapsed in results:
+        print(
+            '{0:>12} {1:>10.3f} {2:>12,.0f}'.format(
+                step, elapsed, count / elapsed
+            )
+        )
+    print(
+        'entry is {0:,} bytes, the ccc is {1:,} bytes'.format(
+            entry_size, source_size
+        )
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmarks loading a collection from .cdlb against loading it from .ccc.
+
+A synthetic .ccc is parsed, written out as .cdlb, and both files are loaded
+in full. Then single corrections are looked up by id in the .cdlb with a
+``CdlbFile`` , which decodes only the corrections asked for.
+
+Usage:
+
+    $ python benchmarks/bench_cdlb.py [count]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+from bench_slots import build_ccc  # pylint: disable=C0413
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+LOOKUPS = 1000
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def time_parse(filepath):
+    """Parses the file, returns the result and seconds taken"""
+    cdl_convert.reset_all()
+    start = time.time()
+    parsed = cdl_convert.parse_file(filepath)
+    return parsed, time.time() - start
+
+
+def time_lookups(filepath, ids):
+    """Opens the cdlb and gets each id, returns seconds taken"""
+    cdl_convert.reset_all()
+    start = time.time()
+    with cdl_convert.CdlbFile(filepath) as cdlb:
+        for cc_id in ids:
+            cdlb.get(cc_id)
+    return time.time() - start
+
+
+def main():
+    """Times loading both formats, and lookups by id"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ccc_path = build_ccc(count)
+    cdlb_path = os.path.splitext(ccc_path)[0] + '.cdlb'
+
+    try:
+        ccc, ccc_time = time_parse(ccc_path)
+        ccc._file_out = cdlb_path  # pylint: disable=W0212
+        start = time.time()
+        cdl_convert.write_cdlb(ccc)
+        write_time = time.time() - start
+
+        cdlb, cdlb_time = time_parse(cdlb_path)
+        assert cdlb.xml == ccc.xml
+
+        ids = random.Random(1).sample(ccc.id_list, min(LOOKUPS, count))
+        lookup_time = time_lookups(cdlb_path, ids)
+
+        sizes = (os.path.getsize(ccc_path), os.path.getsize(cdlb_path))
+    finally:
+        os.remove(ccc_path)
+        if os.path.exists(cdlb_path):
+            os.remove(cdlb_path)
+
+    print('{0} corrections'.format(count))
+    print('{0:>14} {1:>10} {2:>12}'.format('step', 'seconds', 'cc/s'))
+    for step, elapsed, done in (
+            ('parse ccc', ccc_time, count),
+            ('write cdlb', write_time, count),
+            ('parse cdlb', cdlb_time, count),
+            ('get by id', lookup_time, len(ids)),
+    ):
+        print(
+            '{0:>14} {1:>10.3f} {2:>12,.0f}'.format(
+                step, elapsed, done / elapsed
+            )
+        )
+    print('ccc is {0:,} bytes, cdlb is {1:,} bytes'.format(*sizes))
+
+if __name__ == '__main__':
+    main()
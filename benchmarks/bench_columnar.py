@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmarks the memory held by a ColumnarCollection against a ColorCollection.
+
+The same random grades are stored both as a ``ColorCollection`` of
+``ColorCorrection`` objects, and as a ``ColumnarCollection``. The bytes still
+allocated once each is built are measured with ``tracemalloc``.
+
+Usage:
+
+    $ python benchmarks/bench_columnar.py [count]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def build_collection(count):
+    """Builds a ColorCollection of count random ColorCorrections"""
+    rand = random.Random(1)
+    registry = cdl_convert.Registry()
+    collection = cdl_convert.ColorCollection(registry=registry)
+    with registry:
+        for i in range(count):
+            cc = cdl_convert.ColorCorrection('shot{0:06d}'.format(i))
+            cc.slope = [rand.uniform(0.8, 1.2) for j in range(3)]
+            cc.offset = [rand.uniform(-0.05, 0.05) for j in range(3)]
+            cc.power = [rand.uniform(0.8, 1.2) for j in range(3)]
+            cc.sat = rand.uniform(0.7, 1.3)
+            cc.desc = 'graded pass {0}'.format(i % 7)
+            collection.append_child(cc)
+    return collection
+
+
+def measure(build, *args):
+    """Returns the result of build and the bytes it keeps allocated"""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build(*args)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    """Measures both stores and prints bytes per correction"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    collection, graph = measure(build_collection, count)
+
+    start = time.time()
+    store, columnar = measure(
+        cdl_convert.ColumnarCollection.from_collection, collection
+    )
+    elapsed = time.time() - start
+
+    print('{0} corrections, converted in {1:.2f}s'.format(count, elapsed))
+    print('{0:>12} {1:>14} {2:>10}'.format('store', 'bytes', 'per cc'))
+    for name, retained in (('objects', graph), ('columnar', columnar)):
+        print(
+            '{0:>12} {1:>14,} {2:>10.1f}'.format(
+                name, retained, retained / float(count)
+            )
+        )
+    print('{0:.1f}x smaller'.format(graph / float(columnar)))
+    del store
+
+if __name__ == '__main__':
+    main()
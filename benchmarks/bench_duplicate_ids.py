@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Benchmarks registering large numbers of ColorCorrections that share an id.
+
+Every correction after the first collides and has to be given a numbered
+suffix. Resolving a collision should take constant time, so doubling the
+number of corrections should roughly double the total time.
+
+Usage:
+
+    $ python benchmarks/bench_duplicate_ids.py [count]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def ingest(count):
+    """Registers ``count`` colliding ColorCorrections, returns seconds"""
+    cdl_convert.reset_all()
+    cdl_convert.config.HALT_ON_ERROR = False
+
+    start = time.time()
+    for i in range(count):  # pylint: disable=W0612
+        cdl_convert.ColorCorrection('A001C003_150101_R1AB')
+    elapsed = time.time() - start
+
+    assert len(cdl_convert.ColorCorrection.members) == count
+    cdl_convert.reset_all()
+    return elapsed
+
+
+def main():
+    """Runs the benchmark at doubling sizes up to the requested count"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    sizes = []
+    size = total
+    while size >= 1000 and len(sizes) < 5:
+        sizes.insert(0, size)
+        size //= 2
+
+    print('{0:>10} {1:>10} {2:>14}'.format('ids', 'seconds', 'usec per id'))
+    for size in sizes:
+        elapsed = ingest(size)
+        print(
+            '{0:>10} {1:>10.3f} {2:>14.2f}'.format(
+                size, elapsed, elapsed / size * 1000000
+            )
+        )
+
+if __name__ == '__main__':
+    main()
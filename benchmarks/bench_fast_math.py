@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Benchmarks Decimal storage against ``config.FAST_MATH`` float storage.
+
+A synthetic ALE with one ASC_SOP and ASC_SAT per line is written to a temp
+file, then parsed and written back out as a .ccc in each numeric mode. Peak
+memory is measured in a second, untimed pass where ``tracemalloc`` is
+available (Python 3.4+), since tracing slows everything down.
+
+The set and format columns time only the numbers: setting the SOP and SAT
+of a node from the ALE's strings, and formatting them back to XML text.
+Floats are quicker to set but slower to format than Decimals, and both are
+small next to the rest of a parse and write, so FAST_MATH saves memory
+rather than time.
+
+Usage:
+
+    $ python benchmarks/bench_fast_math.py [lines]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+ALE_HEADER = (
+    "Heading\nFIELD_DELIM\tTABS\nVIDEO_FORMAT\t1080\nAUDIO_FORMAT\t48khz\n"
+    "FPS\t24\n\nColumn\nName\tStart\tEnd\tASC_SAT\tASC_SOP\tScan Filename\n\n"
+    "Data\n"
+)
+ALE_LINE = (
+    "{name}\t01:00:00:00\t01:00:10:00\t{sat}\t"
+    "({0} {1} {2})({3} {4} {5})({6} {7} {8})\t{name}\n"
+)
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def build_ale(lines):
+    """Writes a synthetic ALE with the given number of lines to disk"""
+    rand = random.Random(1)
+    ale_file, path = tempfile.mkstemp(suffix='.ale')
+    with os.fdopen(ale_file, 'w') as ale:
+        ale.write(ALE_HEADER)
+        for i in range(lines):
+            values = ['{0:.6f}'.format(rand.uniform(0.5, 1.5)) for j in range(9)]
+            ale.write(
+                ALE_LINE.format(
+                    *values,
+                    name='A{0:06d}C001'.format(i),
+                    sat='{0:.6f}'.format(rand.uniform(0.5, 1.5))
+                )
+            )
+    return path
+
+
+def run_values(lines, fast_math):
+    """Sets and formats SOP & SAT values alone, returns seconds for each"""
+    cdl_convert.config.FAST_MATH = fast_math
+    rand = random.Random(1)
+    values = [
+        ['{0:.6f}'.format(rand.uniform(0.5, 1.5)) for j in range(10)]
+        for i in range(lines)
+    ]
+    cdl = cdl_convert.ColorCorrection('values')
+
+    start = time.time()
+    for row in values:
+        cdl.slope = row[0:3]
+        cdl.offset = row[3:6]
+        cdl.power = row[6:9]
+        cdl.sat = row[9]
+    set_secs = time.time() - start
+
+    start = time.time()
+    for row in values:
+        cdl.sop_node.build_element()
+        cdl.sat_node.build_element()
+    format_secs = time.time() - start
+
+    cdl_convert.reset_all()
+    cdl_convert.config.FAST_MATH = False
+    return set_secs, format_secs
+
+
+def run(ale_path, fast_math, trace=False):
+    """Parses and writes the ALE, returns seconds and peak bytes"""
+    cdl_convert.reset_all()
+    cdl_convert.config.FAST_MATH = fast_math
+
+    if trace:
+        tracemalloc.start()
+
+    start = time.time()
+    col = cdl_convert.parse_ale(ale_path)
+    parsed = time.time() - start
+
+    out_file, col._file_out = tempfile.mkstemp(suffix='.ccc')  # pylint: disable=W0212
+    os.close(out_file)
+    cdl_convert.write_ccc(col)
+    total = time.time() - start
+
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    os.remove(col.file_out)
+    cdl_convert.reset_all()
+    cdl_convert.config.FAST_MATH = False
+    return parsed, total, peak
+
+
+def main():
+    """Runs the benchmark in both modes"""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ale_path = build_ale(lines)
+
+    print('{0} ALE lines'.format(lines))
+    print(
+        '{0:>10} {1:>10} {2:>14} {3:>10} {4:>8} {5:>9}'.format(
+            'mode', 'parse s', 'parse+write s', 'peak MiB', 'set s',
+            'format s'
+        )
+    )
+    try:
+        for mode, fast_math in (('decimal', False), ('float', True)):
+            parsed, total = run(ale_path, fast_math)[:2]
+            peak = run(ale_path, fast_math, True)[2] if tracemalloc else None
+            set_secs, format_secs = run_values(lines, fast_math)
+            print(
+                '{0:>10} {1:>10.2f} {2:>14.2f} {3:>10} {4:>8.2f} {5:>9.2f}'
+                .format(
+                    mode, parsed, total,
+                    '{0:.1f}'.format(peak / 1048576.0) if peak else 'n/a',
+                    set_secs, format_secs
+                )
+            )
+    finally:
+        os.remove(ale_path)
+
+if __name__ == '__main__':
+    main()
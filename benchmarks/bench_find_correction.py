@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmarks looking up one correction by id in a large .ccc.
+
+The correction is found by parsing the whole file with ``parse_ccc`` , then
+with ``find_correction`` : first with no index, which scans the file and
+saves its sidecar index, then with only the sidecar (as a new process
+would), and finally with the index already in memory.
+
+Usage:
+
+    $ python benchmarks/bench_find_correction.py [count]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+from cdl_convert import parse  # pylint: disable=C0413
+from bench_slots import build_ccc  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def time_find(func):
+    """Calls func, returns seconds taken"""
+    cdl_convert.reset_all()
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def main():
+    """Times each way of finding the last correction in the file"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    filepath = build_ccc(count)
+    sidecar = filepath + parse.CORRECTION_INDEX_EXT
+    cc_id = 'shot{0:06d}'.format(count - 1)
+
+    def parse_whole():
+        """Parses the whole ccc and picks the correction out"""
+        ccc = cdl_convert.parse_ccc(filepath)
+        return [cc for cc in ccc.color_corrections if cc.id == cc_id][0]
+
+    def from_sidecar():
+        """Finds the correction as a new process would"""
+        parse._CORRECTION_INDEXES.clear()  # pylint: disable=W0212
+        return cdl_convert.find_correction(filepath, cc_id)
+
+    try:
+        results = [
+            ('parse_ccc', time_find(parse_whole)),
+            (
+                'build index',
+                time_find(lambda: cdl_convert.find_correction(filepath, cc_id))
+            ),
+            ('load sidecar', time_find(from_sidecar)),
+            (
+                'in memory',
+                time_find(lambda: cdl_convert.find_correction(filepath, cc_id))
+            ),
+        ]
+    finally:
+        os.remove(filepath)
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+
+    print('1 of {0} corrections'.format(count))
+    print('{0:>14} {1:>12}'.format('step', 'ms'))
+    for step, elapsed in results:
+        print('{0:>14} {1:>12.2f}'.format(step, elapsed * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Benchmarks baking a collection of ColorCorrections to .cube LUTs.
+
+Random grades are baked with ``write_many``, which spreads them across a
+thread pool, and then one at a time for comparison. Most of the work happens
+inside NumPy with the GIL released, so the pool should scale with cores.
+
+Usage:
+
+    $ python benchmarks/bench_lut.py [count] [lut size]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def build_corrections(count, directory):
+    """Builds count random ColorCorrections, destined for directory"""
+    rand = random.Random(1)
+    ccs = []
+    for i in range(count):
+        cc = cdl_convert.ColorCorrection('shot{0:05d}'.format(i))
+        cc.slope = [rand.uniform(0.8, 1.2) for j in range(3)]
+        cc.offset = [rand.uniform(-0.05, 0.05) for j in range(3)]
+        cc.power = [rand.uniform(0.8, 1.2) for j in range(3)]
+        cc.sat = rand.uniform(0.7, 1.3)
+        cc.determine_dest('cube', directory)
+        ccs.append(cc)
+    return ccs
+
+
+def main():
+    """Bakes the corrections in parallel and serially"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    cdl_convert.config.LUT_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 33
+
+    directory = tempfile.mkdtemp()
+    try:
+        ccs = build_corrections(count, directory)
+
+        start = time.time()
+        cdl_convert.write_many(ccs, 'cube')
+        pooled = time.time() - start
+
+        start = time.time()
+        for cc in ccs:
+            cdl_convert.write_cube(cc)
+        serial = time.time() - start
+    finally:
+        shutil.rmtree(directory)
+
+    print(
+        '{0} LUTs at {1}^3 on {2} cpus'.format(
+            count, cdl_convert.config.LUT_SIZE, os.cpu_count()
+            if hasattr(os, 'cpu_count') else 'unknown'
+        )
+    )
+    print('{0:>10} {1:>10} {2:>10}'.format('mode', 'seconds', 'LUTs/s'))
+    for mode, elapsed in (('pool', pooled), ('serial', serial)):
+        print(
+            '{0:>10} {1:>10.2f} {2:>10.1f}'.format(
+                mode, elapsed, count / elapsed
+            )
+        )
+
+if __name__ == '__main__':
+    main()
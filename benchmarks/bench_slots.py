@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmarks the memory held by each parsed ColorCorrection.
+
+A synthetic .ccc with one fully specified correction per grade is written to
+a temp file and parsed. The bytes still allocated once parsing is done are
+measured with ``tracemalloc`` and divided by the number of corrections. The
+shallow size of each node object is also listed, including its ``__dict__``
+if it has one.
+
+Usage:
+
+    $ python benchmarks/bench_slots.py [count]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def build_ccc(count):
+    """Writes a .ccc with count random corrections and returns its path"""
+    rand = random.Random(1)
+    collection = cdl_convert.ColorCollection()
+    for i in range(count):
+        cc = cdl_convert.ColorCorrection('shot{0:06d}'.format(i))
+        cc.slope = [round(rand.uniform(0.8, 1.2), 5) for j in range(3)]
+        cc.offset = [round(rand.uniform(-0.05, 0.05), 5) for j in range(3)]
+        cc.power = [round(rand.uniform(0.8, 1.2), 5) for j in range(3)]
+        cc.sat = round(rand.uniform(0.7, 1.3), 5)
+        cc.desc = 'graded pass {0}'.format(i % 7)
+        collection.append_child(cc)
+
+    handle, collection._file_out = tempfile.mkstemp(suffix='.ccc')
+    os.close(handle)
+    cdl_convert.write_ccc(collection)
+    cdl_convert.reset_all()
+    return collection.file_out
+
+
+def shallow_size(node):
+    """Returns the size of node itself, plus its __dict__ if it has one"""
+    size = sys.getsizeof(node)
+    if hasattr(node, '__dict__'):
+        size += sys.getsizeof(node.__dict__)
+    return size
+
+
+def main():
+    """Parses the synthetic .ccc and prints the bytes held per correction"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    filepath = build_ccc(count)
+
+    try:
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        collection = cdl_convert.parse_ccc(filepath)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+    finally:
+        os.remove(filepath)
+
+    cc = collection.color_corrections[0]
+    print('{0} parsed corrections'.format(count))
+    print('{0:>20} {1:>10}'.format('node', 'bytes'))
+    for node in (cc, cc.sop_node, cc.sat_node):
+        print(
+            '{0:>20} {1:>10}'.format(type(node).__name__, shallow_size(node))
+        )
+    print(
+        '{0:>20} {1:>10.1f}'.format('retained per cc', retained / float(count))
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmarks writing every correction of a collection to its own .cc file.
+
+A synthetic .ccc is parsed, then its corrections are written out one at a
+time, then with ``write_many`` on a pool of threads and on a pool of
+processes, as ``--single`` does with ``--writers``.
+
+Usage:
+
+    $ python benchmarks/bench_writers.py [count] [workers]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+from cdl_convert import write  # pylint: disable=C0413
+from bench_slots import build_ccc  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def time_write(ccs, directory, workers, processes=False):
+    """Writes each correction into directory, returns seconds taken"""
+    for cc in ccs:
+        cc.determine_dest('cc', directory)
+    start = time.time()
+    write.write_many(ccs, 'cc', workers=workers, processes=processes)
+    elapsed = time.time() - start
+    assert len(os.listdir(directory)) == len(ccs)
+    return elapsed
+
+
+def main():
+    """Times writing serially, on threads and on processes"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    filepath = build_ccc(count)
+    ccs = cdl_convert.parse_ccc(filepath).color_corrections
+    root = tempfile.mkdtemp()
+
+    try:
+        results = []
+        for step, pool_size, processes in (
+                ('serial', 1, False),
+                ('threads', workers, False),
+                ('processes', workers, True),
+        ):
+            directory = os.path.join(root, step)
+            os.makedirs(directory)
+            results.append(
+                (step, time_write(ccs, directory, pool_size, processes))
+            )
+    finally:
+        os.remove(filepath)
+        shutil.rmtree(root)
+
+    print('{0} corrections, {1} workers'.format(count, workers))
+    print('{0:>10} {1:>10} {2:>12}'.format('pool', 'seconds', 'files/s'))
+    for step, elapsed in results:
+        print(
+            '{0:>10} {1:>10.3f} {2:>12,.0f}'.format(
+                step, elapsed, count / elapsed
+            )
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Benchmarks reading the XML of a node over and over, as a viewer or diff would.
+
+A synthetic .ccc is parsed, then the ``xml`` of one correction and of the
+whole collection are read repeatedly. The first read builds the XML, later
+reads come from the cache until a correction is changed, which rebuilds it.
+
+Usage:
+
+    $ python benchmarks/bench_xml_cache.py [count] [reads]
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+)
+
+import cdl_convert  # pylint: disable=C0413
+from bench_slots import build_ccc  # pylint: disable=C0413
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def time_reads(node, reads, change=None):
+    """Reads node.xml reads times, returns ms for the first and the rest"""
+    if change:
+        change()
+    start = time.time()
+    node.xml  # pylint: disable=W0104
+    first = time.time() - start
+    start = time.time()
+    for _ in range(reads - 1):
+        node.xml  # pylint: disable=W0104
+    rest = time.time() - start
+    return first * 1000, rest * 1000 / max(reads - 1, 1)
+
+
+def main():
+    """Times first and repeated reads of a correction and a collection"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    filepath = build_ccc(count)
+    try:
+        ccc = cdl_convert.parse_ccc(filepath)
+    finally:
+        os.remove(filepath)
+    cc = ccc.color_corrections[0]
+
+    def grade():
+        """Changes the correction, which invalidates it and its collection"""
+        cc.slope = (1.5, 1.5, 1.5)
+
+    results = [
+        ('correction', time_reads(cc, reads)),
+        ('collection', time_reads(ccc, reads)),
+        ('after change', time_reads(ccc, reads, grade)),
+    ]
+
+    print('{0} corrections, {1} reads'.format(count, reads))
+    print('{0:>14} {1:>12} {2:>12}'.format('node', 'first ms', 'cached ms'))
+    for step, (first, rest) in results:
+        print('{0:>14} {1:>12.3f} {2:>12.4f}'.format(step, first, rest))
+
+if __name__ == '__main__':
+    main()
@@ -75,16 +75,28 @@ from __future__ import absolute_import, print_function
 
 # cdl_convert imports
 
+from .cache import ParseCache
+from .cdl_convert import convert_many
+from .cdlb import CdlbFile
 from .collection import ColorCollection
+from .columnar import ColumnarCollection, CorrectionView
 from .correction import ColorCorrection, SatNode, SopNode
 from .decision import ColorCorrectionRef, ColorDecision, MediaRef
+from .evaluate import (
+    apply_cdl, apply_collection, bake_lut, iter_apply_collection
+)
 from .parse import (
-    parse_ale, parse_cc, parse_ccc,
-    parse_cdl, parse_file, parse_flex,
+    find_correction, iter_file, parse_ale, parse_cc, parse_ccc,
+    parse_cdl, parse_cdlb, parse_file, parse_flex,
     parse_rnh_cdl
 )
-from .utils import sanity_check, to_decimal
-from .write import write_cc, write_ccc, write_cdl, write_rnh_cdl
+from .registry import DEFAULT_REGISTRY, Registry, current_registry
+from .sink import DirectorySink, MemorySink, OutputSink, TarSink, ZipSink
+from .utils import sanity_check, to_decimal, to_float
+from .write import (
+    batch_writes, write_3dl, write_cc, write_ccc, write_cdl, write_cdlb,
+    write_cube, write_many, write_rnh_cdl, write_spi3d
+)
 
 # ==============================================================================
 # GLOBALS
@@ -104,27 +116,54 @@ __status__ = "Development"
 # ==============================================================================
 
 __all__ = [
+    'apply_cdl',
+    'apply_collection',
+    'bake_lut',
+    'batch_writes',
+    'CdlbFile',
     'ColorCorrection',
     'ColorCorrectionRef',
     'ColorCollection',
     'ColorDecision',
+    'ColumnarCollection',
+    'convert_many',
+    'CorrectionView',
+    'current_registry',
+    'DEFAULT_REGISTRY',
+    'DirectorySink',
+    'find_correction',
+    'iter_apply_collection',
+    'iter_file',
     'MediaRef',
+    'MemorySink',
+    'OutputSink',
     'parse_ale',
     'parse_cc',
     'parse_ccc',
     'parse_cdl',
+    'parse_cdlb',
     'parse_file',
     'parse_flex',
     'parse_rnh_cdl',
+    'ParseCache',
+    'Registry',
     'reset_all',
     'sanity_check',
     'SatNode',
     'SopNode',
+    'TarSink',
     'to_decimal',
+    'to_float',
+    'write_3dl',
     'write_cc',
     'write_ccc',
     'write_cdl',
+    'write_cdlb',
+    'write_cube',
+    'write_many',
     'write_rnh_cdl',
+    'write_spi3d',
+    'ZipSink',
 ]
 
 # ==============================================================================
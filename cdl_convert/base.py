@@ -43,6 +43,11 @@ more fully realized classes.
             * An ``xml_root`` attribute which returns the same built element
                 as above, but with the required XML header. This XML string
                 is ready to be printed.
+            * A ``write_xml`` method which writes the ``xml_root`` string
+                straight to a file, without building it in memory first.
+            * An ``invalidate_xml`` method which drops the cached
+                ``element`` and ``xml_root`` of the node and its parents.
+                Setters call this whenever the node changes.
 
         All of these attributes depend on the ``build_element`` method, which
         must be overridden by classes which inherit this class if the above
@@ -90,14 +95,13 @@ from __future__ import absolute_import, print_function
 
 # Standard Imports
 from decimal import Decimal
-import re
+from io import BytesIO
+from itertools import chain
 import sys
-from xml.dom import minidom
-from xml.etree import ElementTree
 
 # cdl_convert Imports
 from . import config
-from .utils import to_decimal
+from .utils import to_decimal, to_float
 
 # ==============================================================================
 # GLOBALS
@@ -106,7 +110,14 @@ from .utils import to_decimal
 if sys.version_info[0] >= 3:  # pragma: no cover
     enc = lambda x: bytes(x, 'UTF-8')  # pylint: disable=C0103
 else:  # pragma: no cover
-    enc = lambda x: x  # pylint: disable=C0103
+    # Text from ElementTree can be unicode, which must be encoded before it
+    # is written to a binary file.
+    enc = lambda x: (  # pylint: disable=C0103
+        x.encode('UTF-8') if isinstance(x, unicode) else x  # pylint: disable=E0602
+    )
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XML_INDENT = '    '
 
 # ==============================================================================
 # EXPORTS
@@ -119,111 +130,380 @@ __all__ = [
     'ColorNodeBase'
 ]
 
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _escape_xml(text):
+    """Escapes text and attribute values the way minidom writes them"""
+    return text.replace(
+        '&', '&amp;'
+    ).replace(
+        '<', '&lt;'
+    ).replace(
+        '"', '&quot;'
+    ).replace(
+        '>', '&gt;'
+    )
+
+# ==============================================================================
+
+
+def _invalidating(name):
+    """Returns the list method name, followed by invalidating the owner"""
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        """Calls the list method, then tells our owner"""
+        result = method(self, *args, **kwargs)
+        self.owner._list_changed()  # pylint: disable=W0212
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+# ==============================================================================
+
+
+def _open_tag(element, depth):
+    """Returns the indented opening of a tag, without the closing bracket"""
+    parts = [XML_INDENT * depth, '<', element.tag]
+    for name, value in element.attrib.items():
+        parts.append(' {name}="{value}"'.format(
+            name=name, value=_escape_xml(value))
+        )
+    return ''.join(parts)
+
+# ==============================================================================
+
+
+def _serialize_element(element, depth, parts):
+    """Appends the pretty printed text of an element and its children
+
+    Formatting matches ``minidom.toprettyxml(indent='    ')``: elements with
+    only text stay on one line, elements with neither text nor children are
+    self closed, and everything else gets one child per line.
+
+    """
+    parts.append(_open_tag(element, depth))
+    if len(element):
+        parts.append('>\n')
+        if element.text:
+            parts.append(XML_INDENT * (depth + 1))
+            parts.append(_escape_xml(element.text))
+            parts.append('\n')
+        for child in element:
+            _serialize_element(child, depth + 1, parts)
+        parts.append('{indent}</{tag}>\n'.format(
+            indent=XML_INDENT * depth, tag=element.tag)
+        )
+    elif element.text:
+        parts.append('>{text}</{tag}>\n'.format(
+            text=_escape_xml(element.text), tag=element.tag)
+        )
+    else:
+        parts.append('/>\n')
+
+# ==============================================================================
+
+
+def _write_element(xml_file, element, extra_children):
+    """Writes a root element to file, one top level child at a time"""
+    children = iter(extra_children)
+    try:
+        first = next(children)
+    except StopIteration:
+        first = None
+
+    if first is None:
+        # Nothing to stream, the whole element is written in one go.
+        parts = []
+        _serialize_element(element, 0, parts)
+        xml_file.write(enc(''.join(parts)))
+        return
+
+    parts = [_open_tag(element, 0), '>\n']
+    if element.text:
+        parts.extend([XML_INDENT, _escape_xml(element.text), '\n'])
+    for child in element:
+        _serialize_element(child, 1, parts)
+    xml_file.write(enc(''.join(parts)))
+
+    for child in chain([first], children):
+        parts = []
+        _serialize_element(child, 1, parts)
+        xml_file.write(enc(''.join(parts)))
+
+    xml_file.write(enc('</{tag}>\n'.format(tag=element.tag)))
+
 # ==============================================================================
 # CLASSES
 # ==============================================================================
 
 
-class AscColorSpaceBase(object):  # pylint: disable=R0903
-    """Base class for Asc XML type nodes that deal with colorspace
+class _XMLList(list):
+    """A list which drops the cached XML of the node holding it on change
 
     Description
     ~~~~~~~~~~~
 
-    This class is meant to be inherited by any node type that used viewing and
-    input colorspace descriptions.
+    Lists a node's XML is built from, such as ``desc`` or the children of
+    a :class:`ColorCollection` , are handed out as is, so they can be sorted,
+    appended to or have items replaced in place. Every method which changes
+    the list calls ``_list_changed`` on its owner afterwards, which by
+    default calls ``invalidate_xml`` , so the node never serves XML built
+    from the list as it was.
 
-    This class doesn't do a lot right now, as we don't have any specific
-    controls on how to set or retrieve these fields. In the future however,
-    we'll parse incoming descriptions to try and resolve input colorspace and
-    viewing colorspace.
+    Copies and pickles of an _XMLList are plain lists.
 
     **Attributes:**
 
-        input_desc : (str)
-            Description of the color space, format and properties of the input
-            images. Individual :class:`ColorCorrections` can override this.
+        owner : (:class:`AscXMLBase`)
+            The node whose XML is built from this list.
 
-        viewing_desc : (str)
-            Viewing device, settings and environment. Individual
-            :class:`ColorCorrections` can override this.
+    """
+    __slots__ = ('owner',)
+
+    def __init__(self, owner, values=()):
+        super(_XMLList, self).__init__(values)
+        self.owner = owner
+
+    def __reduce__(self):
+        return list, (list(self), )
+
+
+for _name in (
+        '__delitem__', '__delslice__', '__iadd__', '__imul__', '__setitem__',
+        '__setslice__', 'append', 'clear', 'extend', 'insert', 'pop',
+        'remove', 'reverse', 'sort',
+):
+    # __delslice__ and __setslice__ are Python 2 only, clear Python 3 only.
+    if hasattr(list, _name):
+        setattr(_XMLList, _name, _invalidating(_name))
+del _name
+
+# ==============================================================================
+
+
+class AscXMLBase(object):
+    """Base class for nodes which can be converted to XML Elements
+
+    Description
+    ~~~~~~~~~~~
+
+    This class contains several convenience attributes which can be used
+    to retrieve ElementTree Elements, or nicely formatted strings.
+
+    The ``element`` and ``xml_root`` built for a node are cached on it, and
+    kept until the node changes. Setting any attribute the XML is built from,
+    such as ``slope``, ``desc``, ``id`` or ``media_ref``, or changing the
+    ``desc`` or children lists in place, calls ``invalidate_xml`` . That
+    drops the cache of the node and of every ``parent`` above it, and bumps
+    their XML version. A node whose children can also belong to another
+    parent checks their versions before using its cache.
+
+    Since the cached ``element`` is handed out as is, it should be treated as
+    read only.
+
+    **Attributes:**
+
+        element : (<xml.etree.ElementTree.Element>)
+            etree style Element representing the node.
+
+        xml : (str)
+            A nicely formatted XML string representing the node.
+
+        xml_root : (str)
+            A nicely formatted XML, ready to write to file string representing
+            the node. Formatted as an XML root, it includes the xml version and
+            encoding tags on the first line.
 
     **Public Methods:**
 
-        parse_xml_input_desc()
-            Parses an ElementTree Element to find & add an InputDescription.
-            If none is found, ``input_desc`` will remain set to ``None``.
+        build_element()
+            A placeholder method to be overridden by inheriting classes,
+            calling it will always return None.
 
-        parse_xml_viewing_desc()
-            Parses an ElementTree Element to find & add a ViewingDescription.
-            If none is found, ``viewing_desc`` will remain set to ``None``.
+        invalidate_xml()
+            Drops the cached XML of this node and all of its parents.
+
+        write_xml()
+            Writes the same nicely formatted XML as ``xml_root`` straight to
+            a binary file-like object, one child element at a time.
 
     """
+    __slots__ = ('_xml_cache', '_xml_version')
+
     def __init__(self):
-        # For multiple inheritance support.
-        super(AscColorSpaceBase, self).__init__()
+        super(AscXMLBase, self).__init__()
+        self._xml_cache = None
+        # Bumped every time this node, or a node below it, changes.
+        self._xml_version = 0
 
-        self.input_desc = None
-        self.viewing_desc = None
+    # Properties ==============================================================
+
+    @property
+    def element(self):
+        """etree style Element representing the node."""
+        cache = self._fresh_xml_cache(create=True)
+        if cache is None:
+            return self.build_element()
+        if 'element' not in cache:
+            cache['element'] = self.build_element()
+        return cache['element']
+
+    @property
+    def xml(self):
+        """A nicely formatted XML string representing the node"""
+        # We'll take the xml_root attrib, which is ready to write, and just
+        # remove the first line, which is the xml version and encoding.
+        return self.xml_root[len(XML_DECLARATION):]
+
+    @property
+    def xml_root(self):
+        """A nicely formatted XML string with a root element ready to write"""
+        cache = self._fresh_xml_cache(create=True)
+        if cache is not None and 'xml_root' in cache:
+            return cache['xml_root']
+        xml_file = BytesIO()
+        self.write_xml(xml_file)
+        if cache is not None:
+            cache['xml_root'] = xml_file.getvalue()
+        return xml_file.getvalue()
+
+    # Private Methods =========================================================
+
+    def _build_element_parts(self):
+        """Returns our element and an iterable of extra child elements
+
+        The extra children are appended after any children the element
+        already has. Nodes with many children can override this to build those
+        children lazily, so ``write_xml`` never holds all of them at once.
+
+        """
+        return self.build_element(), ()
+
+    # =========================================================================
+
+    def _element(self):
+        """Returns our cached element, or builds one without caching it
+
+        Parents build their elements from their children's with this, so that
+        building or writing a large collection doesn't leave every child
+        holding on to its element.
+
+        """
+        cache = self._fresh_xml_cache()
+        if cache is not None and 'element' in cache:
+            return cache['element']
+        return self.build_element()
+
+    # =========================================================================
+
+    def _fresh_xml_cache(self, create=False):
+        """Returns our XML cache if it's still valid
+
+        **Args:**
+            create=False : (bool)
+                If True, a stale or missing cache is replaced by an empty one,
+                which is returned.
+
+        **Returns:**
+            (dict|None)
+                The cache, or None if there isn't a valid one, or if we can't
+                be cached at all.
+
+        **Raises:**
+            None
+
+        """
+        state = self._xml_state()
+        if state is None:
+            self._xml_cache = None
+            return None
+        cache = self._xml_cache
+        if cache is not None and cache['state'] == state:
+            return cache
+        self._xml_cache = {'state': state} if create else None
+        return self._xml_cache
+
+    # =========================================================================
+
+    def _list_changed(self):
+        """Called whenever one of our lists is changed in place"""
+        self.invalidate_xml()
+
+    # =========================================================================
+
+    def _xml_state(self):  # pylint: disable=R0201
+        """Returns a snapshot of anything our XML depends on besides setters
+
+        Cached XML is only used while the snapshot matches the one taken when
+        it was cached. Nodes that can't be cached at all return None.
+
+        """
+        return ()
 
     # Public Methods ==========================================================
 
-    def parse_xml_input_desc(self, xml_element):
-        """Parses an ElementTree element to find & add an input description
+    def build_element(self):  # pragma: no cover pylint: disable=R0201
+        """Placeholder for reference by attributes. Will return None"""
+        return None
+
+    # =========================================================================
+
+    def invalidate_xml(self):
+        """Drops the cached XML of this node, and of every parent above it
 
         **Args:**
-            xml_element : (``xml.etree.ElementTree.Element``)
-                The element to parse for an Input Description element. If
-                found, set our ``input_desc``
+            None
 
         **Returns:**
-            (bool)
-                True if found InputDescription Fields (even if blank)
+            None
 
         **Raises:**
             None
 
         """
-        # If the text field is empty, this will return None, which is the
-        # default value of viewing_desc and input_desc anyway.
-        try:
-            self.input_desc = xml_element.find('InputDescription').text
-            return True
-        except AttributeError:
-            # We don't have an InputDescription and that's ok.
-            return False
+        node = self
+        while isinstance(node, AscXMLBase):
+            node._xml_cache = None  # pylint: disable=W0212
+            node._xml_version += 1  # pylint: disable=W0212
+            node = getattr(node, 'parent', None)
 
     # =========================================================================
 
-    def parse_xml_viewing_desc(self, xml_element):
-        """Parses an ElementTree element to find & add a viewing description
+    def write_xml(self, xml_file):
+        """Writes our nicely formatted XML to a binary file-like object
 
         **Args:**
-            xml_element : (``xml.etree.ElementTree.Element``)
-                The element to parse for a Viewing Description element. If
-                found, set our ``viewing_desc``
+            xml_file : (file)
+                Any object with a ``write`` method accepting bytes. The output
+                is identical to ``xml_root``, but is written out as each child
+                element is serialized rather than built up in one string,
+                unless ``xml_root`` is already cached.
 
         **Returns:**
-            (bool)
-                True if found InputDescription Fields (even if blank)
+            None
 
         **Raises:**
             None
 
         """
-        # If the text field is empty, this will return None, which is the
-        # default value of viewing_desc and input_desc anyway.
-        try:
-            self.viewing_desc = xml_element.find('ViewingDescription').text
-            return True
-        except AttributeError:
-            # We don't have a ViewingDescription and that's ok.
-            return False
+        cache = self._fresh_xml_cache()
+        if cache is not None and 'xml_root' in cache:
+            xml_file.write(cache['xml_root'])
+            return
+        element, children = self._build_element_parts()
+        xml_file.write(enc(XML_DECLARATION))
+        _write_element(xml_file, element, children)
 
 # ==============================================================================
 
 
-class AscDescBase(object):  # pylint: disable=R0903
+class AscDescBase(AscXMLBase):  # pylint: disable=R0903
     """Base class for most Asc XML type nodes, allows for infinite desc
 
     Description
@@ -232,6 +512,10 @@ class AscDescBase(object):  # pylint: disable=R0903
     This class is meant to be inherited by any node type that uses description
     fields.
 
+    Every node which takes descriptions is also written as XML, so this class
+    inherits from :class:`AscXMLBase`, which keeps the cached XML in its own
+    ``__slots__``.
+
     **Attributes:**
 
         desc : [str]
@@ -244,6 +528,9 @@ class AscDescBase(object):  # pylint: disable=R0903
             end of the list, but desc can also be replaced by passing it a list
             or tuple. Desc can be emptied by passing it None, [] or ().
 
+            Most nodes never have a description, so the list isn't created
+            until ``desc`` is first read or set. Until then ``_desc`` is None.
+
     **Public Methods:**
 
         parse_xml_descs()
@@ -251,26 +538,32 @@ class AscDescBase(object):  # pylint: disable=R0903
             any text they contain to the ``desc``.
 
     """
+    __slots__ = ('_desc',)
+
     def __init__(self):
         super(AscDescBase, self).__init__()
-        self._desc = []
+        self._desc = None
 
     # Properties ==============================================================
 
     @property
     def desc(self):
         """Returns the list of descriptions"""
+        if self._desc is None:
+            self._desc = _XMLList(self)
         return self._desc
 
     @desc.setter
     def desc(self, value):
         """Adds an entry to the descriptions"""
         if value is None:
-            self._desc = []
-        elif type(value) in [list, tuple]:
-            self._desc = list(value)
+            self._desc = None
+        elif isinstance(value, (list, tuple)):
+            self._desc = _XMLList(self, value) if value else None
         else:
-            self._desc.append(value)
+            self.desc.append(value)
+            return
+        self.invalidate_xml()
 
     # Public Methods ==========================================================
 
@@ -296,71 +589,132 @@ class AscDescBase(object):  # pylint: disable=R0903
 # ==============================================================================
 
 
-class AscXMLBase(object):
-    """Base class for nodes which can be converted to XML Elements
+class AscColorSpaceBase(AscDescBase):  # pylint: disable=R0903
+    """Base class for Asc XML type nodes that deal with colorspace
 
     Description
     ~~~~~~~~~~~
 
-    This class contains several convenience attributes which can be used
-    to retrieve ElementTree Elements, or nicely formatted strings.
+    This class is meant to be inherited by any node type that used viewing and
+    input colorspace descriptions.
 
-    **Attributes:**
+    Every node which takes colorspace descriptions also takes regular
+    descriptions, so this class inherits from :class:`AscDescBase`. Keeping
+    the two in one line of inheritance lets each of them define
+    ``__slots__``, which two unrelated bases could not both do.
 
-        element : (<xml.etree.ElementTree.Element>)
-            etree style Element representing the node.
+    This class doesn't do a lot right now, as we don't have any specific
+    controls on how to set or retrieve these fields. In the future however,
+    we'll parse incoming descriptions to try and resolve input colorspace and
+    viewing colorspace.
 
-        xml : (str)
-            A nicely formatted XML string representing the node.
+    **Attributes:**
 
-        xml_root : (str)
-            A nicely formatted XML, ready to write to file string representing
-            the node. Formatted as an XML root, it includes the xml version and
-            encoding tags on the first line.
+        input_desc : (str)
+            Description of the color space, format and properties of the input
+            images. Individual :class:`ColorCorrections` can override this.
+
+        viewing_desc : (str)
+            Viewing device, settings and environment. Individual
+            :class:`ColorCorrections` can override this.
 
     **Public Methods:**
 
-        build_element()
-            A placeholder method to be overridden by inheriting classes,
-            calling it will always return None.
+        parse_xml_input_desc()
+            Parses an ElementTree Element to find & add an InputDescription.
+            If none is found, ``input_desc`` will remain set to ``None``.
+
+        parse_xml_viewing_desc()
+            Parses an ElementTree Element to find & add a ViewingDescription.
+            If none is found, ``viewing_desc`` will remain set to ``None``.
 
     """
+    __slots__ = ('_input_desc', '_viewing_desc')
+
     def __init__(self):
-        super(AscXMLBase, self).__init__()
+        # For multiple inheritance support.
+        super(AscColorSpaceBase, self).__init__()
+
+        self._input_desc = None
+        self._viewing_desc = None
 
     # Properties ==============================================================
 
     @property
-    def element(self):
-        """etree style Element representing the node."""
-        return self.build_element()
+    def input_desc(self):
+        """Returns the input colorspace description"""
+        return self._input_desc
 
-    @property
-    def xml(self):
-        """A nicely formatted XML string representing the node"""
-        # We'll take the xml_root attrib, which is ready to write, and just
-        # remove the first line, which is the xml version and encoding.
-        dom_string = self.xml_root.split(enc('\n'))
-        return enc('\n').join(dom_string[1:])
+    @input_desc.setter
+    def input_desc(self, value):
+        """Sets the input colorspace description"""
+        self._input_desc = value
+        self.invalidate_xml()
 
     @property
-    def xml_root(self):
-        """A nicely formatted XML string with a root element ready to write"""
-        xml_string = ElementTree.tostring(self.element, 'UTF-8')
-        dom_xml = minidom.parseString(xml_string)
-        dom_string = dom_xml.toprettyxml(indent="    ", encoding='UTF-8')
-        # Fix for ugly dom formatting prior to 2.7, taken from:
-        # http://stackoverflow.com/questions/749796/pretty-printing-xml-in-python
-        if sys.version_info[0] < 3 and sys.version_info[1] < 7:  # pragma: no cover pylint: disable=E0012
-            text_re = re.compile(r'>\n\s+([^<>\s].*?)\n\s+</', re.DOTALL)
-            dom_string = text_re.sub(r'>\g<1></', dom_string)
-        return dom_string
+    def viewing_desc(self):
+        """Returns the viewing colorspace description"""
+        return self._viewing_desc
+
+    @viewing_desc.setter
+    def viewing_desc(self, value):
+        """Sets the viewing colorspace description"""
+        self._viewing_desc = value
+        self.invalidate_xml()
 
     # Public Methods ==========================================================
 
-    def build_element(self):  # pragma: no cover pylint: disable=R0201
-        """Placeholder for reference by attributes. Will return None"""
-        return None
+    def parse_xml_input_desc(self, xml_element):
+        """Parses an ElementTree element to find & add an input description
+
+        **Args:**
+            xml_element : (``xml.etree.ElementTree.Element``)
+                The element to parse for an Input Description element. If
+                found, set our ``input_desc``
+
+        **Returns:**
+            (bool)
+                True if found InputDescription Fields (even if blank)
+
+        **Raises:**
+            None
+
+        """
+        # If the text field is empty, this will return None, which is the
+        # default value of viewing_desc and input_desc anyway.
+        try:
+            self.input_desc = xml_element.find('InputDescription').text
+            return True
+        except AttributeError:
+            # We don't have an InputDescription and that's ok.
+            return False
+
+    # =========================================================================
+
+    def parse_xml_viewing_desc(self, xml_element):
+        """Parses an ElementTree element to find & add a viewing description
+
+        **Args:**
+            xml_element : (``xml.etree.ElementTree.Element``)
+                The element to parse for a Viewing Description element. If
+                found, set our ``viewing_desc``
+
+        **Returns:**
+            (bool)
+                True if found InputDescription Fields (even if blank)
+
+        **Raises:**
+            None
+
+        """
+        # If the text field is empty, this will return None, which is the
+        # default value of viewing_desc and input_desc anyway.
+        try:
+            self.viewing_desc = xml_element.find('ViewingDescription').text
+            return True
+        except AttributeError:
+            # We don't have a ViewingDescription and that's ok.
+            return False
 
 # ==============================================================================
 
@@ -392,6 +746,9 @@ class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
             end of the list, but desc can also be replaced by passing it a list
             or tuple. Desc can be emptied by passing it None, [] or ().
 
+            Most nodes never have a description, so the list isn't created
+            until ``desc`` is first read or set. Until then ``_desc`` is None.
+
             Inherited from :class:`AscDescBase` .
 
         element : (<xml.etree.ElementTree.Element>)
@@ -423,6 +780,8 @@ class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
             :class:`AscDescBase`
 
     """
+    __slots__ = ()
+
     def __init__(self):
         super(ColorNodeBase, self).__init__()
 
@@ -443,8 +802,9 @@ class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
                 If false, do not allow negative values.
 
         **Returns:**
-            (Decimal)
-                If value passes all tests, returns value as Decimal.
+            (Decimal|float)
+                If value passes all tests, returns value as Decimal, or as a
+                float if ``config.FAST_MATH`` is enabled.
 
         **Raises:**
             TypeError:
@@ -454,7 +814,8 @@ class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
                 If negative is False, raised if value given is negative.
 
         """
-        value = to_decimal(value, name)
+        fast_math = config.FAST_MATH
+        value = to_float(value, name) if fast_math else to_decimal(value, name)
         # If given as a single number, that number must be positive
         if not negative_allow:
             if value < 0:
@@ -467,6 +828,6 @@ class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
                         )
                     )
                 else:
-                    value = Decimal('0.0')
+                    value = 0.0 if fast_math else Decimal('0.0')
 
         return value
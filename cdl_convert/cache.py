@@ -0,0 +1,578 @@
+#!/usr/bin/env python
+"""
+
+CDL Convert Cache
+=================
+
+An on disk cache of parsed files, so that the same show files read over and
+over (once per render farm task, say) only have their XML parsed once.
+
+## Public Classes
+
+    ParseCache
+        A directory of compact, serialized parse results, keyed by the path
+        of the file parsed. Entries are only used while the size & mtime
+        (and optionally a hash of the contents) of that file still match.
+
+## License
+
+The MIT License (MIT)
+
+cdl_convert
+Copyright (c) 2015 Sean Wallitsch
+http://github.com/shidarin/cdl_convert/
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Standard Imports
+
+from decimal import Decimal
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+
+# cdl_convert imports
+
+from .base import _XMLList
+from .collection import ColorCollection
+from . import config
+from .correction import ColorCorrection, SatNode, SopNode
+from .decision import ColorCorrectionRef, ColorDecision, MediaRef
+from . import parse
+from .registry import Registry, current_registry
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+# Bumped whenever the layout of a serialized entry changes, so that entries
+# written by an older cdl_convert are treated as misses rather than misread.
+CACHE_VERSION = 1
+
+ENTRY_EXT = '.cdlcache'
+
+# 256 MB
+MAX_BYTES = 256 * 1024 * 1024
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+__all__ = [
+    'ParseCache',
+]
+
+# ==============================================================================
+# CLASSES
+# ==============================================================================
+
+
+class ParseCache(object):
+    """A directory of serialized parse results
+
+    Description
+    ~~~~~~~~~~~
+
+    Each file parsed through the cache gets one entry in ``directory`` ,
+    named after a hash of its absolute path, its filetype and the
+    ``config.FAST_MATH`` and ``config.HALT_ON_ERROR`` settings it was parsed
+    with (both of which change what a parse returns).
+
+    An entry stores the size and mtime of the file when it was parsed, and if
+    ``hash_contents`` is set, a SHA-1 of its contents. A load only uses the
+    entry if those still match the file on disk, otherwise the file is parsed
+    again and the entry replaced. Hashing the contents catches files that are
+    rewritten within the mtime resolution of the filesystem without changing
+    size, at the cost of reading the file on every load.
+
+    Entries are plain data (ids, descriptions and values as the strings they
+    were parsed from) as zlib compressed JSON, never pickles, so a cache
+    shared between many users can't be used to run code. On a hit the
+    nodes are built through their constructors, so they're registered and
+    id collisions are handled as usual, but everything else is set straight
+    onto them, skipping the checks the setters make, which the values
+    already passed when the file was parsed. A miss is parsed into a private
+    registry, so the ids stored are the ones in the file, never ones suffixed
+    to dodge ids the caller already had. The parsed nodes are then moved
+    over to the caller's registry, with any id collisions handled there.
+
+    Entries are written to a temp file in ``directory`` and then renamed
+    into place, so any number of processes can read and write the same cache
+    at once; a reader sees either a whole entry or none. An entry that can't
+    be read or decoded is simply a miss.
+
+    When storing an entry pushes the cache over ``max_bytes`` , the least
+    recently used entries are removed until it fits. Every hit touches the
+    mtime of its entry, which is what least recently used is judged by.
+
+    **Attributes:**
+
+        directory : (str)
+            Absolute path to the directory holding the entries. Created if it
+            doesn't exist.
+
+        hash_contents : (bool)
+            If True, entries are also keyed by a hash of the file's contents.
+
+        hits : (int)
+            Number of loads answered from the cache.
+
+        max_bytes : (int)
+            Size the entries are evicted down to.
+
+        misses : (int)
+            Number of loads that had to parse the file.
+
+    **Public Methods:**
+
+        clear()
+            Removes every entry from the cache.
+
+        load()
+            Returns the parsed file, from the cache if possible.
+
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, hash_contents=False):
+        if max_bytes < 0:
+            raise ValueError(
+                "ParseCache max_bytes can't be negative, got: {max}".format(
+                    max=max_bytes
+                )
+            )
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        self.hits = 0
+        self.misses = 0
+
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:  # pragma: no cover
+                # Another process got there first
+                if not os.path.isdir(self.directory):
+                    raise
+
+    # Private Methods =========================================================
+
+    def _entries(self):
+        """Returns (mtime, size, path) of every entry, oldest first"""
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(ENTRY_EXT):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed by another process since we listed it
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    # =========================================================================
+
+    def _entry_path(self, filepath, filetype):
+        """Returns the path of the entry for a file"""
+        key = json.dumps(
+            [filepath, filetype, config.FAST_MATH, config.HALT_ON_ERROR]
+        )
+        return os.path.join(
+            self.directory,
+            hashlib.sha1(key.encode('utf-8')).hexdigest() + ENTRY_EXT
+        )
+
+    # =========================================================================
+
+    def _evict(self):
+        """Removes the least recently used entries until under max_bytes"""
+        entries = self._entries()
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Another process already evicted it
+                pass
+            total -= size
+
+    # =========================================================================
+
+    def _fingerprint(self, filepath):
+        """Returns what an entry must match for filepath to still be valid"""
+        stat = os.stat(filepath)
+        fingerprint = [
+            stat.st_size, getattr(stat, 'st_mtime_ns', stat.st_mtime), None
+        ]
+        if self.hash_contents:
+            sha = hashlib.sha1()
+            with open(filepath, 'rb') as source:
+                for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                    sha.update(chunk)
+            fingerprint[2] = sha.hexdigest()
+        return fingerprint
+
+    # =========================================================================
+
+    def _read(self, entry_path, fingerprint):
+        """Returns the serialized node in an entry, or None on a miss"""
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                entry = json.loads(
+                    zlib.decompress(entry_file.read()).decode('utf-8')
+                )
+        except (IOError, OSError, ValueError, zlib.error):
+            return None
+
+        if not isinstance(entry, dict) or \
+                entry.get('version') != CACHE_VERSION or \
+                entry.get('fingerprint') != fingerprint:
+            return None
+
+        try:
+            os.utime(entry_path, None)
+        except OSError:  # pragma: no cover
+            pass
+
+        return entry.get('node')
+
+    # =========================================================================
+
+    def _write(self, entry_path, fingerprint, node):
+        """Atomically writes an entry, then evicts down to max_bytes"""
+        data = zlib.compress(
+            json.dumps(
+                {
+                    'version': CACHE_VERSION,
+                    'fingerprint': fingerprint,
+                    'node': node,
+                },
+                separators=(',', ':')
+            ).encode('utf-8')
+        )
+
+        handle, temp_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                temp_file.write(data)
+            # os.rename replaces atomically on POSIX, but not on Windows
+            getattr(os, 'replace', os.rename)(temp_path, entry_path)
+        except (IOError, OSError):
+            # The cache is only ever an optimization, so a full disk or
+            # read only directory mustn't fail the parse.
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        self._evict()
+
+    # Public Methods ==========================================================
+
+    def clear(self):
+        """Removes every entry from the cache"""
+        for mtime, size, path in self._entries():  # pylint: disable=W0612
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # =========================================================================
+
+    def load(self, filepath, filetype=None):
+        """Returns the parsed file, from the cache if possible
+
+        **Args:**
+            filepath : (str)
+                The filepath to the file. Must exist.
+
+            filetype=None : (str)
+                A file extension corresponding to the CDL type to convert
+                from. If not provided, we'll derive it from the filepath.
+
+        **Returns:**
+            :class:`ColorCorrection` or :class:`ColorCollection`
+                Exactly as ``parse_file`` would return.
+
+        **Raises:**
+            Anything ``parse_file`` would raise on a miss.
+
+        """
+        filepath = os.path.abspath(filepath)
+        if not filetype:
+            filetype = os.path.basename(filepath).split('.')[-1].lower()
+
+        entry_path = self._entry_path(filepath, filetype)
+        fingerprint = self._fingerprint(filepath)
+
+        node = self._read(entry_path, fingerprint)
+        if node is not None:
+            self.hits += 1
+            return _load_node(node)
+
+        self.misses += 1
+        with Registry() as registry:
+            result = parse.INPUT_FORMATS[filetype](filepath)
+
+        # If the file changed while we parsed it, what we parsed may not
+        # match the fingerprint we took, so don't store it.
+        if self._fingerprint(filepath) == fingerprint:
+            self._write(entry_path, fingerprint, _dump_node(result))
+
+        _move_members(registry, current_registry())
+        return result
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _dump_cc(cc):
+    """Serializes a ColorCorrection into plain data"""
+    data = {
+        'id': cc.id,
+        'file_in': cc.file_in,
+        'desc': cc._desc or [],  # pylint: disable=W0212
+        'input_desc': cc.input_desc,
+        'viewing_desc': cc.viewing_desc,
+    }
+    if cc.metadata:
+        data['metadata'] = cc.metadata
+    if cc.has_sop:
+        data['sop'] = [
+            [str(value) for value in values]
+            for values in (cc.slope, cc.offset, cc.power)
+        ]
+        data['sop_desc'] = cc.sop_node._desc or []  # pylint: disable=W0212
+    if cc.has_sat:
+        data['sat'] = str(cc.sat)
+        data['sat_desc'] = cc.sat_node._desc or []  # pylint: disable=W0212
+    return data
+
+# ==============================================================================
+
+
+def _dump_collection(col):
+    """Serializes a ColorCollection into plain data"""
+    return {
+        'type': col.type,
+        'file_in': col.file_in,
+        'desc': col._desc or [],  # pylint: disable=W0212
+        'input_desc': col.input_desc,
+        'viewing_desc': col.viewing_desc,
+        'color_corrections': [_dump_cc(cc) for cc in col.color_corrections],
+        'color_decisions': [
+            _dump_decision(decision) for decision in col.color_decisions
+        ],
+    }
+
+# ==============================================================================
+
+
+def _dump_decision(decision):
+    """Serializes a ColorDecision into plain data"""
+    data = {
+        'desc': decision._desc or [],  # pylint: disable=W0212
+        'input_desc': decision.input_desc,
+        'viewing_desc': decision.viewing_desc,
+    }
+    if decision.is_ref:
+        data['ref'] = decision.cc.id
+    else:
+        data['cc'] = _dump_cc(decision.cc)
+    if decision.media_ref:
+        data['media_ref'] = decision.media_ref.ref
+    return data
+
+# ==============================================================================
+
+
+def _dump_node(node):
+    """Serializes a parse result into plain data"""
+    if isinstance(node, ColorCollection):
+        return {'collection': _dump_collection(node)}
+    return {'cc': _dump_cc(node)}
+
+# ==============================================================================
+
+
+def _desc_list(node, desc):
+    """Returns the desc list of node holding desc, or None if it's empty"""
+    return _XMLList(node, desc) if desc else None
+
+# ==============================================================================
+
+
+def _load_cc(data):
+    """Builds a ColorCorrection from its serialized data
+
+    Only the id goes through the constructor's checks. The values were
+    checked when they were first set, and are stored as the exact strings
+    of the Decimals or floats they became.
+
+    """
+    # pylint: disable=W0212
+    number = float if config.FAST_MATH else Decimal
+
+    cc = ColorCorrection(data['id'])
+    cc._file_in = data['file_in']
+    cc._desc = _desc_list(cc, data['desc'])
+    cc._input_desc = data['input_desc']
+    cc._viewing_desc = data['viewing_desc']
+    if 'metadata' in data:
+        cc.metadata.update(data['metadata'])
+    if 'sop' in data:
+        sop = SopNode(cc)
+        sop._slope, sop._offset, sop._power = [
+            [number(value) for value in values] for values in data['sop']
+        ]
+        sop._desc = _desc_list(sop, data['sop_desc'])
+        cc._sop_node = sop
+    if 'sat' in data:
+        sat = SatNode(cc)
+        sat._sat = number(data['sat'])
+        sat._desc = _desc_list(sat, data['sat_desc'])
+        cc._sat_node = sat
+    return cc
+
+# ==============================================================================
+
+
+def _load_collection(data):
+    """Builds a ColorCollection from its serialized data"""
+    # pylint: disable=W0212
+    col = ColorCollection()
+    col._file_in = data['file_in']
+    col._type = data['type']
+    col._desc = _desc_list(col, data['desc'])
+    col._input_desc = data['input_desc']
+    col._viewing_desc = data['viewing_desc']
+
+    color_corrections = [
+        _load_cc(cc_data) for cc_data in data['color_corrections']
+    ]
+    color_decisions = [
+        _load_decision(decision_data)
+        for decision_data in data['color_decisions']
+    ]
+    for child in color_corrections + color_decisions:
+        child.parent = col
+    col._color_corrections = _XMLList(col, color_corrections)
+    col._color_decisions = _XMLList(col, color_decisions)
+
+    return col
+
+# ==============================================================================
+
+
+def _load_decision(data):
+    """Builds a ColorDecision from its serialized data"""
+    if 'ref' in data:
+        cc = ColorCorrectionRef(data['ref'])
+    else:
+        cc = _load_cc(data['cc'])
+    media = MediaRef(data['media_ref']) if 'media_ref' in data else None
+
+    decision = ColorDecision(cc, media)
+    # pylint: disable=W0212
+    decision._desc = _desc_list(decision, data['desc'])
+    decision._input_desc = data['input_desc']
+    decision._viewing_desc = data['viewing_desc']
+    return decision
+
+# ==============================================================================
+
+
+def _load_node(data):
+    """Builds a parse result from its serialized data"""
+    if 'collection' in data:
+        return _load_collection(data['collection'])
+    return _load_cc(data['cc'])
+
+# ==============================================================================
+
+
+def _move_members(source, target):
+    """Moves every node registered with source over to target
+
+    A ColorCorrection whose id target already has is handled as the
+    constructor would. If ``config.HALT_ON_ERROR`` is set that raises a
+    ValueError, before anything has moved. Otherwise it takes the next free
+    suffixed id.
+
+    """
+    # pylint: disable=W0212
+    color_corrections = source.members(ColorCorrection)
+    taken = target.members(ColorCorrection)
+    if config.HALT_ON_ERROR:
+        for cc_id in color_corrections:
+            if cc_id in taken:
+                raise ValueError(
+                    'Error initiating id to "{id}". This id is already a '
+                    'registered id.'.format(
+                        id=cc_id
+                    )
+                )
+
+    for cc in list(color_corrections.values()):
+        cc._registry = target
+        if cc._id in taken:
+            cc._id = cc._next_free_id(cc._id)
+            # Any collection holding cc indexed it by its old id.
+            ColorCorrection._id_generation += 1
+        taken[cc._id] = cc
+
+    # Decisions are registered under the id of their cc, which may have
+    # just changed.
+    decisions = target.members(ColorDecision)
+    for members in source.members(ColorDecision).values():
+        for decision in members:
+            decision._registry = target
+            decisions.setdefault(decision.cc.id, []).append(decision)
+
+    for cls in (ColorCorrectionRef, MediaRef):
+        moved = target.members(cls)
+        for key, members in source.members(cls).items():
+            for node in members:
+                node._registry = target
+            moved.setdefault(key, []).extend(members)
+
+    collections = target.members(ColorCollection)
+    for col in source.members(ColorCollection):
+        col._registry = target
+        collections.append(col)
+
+    source.reset()
@@ -8,13 +8,24 @@ Contains the script functions for using cdl_convert as a script.
 
 ## Public Functions
 
+    convert_file()
+        Parses a single input file and writes all requested outputs for it.
+
+    convert_many()
+        Converts a list of files, either one after another or fanned out
+        across a pool of worker processes, yielding results in order.
+
+    expand_inputs()
+        Expands a list of input paths, globs and directories into the list of
+        files to be converted.
+
     parse_args()
         Uses argparse to parse the command line args provided to cdl_convert.
 
     main()
-        Main script runner, this calls parse_args, determines the input and
-        output extensions, calls the correct parser and determines how to
-        fulfill the output requested.
+        Main script runner, this calls parse_args, expands the inputs, then
+        converts each input file in turn, each with its own member registries,
+        and reports any files that failed.
 
 ## License
 
@@ -53,12 +64,28 @@ from __future__ import absolute_import, print_function
 # Standard Imports
 
 from argparse import ArgumentParser
+from contextlib import contextmanager
+import glob
 import os
+import sys
+import time
+try:
+    from StringIO import StringIO
+except ImportError:  # pragma: no cover
+    from io import StringIO
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # pragma: no cover
+    # Python 2 needs the 'futures' backport for parallel conversions.
+    ProcessPoolExecutor = None  # pylint: disable=C0103
 
 # cdl_convert imports
 
 from . import config, parse, write
+from .cache import ParseCache
 from .collection import ColorCollection
+from .registry import Registry
 from .utils import sanity_check
 
 # Python 3 compatibility
@@ -72,23 +99,435 @@ try:
 except NameError:  # pragma: no cover
     raw_input = input  # pylint: disable=W0622, C0103
 
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+# Keyword options of convert_file, which convert_many passes along.
+_CONVERT_OPTIONS = (
+    'output', 'filetype', 'single', 'check', 'no_output', 'cache', 'sink',
+    'writers', 'writer_pool',
+)
+
 # ==============================================================================
 # EXPORTS
 # ==============================================================================
 
-__all__ = []
+__all__ = [
+    'convert_file',
+    'convert_many',
+]
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _convert_isolated(filepath, destination_dir, options, settings):
+    """Converts one file in a worker process, returning what it printed
+
+    ``settings`` carries the parent's config, which spawned (rather than
+    forked) workers would otherwise not see.
+
+    """
+    for name, value in settings.items():
+        setattr(config, name, value)
+
+    stdout = sys.stdout
+    sys.stdout = log = StringIO()
+    try:
+        error = _try_convert(filepath, destination_dir, options)
+    finally:
+        sys.stdout = stdout
+
+    return log.getvalue(), error
+
+# ==============================================================================
+
+
+@contextmanager
+def _output_sink(filepath, destination_dir, sink=None, no_output=False):
+    """Hands the outputs of an input file to the named sink, if any
+
+    Archives, and the index of a 'dir' sink, are named after the input file
+    and written to the destination directory.
+
+    """
+    if not sink or no_output:
+        yield
+        return
+
+    kind = sink
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    if kind == 'dir':
+        sink = write.DirectorySink(
+            destination_dir,
+            os.path.join(destination_dir, name + '.index.json')
+        )
+        path = sink.index_path
+    else:
+        path = os.path.join(destination_dir, name + '.' + kind)
+        sink = write.OUTPUT_SINKS[kind](path, destination_dir)
+
+    print(
+        "Writing outputs to {sink} sink {path}".format(sink=kind, path=path)
+    )
+    with sink:
+        yield
+
+# ==============================================================================
+
+
+def _try_convert(filepath, destination_dir, options):
+    """Converts a file, returning any error rather than raising it
+
+    The file is converted within its own :class:`Registry` , so its ids never
+    collide with those of other files, or with the caller's own members. Its
+    outputs are written in a single ``write.batch_writes`` , so with
+    ``--fsync`` each output directory is synced once per input file, and
+    handed to the sink named in ``options`` , if any.
+
+    """
+    try:
+        with Registry():
+            with write.batch_writes():
+                with _output_sink(
+                    filepath, destination_dir,
+                    options.get('sink'), options.get('no_output', False)
+                ):
+                    convert_file(filepath, destination_dir, **options)
+    except Exception as err:  # pylint: disable=W0703
+        if config.HALT_ON_ERROR:
+            raise
+        print(
+            "Error converting {path}: {err}".format(path=filepath, err=err)
+        )
+        return err
+
+    return None
 
 # ==============================================================================
 # PUBLIC FUNCTIONS
 # ==============================================================================
 
 
+def convert_file(  # pylint: disable=R0912, R0913, R0914, R0915
+        filepath, destination_dir, output=None, filetype=None, single=False,
+        check=False, no_output=False, cache=None, sink=None, writers=None,
+        writer_pool='thread'
+):
+    """Parses a single file and writes every requested output for it
+
+    Nodes are registered with the active :class:`Registry` , as with any
+    parse.
+
+    **Args:**
+        filepath : (str)
+            Absolute path to the file to convert.
+
+        destination_dir : (str)
+            Absolute path to the directory converted files are written to.
+
+        output=None : [str]
+            Extensions from ``write.OUTPUT_FORMATS`` to write, ``['cc']`` if
+            not given.
+
+        filetype=None : (str)
+            Extension from ``parse.INPUT_FORMATS`` to parse the file as,
+            rather than the file's own extension.
+
+        single=False : (bool)
+            Write each correction of a collection to its own file, for every
+            output format.
+
+        check=False : (bool)
+            Sanity check every correction before writing.
+
+        no_output=False : (bool)
+            Report what would be written, without writing anything.
+
+        cache=None : (str)
+            Directory of a :class:`ParseCache` to parse through.
+
+        sink=None : (str)
+            Not used here, accepted so the same options can be handed to
+            ``convert_many`` .
+
+        writers=None : (int)
+            Number of workers writing the files of a collection, as
+            ``write.write_many`` . By default, LUTs are written by a full
+            pool and everything else one file at a time.
+
+        writer_pool='thread' : (str)
+            'thread' or 'process', the kind of pool ``writers`` runs on.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        Anything raised by the parser or writers for this file.
+
+    """
+    del sink  # Handled by convert_many
+    if output is None:
+        output = ['cc']
+    if not filetype:
+        filetype_in = os.path.basename(filepath).split('.')[-1].lower()
+    else:
+        filetype_in = filetype
+
+    cache = ParseCache(cache) if cache else None
+    color_decisions = parse.parse_file(filepath, filetype_in, cache=cache)
+
+    def set_single_dest(cdl, ext):
+        """Sets and reports the destination of a single color correction"""
+        cdl.determine_dest(ext, destination_dir)
+        print(
+            "Writing cdl {id} to {path}".format(
+                id=cdl.id,
+                path=cdl.file_out
+            )
+        )
+
+    def write_single_file(cdl, ext):
+        """Writes a single color correction file"""
+        set_single_dest(cdl, ext)
+        if not no_output:
+            write.OUTPUT_FORMATS[ext](cdl)
+
+    def write_single_files(cdls, ext):
+        """Writes each color correction to its own file, reporting speed"""
+        for cdl in cdls:
+            set_single_dest(cdl, ext)
+        if no_output:
+            return
+
+        workers = writers
+        if workers is None and ext not in config.LUT_FORMATS:
+            # LUTs bake on a full thread pool by default, everything else only
+            # fans out when asked to.
+            workers = 1
+        start = time.time()
+        write.write_many(
+            cdls, ext, workers=workers,
+            processes=writer_pool == 'process'
+        )
+        elapsed = time.time() - start
+        print(
+            "Wrote {count} {ext} files in {secs:.2f} seconds "
+            "({rate:.0f} files per second)".format(
+                count=len(cdls), ext=ext, secs=elapsed,
+                rate=len(cdls) / elapsed if elapsed else float('inf')
+            )
+        )
+
+    def write_collection_file(col, ext):
+        """Writes a collection file"""
+        if ext in config.XML_COLLECTION_FORMATS:
+            col.type = ext
+            col.determine_dest(destination_dir)
+        else:
+            # Binary collections keep whichever type they were read as
+            col.determine_dest(destination_dir, ext)
+        print(
+            "Writing collection to {path}".format(
+                path=col.file_out
+            )
+        )
+        if not no_output:
+            write.OUTPUT_FORMATS[ext](col)
+
+    if color_decisions:
+        # Sanity Check
+        if check:
+            if filetype_in in config.COLLECTION_FORMATS:
+                for color_correct in color_decisions.color_corrections:
+                    sanity_check(color_correct)
+            else:
+                sanity_check(color_decisions)
+
+        # Writing
+        for ext in output:
+            if ext in config.SINGLE_FORMATS or single:
+                if filetype_in in config.COLLECTION_FORMATS:
+                    write_single_files(color_decisions.color_corrections, ext)
+                else:
+                    write_single_file(color_decisions, ext)
+            else:
+                if filetype_in in config.COLLECTION_FORMATS:
+                    # If we read a collection type, color_decisions is
+                    # already a ColorCollection.
+                    write_collection_file(color_decisions, ext)
+                else:
+                    # If we read a single, non-collection file, we need to
+                    # create a collection for exporting.
+                    #
+                    # Since we only read a single file, we can safely use that
+                    # filepath as the input_file.
+                    #
+                    # If we read a group of files, we would want to default to
+                    # the generic collection naming.
+                    collection = ColorCollection(input_file=filepath)
+                    collection.append_child(color_decisions)
+                    write_collection_file(collection, ext)
+
+# ==============================================================================
+
+
+def convert_many(filepaths, destination_dir, jobs=1, **options):
+    """Converts many files, yielding each result in the order given
+
+    Each file is parsed and written within its own :class:`Registry` , so
+    files can reuse the same ids, and the members of the caller's registry
+    are left as they were.
+
+    **Args:**
+        filepaths : [str]
+            Absolute paths to the files to convert.
+
+        destination_dir : (str)
+            Absolute path to the directory converted files are written to.
+
+        jobs=1 : (int)
+            Number of worker processes to convert with. With a single job,
+            files are converted in this process. With more, each file is
+            converted in a ``ProcessPoolExecutor`` worker, and the output
+            each worker prints is replayed here in submission order.
+
+        **options
+            Any of the options of ``convert_file`` . ``sink`` names the
+            ``write.OUTPUT_SINKS`` entry, or 'dir' for a
+            ``write.DirectorySink`` , that each file's outputs are handed
+            to, named after the file.
+
+    **Yields:**
+        (str, Exception|None)
+            Each filepath along with the error that stopped its conversion,
+            or None if it converted cleanly.
+
+    **Raises:**
+        TypeError:
+            If given an option ``convert_file`` doesn't take.
+
+        ValueError:
+            If jobs is less than 1.
+
+        Any error converting a file, if ``config.HALT_ON_ERROR`` is set.
+
+    """
+    unknown = set(options) - set(_CONVERT_OPTIONS)
+    if unknown:
+        raise TypeError(
+            "convert_many got unexpected options: {options}".format(
+                options=', '.join(sorted(unknown))
+            )
+        )
+    if jobs < 1:
+        raise ValueError(
+            "Number of jobs must be at least 1, got: {jobs}".format(jobs=jobs)
+        )
+
+    filepaths = list(filepaths)
+    batch = len(filepaths) > 1
+
+    if jobs > 1 and ProcessPoolExecutor is None:  # pragma: no cover
+        print(
+            "Parallel conversion requires concurrent.futures, converting "
+            "one file at a time instead."
+        )
+        jobs = 1
+
+    if jobs == 1:
+        for filepath in filepaths:
+            if batch:
+                print("Converting {path}".format(path=filepath))
+            yield filepath, _try_convert(filepath, destination_dir, options)
+        return
+
+    settings = dict(
+        (name, getattr(config, name)) for name in config.PROCESS_SETTINGS
+    )
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    futures = []
+    try:
+        futures = [
+            executor.submit(
+                _convert_isolated, filepath, destination_dir, options,
+                settings
+            ) for filepath in filepaths
+        ]
+        for filepath, future in zip(filepaths, futures):
+            log, error = future.result()
+            if batch:
+                print("Converting {path}".format(path=filepath))
+            sys.stdout.write(log)
+            yield filepath, error
+    finally:
+        # If we're stopping early, don't start any files still queued.
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+
+# ==============================================================================
+
+
+def expand_inputs(paths):
+    """Expands input paths, globs and directories into a list of files
+
+    **Args:**
+        paths : [str]
+            Paths as given on the command line. Any path containing glob
+            characters is expanded. Directories are walked recursively, and
+            every file with an extension found in ``parse.INPUT_FORMATS`` is
+            picked up, in sorted order. Any other path is passed through
+            as is, even if it doesn't exist, so the parser can report it.
+
+    **Returns:**
+        [str]
+            The files to convert, in the order given, without duplicates.
+
+    **Raises:**
+        None
+
+    """
+    files = []
+
+    def add_path(path):
+        """Adds a file, or every convertible file beneath a directory"""
+        if os.path.isdir(path):
+            for root, dirs, filenames in os.walk(path):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    ext = filename.split('.')[-1].lower()
+                    if '.' in filename and ext in parse.INPUT_FORMATS:
+                        add_path(os.path.join(root, filename))
+        elif path not in files:
+            files.append(path)
+
+    for path in paths:
+        if glob.has_magic(path):
+            matches = sorted(glob.glob(path))
+            if not matches:
+                # Pass the pattern along, so it's reported as a failed input.
+                matches = [path]
+            for match in matches:
+                add_path(match)
+        else:
+            add_path(path)
+
+    return files
+
+# ==============================================================================
+
+
 def parse_args():
     """Uses argparse to parse command line arguments"""
     parser = ArgumentParser()
     parser.add_argument(
-        "input_file",
-        help="the file to be converted"
+        "input_files",
+        nargs='+',
+        help="the files to be converted. Directories are searched recursively "
+             "for supported input formats, and glob patterns are expanded."  # pylint: disable=C0330
     )
     parser.add_argument(
         "-i",
@@ -121,6 +560,53 @@ def parse_args():
              "Saturation, and automatically generating a new id for a "  # pylint: disable=C0330
              "ColorCorrect if no or a bad id is given."  # pylint: disable=C0330
     )
+    parser.add_argument(
+        "--cache",
+        help="directory of cached parse results. Input files that haven't "
+             "changed since they were last parsed with the same cache are "  # pylint: disable=C0330
+             "loaded from it instead of being parsed again. Safe to share "  # pylint: disable=C0330
+             "between many processes."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--fast-math",
+        action='store_true',
+        help="stores color values as native floats rather than Decimals. "
+             "Uses far less memory when converting very large files, but "  # pylint: disable=C0330
+             "isn't faster, and values are only exact to about 15 "  # pylint: disable=C0330
+             "significant digits."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of files to convert in parallel, each in its own "
+             "process. Defaults to 1."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        help="number of threads or processes writing the files of each "
+             "collection when each color correction gets its own file, such "  # pylint: disable=C0330
+             "as with '--single' or LUT outputs. Defaults to 1, except for "  # pylint: disable=C0330
+             "LUTs, which default to a pool sized for the machine."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--writer-pool",
+        choices=['thread', 'process'],
+        default='thread',
+        help="whether '--writers' are threads or processes. Threads suit "
+             "slow disks and LUT baking, processes suit the XML formats, "  # pylint: disable=C0330
+             "which spend most of their time building the XML. Defaults to "  # pylint: disable=C0330
+             "thread."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--lut-size",
+        type=int,
+        default=config.LUT_SIZE,
+        help="number of lattice points along each axis of baked 3D LUTs "
+             "(cube, 3dl and spi3d outputs). Defaults to 33."  # pylint: disable=C0330
+    )
     parser.add_argument(
         "--no-output",
         action='store_true',
@@ -137,6 +623,37 @@ def parse_args():
              "flagged. Note that depending on the look, these still might "  # pylint: disable=C0330
              "be correct values."  # pylint: disable=C0330
     )
+    parser.add_argument(
+        "--sink",
+        choices=sorted(write.OUTPUT_SINKS),
+        help="writes every output of each input file into a single archive "
+             "named after it, rather than a file per output, along with an "  # pylint: disable=C0330
+             "index.json member mapping each color correction id to the "  # pylint: disable=C0330
+             "members holding it. 'dir' writes the files as usual, plus the "  # pylint: disable=C0330
+             "index as <input name>.index.json."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--atomic",
+        action='store_true',
+        help="writes each file to a temp file beside it, then renames it into "
+             "place, so anything reading the output never sees a partly "  # pylint: disable=C0330
+             "written file."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--fsync",
+        action='store_true',
+        help="implies '--atomic', and also makes sure every written file is "
+             "on disk before cdl_convert finishes with each input file, so "  # pylint: disable=C0330
+             "a crash or power loss can't lose it."  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action='store_true',
+        help="leaves output files alone if they already hold exactly what "
+             "would be written, so their modification times are kept. "  # pylint: disable=C0330
+             "Useful when regularly re-exporting grades that mostly haven't "  # pylint: disable=C0330
+             "changed."  # pylint: disable=C0330
+    )
     parser.add_argument(
         "--single",
         action='store_true',
@@ -182,9 +699,44 @@ def parse_args():
     if not args.destination:
         args.destination = './converted/'
 
+    if args.jobs < 1:
+        raise ValueError(
+            "The number of jobs must be at least 1, got: {jobs}".format(
+                jobs=args.jobs
+            )
+        )
+
+    if args.writers is not None and args.writers < 1:
+        raise ValueError(
+            "The number of writers must be at least 1, got: {writers}".format(
+                writers=args.writers
+            )
+        )
+
+    if args.lut_size < 2:
+        raise ValueError(
+            "The LUT size must be at least 2, got: {size}".format(
+                size=args.lut_size
+            )
+        )
+
     if args.halt:
         config.HALT_ON_ERROR = True
 
+    if args.fast_math:
+        config.FAST_MATH = True
+
+    if args.skip_unchanged:
+        config.SKIP_UNCHANGED = True
+
+    if args.atomic or args.fsync:
+        config.ATOMIC_WRITES = True
+
+    if args.fsync:
+        config.FSYNC = True
+
+    config.LUT_SIZE = args.lut_size
+
     return args
 
 # ==============================================================================
@@ -192,14 +744,17 @@ def parse_args():
 # ==============================================================================
 
 
-def main():  # pylint: disable=R0912
+def main():
     """Will figure out input and destination filetypes, then convert"""
     args = parse_args()
 
     if args.no_output:
         print("Dry run initiated, no files will be written.")
 
-    filepath = os.path.abspath(args.input_file)
+    filepaths = [
+        os.path.abspath(filepath)
+        for filepath in expand_inputs(args.input_files)
+    ]
     destination_dir = os.path.abspath(args.destination)
 
     if not os.path.exists(destination_dir):
@@ -214,75 +769,48 @@ def main():  # pylint: disable=R0912
         else:
             print("--no-output argument provided. Skipping directory creation")
 
-    if not args.input:
-        filetype_in = os.path.basename(filepath).split('.')[-1].lower()
-    else:
-        filetype_in = args.input
-
-    color_decisions = parse.parse_file(filepath, filetype_in)
+    batch = len(filepaths) > 1
+    failures = []
+
+    results = convert_many(
+        filepaths, destination_dir,
+        jobs=max(1, min(args.jobs, len(filepaths))),
+        output=args.output,
+        filetype=args.input,
+        single=args.single,
+        check=args.check,
+        no_output=args.no_output,
+        cache=args.cache,
+        sink=args.sink,
+        writers=args.writers,
+        writer_pool=args.writer_pool,
+    )
+    for filepath, err in results:
+        if err is not None:
+            failures.append((filepath, err))
 
-    def write_single_file(cdl, ext):
-        """Writes a single color correction file"""
-        cdl.determine_dest(ext, destination_dir)
+    if batch or failures:
         print(
-            "Writing cdl {id} to {path}".format(
-                id=cdl.id,
-                path=cdl.file_out
+            "Converted {done} of {total} files.".format(
+                done=len(filepaths) - len(failures),
+                total=len(filepaths)
             )
         )
-        if not args.no_output:
-            write.OUTPUT_FORMATS[ext](cdl)
-
-    def write_collection_file(col, ext):
-        """Writes a collection file"""
-        col.type = ext
-        col.determine_dest(destination_dir)
-        print(
-            "Writing collection to {path}".format(
-                path=col.file_out
+    if failures:
+        print("The following files could not be converted:")
+        for filepath, err in failures:
+            print(
+                "    {path}: {type}: {err}".format(
+                    path=filepath, type=type(err).__name__, err=err
+                )
             )
-        )
-        if not args.no_output:
-            write.OUTPUT_FORMATS[ext](col)
+        return 1
 
-    if color_decisions:
-        # Sanity Check
-        if args.check:
-            if filetype_in in config.COLLECTION_FORMATS:
-                for color_correct in color_decisions.color_corrections:
-                    sanity_check(color_correct)
-            else:
-                sanity_check(color_decisions)
-
-        # Writing
-        for ext in args.output:
-            if ext in config.SINGLE_FORMATS or args.single:
-                if filetype_in in config.COLLECTION_FORMATS:
-                    for color_correct in color_decisions.color_corrections:
-                        write_single_file(color_correct, ext)
-                else:
-                    write_single_file(color_decisions, ext)
-            else:
-                if filetype_in in config.COLLECTION_FORMATS:
-                    # If we read a collection type, color_decisions is
-                    # already a ColorCollection.
-                    write_collection_file(color_decisions, ext)
-                else:
-                    # If we read a single, non-collection file, we need to
-                    # create a collection for exporting.
-                    #
-                    # Since we only read a single file, we can safely use that
-                    # filepath as the input_file.
-                    #
-                    # If we read a group of files, we would want to default to
-                    # the generic collection naming.
-                    collection = ColorCollection(input_file=filepath)
-                    collection.append_child(color_decisions)
-                    write_collection_file(collection, ext)
+    return 0
 
 if __name__ == '__main__':  # pragma: no cover
     try:
-        main()
+        sys.exit(main())
     except Exception as err:  # pylint: disable=W0703
         import traceback
         print('Unexpected error encountered:')
@@ -0,0 +1,586 @@
+#!/usr/bin/env python
+"""
+
+CDL Convert CDLB
+================
+
+Reads and writes ``.cdlb`` , a compact binary interchange format for color
+collections, which reloads far faster than XML and can be read a single
+correction at a time.
+
+## Public Classes
+
+    CdlbFile
+        A memory mapped, read only ``.cdlb`` file. Any correction can be
+        looked up by id without decoding the rest of the file.
+
+## Public Functions
+
+    dump()
+        Writes a :class:`ColorCollection` to an open binary file as ``.cdlb``
+
+## Layout
+
+All integers and floats are little endian. String references are indexes
+into the string table, with ``0xFFFFFFFF`` standing in for None.
+
+    Header (80 bytes)
+        The magic ``CDLB``, format version (uint16) and collection type
+        (uint16, 0 for ccc and 1 for cdl). Then the number of strings,
+        corrections and decisions (uint32 each), the collection's
+        description, input description and viewing description string
+        references, and the byte offset (uint64) of each following section.
+
+    Values
+        Ten float64 per correction: slope RGB, offset RGB, power RGB and
+        saturation. Missing nodes are stored as identity values.
+
+    Corrections (32 bytes each)
+        String references for the id, descriptions, input description,
+        viewing description, SOP descriptions, SAT descriptions and exact
+        value text, then a flags byte.
+
+    Decisions (24 bytes each)
+        String references for the descriptions, input description, viewing
+        description and MediaRef, the index of its correction (or a string
+        reference to the id of a ColorCorrectionRef), and a flags byte.
+
+    String Offsets
+        One uint64 per string, plus one for the end of the last, giving the
+        position of each string within the string blob.
+
+    Id Index
+        Every correction index (uint32), sorted by the UTF-8 bytes of its id,
+        for binary searching.
+
+    String Blob
+        Every unique string, UTF-8 encoded, back to back.
+
+A list of descriptions is stored as one string, with the descriptions
+separated by NUL characters, which XML can't contain.
+
+Values are read back as float64 unless the exact value text of the
+correction is set. That is only written for corrections holding a Decimal
+that float64 can't reproduce digit for digit, such as ``1.00000`` , so
+converting to ``.cdlb`` and back to XML writes the same values.
+
+## License
+
+The MIT License (MIT)
+
+cdl_convert
+Copyright (c) 2015 Sean Wallitsch
+http://github.com/shidarin/cdl_convert/
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Standard Imports
+
+from decimal import Decimal
+import mmap
+import os
+import struct
+
+# cdl_convert imports
+
+from .collection import ColorCollection
+from .correction import ColorCorrection
+from .decision import ColorCorrectionRef, ColorDecision, MediaRef
+from .utils import to_decimal
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+MAGIC = b'CDLB'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHH6I6Q')
+CORRECTION = struct.Struct('<7IB3x')
+DECISION = struct.Struct('<5IB3x')
+VALUES = struct.Struct('<10d')
+OFFSET = struct.Struct('<Q')
+INDEX = struct.Struct('<I')
+
+NONE = 0xFFFFFFFF
+
+COLLECTION_TYPES = ['ccc', 'cdl']
+
+# Correction flags
+HAS_SOP = 1
+HAS_SAT = 2
+IN_DECISION = 4
+
+# Decision flags
+IS_REF = 1
+
+IDENTITY = (1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+
+DESC_SEPARATOR = u'\x00'
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+__all__ = [
+    'CdlbFile',
+    'dump',
+]
+
+# ==============================================================================
+# CLASSES
+# ==============================================================================
+
+
+class CdlbFile(object):
+    """A read only, memory mapped .cdlb file
+
+    Description
+    ~~~~~~~~~~~
+
+    Opening a file only reads its header. Looking a correction up with
+    ``get`` binary searches the id index, reading only the ids it compares
+    against, and then decodes just the one correction. The operating system
+    pages in only the parts of the file that are touched, so looking up a
+    handful of grades in a file of many thousands is nearly free.
+
+    ``to_collection`` decodes the whole file, which is what ``parse_cdlb``
+    returns.
+
+    Iterating decodes each correction in turn, in file order.
+
+    Can be used as a context manager, which closes the file on exit.
+
+    **Attributes:**
+
+        filepath : (str)
+            Absolute path to the file.
+
+        ids : [str]
+            The id of every correction, in file order. Built on access.
+
+        type : (str)
+            The type of the stored collection, ``ccc`` or ``cdl`` .
+
+    **Public Methods:**
+
+        close()
+            Unmaps and closes the file.
+
+        get()
+            Returns the :class:`ColorCorrection` with a given id.
+
+        to_collection()
+            Decodes the whole file into a :class:`ColorCollection` .
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = os.path.abspath(filepath)
+        self._file = open(self.filepath, 'rb')
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            # An empty file can't be mapped
+            self._file.close()
+            raise ValueError(
+                'File "{path}" is empty, and is not a cdlb file.'.format(
+                    path=self.filepath
+                )
+            )
+
+        try:
+            self._read_header()
+        except (IndexError, ValueError, struct.error):
+            self.close()
+            raise ValueError(
+                'File "{path}" is not a cdlb file, or is corrupt.'.format(
+                    path=self.filepath
+                )
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._correction(index, self._string)[0]
+
+    def __len__(self):
+        return self._corrections_count
+
+    # Properties ==============================================================
+
+    @property
+    def ids(self):
+        """Returns the id of every correction, in file order"""
+        return [
+            self._string(CORRECTION.unpack_from(self._map, offset)[0])
+            for offset in range(
+                self._corrections,
+                self._corrections + CORRECTION.size * len(self),
+                CORRECTION.size
+            )
+        ]
+
+    # Private Methods =========================================================
+
+    def _correction(self, index, strings):
+        """Builds the ColorCorrection stored at index"""
+        (cc_id, desc, input_desc, viewing_desc, sop_desc, sat_desc, text,
+         flags) = CORRECTION.unpack_from(
+             self._map, self._corrections + CORRECTION.size * index
+         )
+
+        cc = ColorCorrection(strings(cc_id))
+        cc.desc = _split_desc(strings(desc))
+        cc.input_desc = strings(input_desc)
+        cc.viewing_desc = strings(viewing_desc)
+
+        if text != NONE:
+            values = strings(text).split()
+        else:
+            values = VALUES.unpack_from(
+                self._map, self._values + VALUES.size * index
+            )
+
+        if flags & HAS_SOP:
+            cc.slope = values[0:3]
+            cc.offset = values[3:6]
+            cc.power = values[6:9]
+            cc.sop_node.desc = _split_desc(strings(sop_desc))
+        if flags & HAS_SAT:
+            cc.sat = values[9]
+            cc.sat_node.desc = _split_desc(strings(sat_desc))
+
+        return cc, flags
+
+    # =========================================================================
+
+    def _read_header(self):
+        """Reads the counts and section offsets from the header"""
+        (magic, version, col_type, self._strings_count,
+         self._corrections_count, self._decisions_count, self._desc,
+         self._input_desc, self._viewing_desc, self._values,
+         self._corrections, self._decisions, self._offsets, self._index,
+         self._blob) = HEADER.unpack_from(self._map, 0)
+
+        if magic != MAGIC:
+            raise ValueError('Bad magic')
+        if version != VERSION:
+            raise ValueError('Unsupported version')
+        self.type = COLLECTION_TYPES[col_type]
+
+    # =========================================================================
+
+    def _string(self, index):
+        """Decodes a single string from the string table"""
+        if index == NONE:
+            return None
+        start = OFFSET.unpack_from(
+            self._map, self._offsets + OFFSET.size * index
+        )[0]
+        end = OFFSET.unpack_from(
+            self._map, self._offsets + OFFSET.size * (index + 1)
+        )[0]
+        return self._map[self._blob + start:self._blob + end].decode('utf-8')
+
+    # =========================================================================
+
+    def _strings(self):
+        """Decodes the whole string table, returns a lookup function"""
+        offsets = struct.unpack_from(
+            '<{count}Q'.format(count=self._strings_count + 1),
+            self._map, self._offsets
+        )
+        blob = self._map[self._blob:self._blob + offsets[-1]]
+        table = [
+            blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+            for i in range(self._strings_count)
+        ]
+
+        def strings(index):
+            """Returns the string at index, or None"""
+            return None if index == NONE else table[index]
+        return strings
+
+    # Public Methods ==========================================================
+
+    def close(self):
+        """Unmaps and closes the file"""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    # =========================================================================
+
+    def get(self, cc_id):
+        """Returns the ColorCorrection with the given id
+
+        **Args:**
+            cc_id : (str)
+                The id of the correction to decode.
+
+        **Returns:**
+            (:class:`ColorCorrection`|None)
+                A new correction registered with the active registry, or
+                None if no stored correction has that id.
+
+        **Raises:**
+            ValueError:
+                If ``HALT_ON_ERROR`` is set and the id is already registered.
+
+        """
+        target = cc_id.encode('utf-8')
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            index = INDEX.unpack_from(
+                self._map, self._index + INDEX.size * middle
+            )[0]
+            found = self._string(
+                CORRECTION.unpack_from(
+                    self._map, self._corrections + CORRECTION.size * index
+                )[0]
+            ).encode('utf-8')
+            if found < target:
+                low = middle + 1
+            elif found > target:
+                high = middle
+            else:
+                return self._correction(index, self._string)[0]
+        return None
+
+    # =========================================================================
+
+    def to_collection(self):
+        """Decodes the whole file into a ColorCollection
+
+        **Returns:**
+            (:class:`ColorCollection`)
+                A new collection registered with the active registry, with
+                the same type, descriptions, corrections and decisions as
+                the collection that was written.
+
+        **Raises:**
+            ValueError:
+                If ``HALT_ON_ERROR`` is set and a stored id is already
+                registered.
+
+        """
+        strings = self._strings()
+
+        col = ColorCollection(self.filepath)
+        col.type = self.type
+        col.desc = _split_desc(strings(self._desc))
+        col.input_desc = strings(self._input_desc)
+        col.viewing_desc = strings(self._viewing_desc)
+
+        corrections = []
+        for index in range(len(self)):
+            cc, flags = self._correction(index, strings)
+            if not flags & IN_DECISION:
+                cc.parent = col
+                col.color_corrections.append(cc)
+            corrections.append(cc)
+
+        for index in range(self._decisions_count):
+            desc, input_desc, viewing_desc, media, target, flags = \
+                DECISION.unpack_from(
+                    self._map, self._decisions + DECISION.size * index
+                )
+            if flags & IS_REF:
+                cc = ColorCorrectionRef(strings(target))
+            else:
+                cc = corrections[target]
+            media = MediaRef(strings(media)) if media != NONE else None
+
+            decision = ColorDecision(cc, media)
+            decision.desc = _split_desc(strings(desc))
+            decision.input_desc = strings(input_desc)
+            decision.viewing_desc = strings(viewing_desc)
+            decision.parent = col
+            col.color_decisions.append(decision)
+
+        return col
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _join_desc(desc):
+    """Joins a list of descriptions into one string, or None if empty/None"""
+    return DESC_SEPARATOR.join(desc) if desc else None
+
+# ==============================================================================
+
+
+def _pack_values(cc):
+    """Returns the packed values, and their text if float64 isn't exact"""
+    values = list(IDENTITY)
+    if cc.has_sop:
+        values[0:9] = cc.slope + cc.offset + cc.power
+    if cc.has_sat:
+        values[9] = cc.sat
+
+    text = None
+    for value in values:
+        if isinstance(value, Decimal) and \
+                str(to_decimal(float(value))) != str(value):
+            text = ' '.join(str(value) for value in values)
+            break
+
+    return VALUES.pack(*[float(value) for value in values]), text
+
+# ==============================================================================
+
+
+def _split_desc(desc):
+    """Splits a string of joined descriptions back into a list"""
+    return [] if desc is None else desc.split(DESC_SEPARATOR)
+
+# ==============================================================================
+# PUBLIC FUNCTIONS
+# ==============================================================================
+
+
+def dump(col, cdlb_file):  # pylint: disable=R0914
+    """Writes a ColorCollection to a binary file object as .cdlb
+
+    **Args:**
+        col : (:class:`ColorCollection`)
+            The collection to write. Every ColorCorrection that's a direct
+            child, and every ColorDecision with its ColorCorrection or
+            ColorCorrectionRef and MediaRef, is written.
+
+        cdlb_file : (file)
+            An open, binary file object to write to.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    ``file_in`` and ``metadata`` aren't written, as they aren't part of a
+    CCC or CDL either.
+
+    """
+    table = {}
+    blob = []
+
+    def string(value):
+        """Returns the string table index of value, adding it if needed"""
+        if value is None:
+            return NONE
+        if value not in table:
+            table[value] = len(blob)
+            blob.append(value.encode('utf-8'))
+        return table[value]
+
+    corrections = [(cc, 0) for cc in col.color_corrections]
+    decisions = []
+    for decision in col.color_decisions:
+        if decision.is_ref:
+            target = string(decision.cc.id)
+        else:
+            target = len(corrections)
+            corrections.append((decision.cc, IN_DECISION))
+        decisions.append(
+            DECISION.pack(
+                string(_join_desc(decision._desc)),  # pylint: disable=W0212
+                string(decision.input_desc),
+                string(decision.viewing_desc),
+                string(decision.media_ref.ref if decision.media_ref else None),
+                target,
+                IS_REF if decision.is_ref else 0,
+            )
+        )
+
+    values = []
+    records = []
+    for cc, flags in corrections:
+        packed, text = _pack_values(cc)
+        values.append(packed)
+        if cc.has_sop:
+            flags |= HAS_SOP
+        if cc.has_sat:
+            flags |= HAS_SAT
+        records.append(
+            CORRECTION.pack(
+                string(cc.id),
+                string(_join_desc(cc._desc)),  # pylint: disable=W0212
+                string(cc.input_desc),
+                string(cc.viewing_desc),
+                # pylint: disable=W0212
+                string(_join_desc(cc.sop_node._desc) if cc.has_sop else None),
+                string(_join_desc(cc.sat_node._desc) if cc.has_sat else None),
+                string(text),
+                flags,
+            )
+        )
+
+    index = sorted(
+        range(len(corrections)),
+        key=lambda i: corrections[i][0].id.encode('utf-8')
+    )
+
+    desc = string(_join_desc(col._desc))  # pylint: disable=W0212
+    input_desc = string(col.input_desc)
+    viewing_desc = string(col.viewing_desc)
+
+    offsets = [0]
+    for encoded in blob:
+        offsets.append(offsets[-1] + len(encoded))
+
+    values_at = HEADER.size
+    corrections_at = values_at + VALUES.size * len(corrections)
+    decisions_at = corrections_at + CORRECTION.size * len(corrections)
+    offsets_at = decisions_at + DECISION.size * len(decisions)
+    index_at = offsets_at + OFFSET.size * len(offsets)
+    blob_at = index_at + INDEX.size * len(index)
+
+    cdlb_file.write(
+        HEADER.pack(
+            MAGIC, VERSION, COLLECTION_TYPES.index(col.type), len(blob),
+            len(corrections), len(decisions), desc, input_desc,
+            viewing_desc, values_at, corrections_at, decisions_at,
+            offsets_at, index_at, blob_at
+        )
+    )
+    cdlb_file.write(b''.join(values))
+    cdlb_file.write(b''.join(records))
+    cdlb_file.write(b''.join(decisions))
+    cdlb_file.write(struct.pack('<{0}Q'.format(len(offsets)), *offsets))
+    cdlb_file.write(struct.pack('<{0}I'.format(len(index)), *index))
+    cdlb_file.write(b''.join(blob))
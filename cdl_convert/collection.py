@@ -55,10 +55,12 @@ from xml.etree import ElementTree
 
 # cdl_convert imports
 
-from .base import AscColorSpaceBase, AscDescBase, AscXMLBase
+from .base import AscColorSpaceBase, AscXMLBase, _XMLList
 from . import config
 from .correction import ColorCorrection
 from .decision import ColorDecision
+from .evaluate import apply_collection
+from .registry import current_registry
 
 # ==============================================================================
 # EXPORTS
@@ -71,7 +73,7 @@ __all__ = ['ColorCollection']
 # ==============================================================================
 
 
-class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disable=R0902,R0904
+class ColorCollection(AscColorSpaceBase, AscXMLBase):  # pylint: disable=R0902,R0904
     """Container class for ColorDecisionLists and ColorCorrectionCollections.
 
     Description
@@ -134,6 +136,11 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         is_cdl : (bool)
             True if this collection currently represents ``.cdl``.
 
+        registry : ( :class:`Registry` )
+            The registry this collection and the children it parses are
+            registered with. Set on creation, either from the ``registry``
+            argument or the active registry.
+
         type : (str)
             Either ``ccc`` or ``cdl``, represents the type of collection
             this class currently will export by default.
@@ -158,6 +165,12 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     **Public Methods:**
 
+        apply()
+            Grades a NumPy image array with every :class:`ColorCorrection`
+            in ``color_corrections`` and ``color_decisions`` at once,
+            returning all the graded variants stacked into one array.
+            Requires numpy.
+
         append_child()
             Appends the given object, either a :class:`ColorCorrection` or a
             :class:`ColorDecision` , to the respective attribute list, either
@@ -237,19 +250,32 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     """
 
+    __slots__ = (
+        '_registry', '_color_corrections', '_color_decisions', '_id_index',
+        '_id_index_state', '_file_in', '_file_out', '_type', '_xmlns',
+    )
+
     members = []
 
-    def __init__(self, input_file=None):
+    def __init__(self, input_file=None, registry=None):
         super(ColorCollection, self).__init__()
 
-        self._color_corrections = []
-        self._color_decisions = []
+        self._registry = (
+            registry if registry is not None else current_registry()
+        )
+
+        self._color_corrections = _XMLList(self)
+        self._color_decisions = _XMLList(self)
+        # Maps each fully qualified child ColorCorrection id to that child,
+        # so duplicate checks don't need to walk every child.
+        self._id_index = None
+        self._id_index_state = None
         self._file_in = os.path.abspath(input_file) if input_file else None
         self._file_out = None
         self._type = 'ccc'
         self._xmlns = "urn:ASC:CDL:v1.01"
 
-        ColorCollection.members.append(self)
+        self._registry.members(ColorCollection).append(self)
 
     # Properties ==============================================================
 
@@ -266,9 +292,12 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
     @color_corrections.setter
     def color_corrections(self, values):
         """Makes sure color_corrections is only set with ColorCorrection"""
-        self._color_corrections = self._list_setter(
-            'color_corrections', ColorCorrection, values
+        self._color_corrections = _XMLList(
+            self,
+            self._list_setter('color_corrections', ColorCorrection, values)
         )
+        self._id_index = None
+        self.invalidate_xml()
 
     @property
     def color_decisions(self):
@@ -278,9 +307,11 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
     @color_decisions.setter
     def color_decisions(self, values):
         """Makes sure color_decisions is only set with ColorDecision"""
-        self._color_decisions = self._list_setter(
-            'color_decisions', ColorDecision, values
+        self._color_decisions = _XMLList(
+            self, self._list_setter('color_decisions', ColorDecision, values)
         )
+        self._id_index = None
+        self.invalidate_xml()
 
     @property
     def file_in(self):
@@ -316,6 +347,11 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         """True if this collection currently represents .cdl"""
         return self.type == 'cdl'
 
+    @property
+    def registry(self):
+        """Returns the registry this collection is registered with"""
+        return self._registry
+
     @property
     def type(self):
         """Describes the type of ColorCollection this class will export"""
@@ -329,6 +365,7 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
                              'ccc or cdl.')
         else:
             self._type = value.lower()
+            self.invalidate_xml()
 
     @property
     def xmlns(self):
@@ -337,12 +374,162 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     # Private Methods =========================================================
 
+    def _child_ids(self):
+        """Returns the id index of fully qualified ColorCorrection children
+
+        The index is maintained incrementally by ``append_child``, and rebuilt
+        only if the children lists were replaced or changed in place, or if
+        any ColorCorrection was renamed or ColorDecision had its cc swapped
+        since the index was last brought up to date.
+
+        """
+        state = self._index_state()
+        if self._id_index is None or self._id_index_state != state:
+            self._id_index = {}
+            for child in self._color_corrections:
+                self._index_child(child)
+            for child in self._color_decisions:
+                self._index_child(child)
+            self._id_index_state = state
+        return self._id_index
+
+    # =========================================================================
+
+    def _build_element_parts(self):
+        """Returns our shell element and a generator of child elements
+
+        Child ColorCorrection or ColorDecision elements are only built as
+        the generator is consumed, which lets ``write_xml`` stream large
+        collections to disk.
+
+        """
+        if self.is_ccc:
+            return (
+                self._build_shell('ColorCorrectionCollection'),
+                self._iter_elements_ccc()
+            )
+        elif self.is_cdl:
+            return (
+                self._build_shell('ColorDecisionList'),
+                self._iter_elements_cdl()
+            )
+
+    # =========================================================================
+
+    def _build_shell(self, tag):
+        """Builds the collection element with descriptions but no children"""
+        col_xml = ElementTree.Element(tag)
+        col_xml.attrib = {'xmlns': self.xmlns}
+        if self.input_desc:
+            input_desc = ElementTree.SubElement(col_xml, 'InputDescription')
+            input_desc.text = self.input_desc
+        if self.viewing_desc:
+            viewing_desc = ElementTree.SubElement(col_xml, 'ViewingDescription')
+            viewing_desc.text = self.viewing_desc
+        for description in self._desc or ():
+            desc = ElementTree.SubElement(col_xml, 'Description')
+            desc.text = description
+
+        return col_xml
+
+    # =========================================================================
+
+    def _index_child(self, child):
+        """Adds a child's ColorCorrection id to the id index"""
+        if child.__class__ == ColorDecision:
+            if child.is_ref or not child.cc:
+                return
+            child = child.cc
+        self._id_index[child.id] = child
+
+    # =========================================================================
+
+    def _index_state(self):
+        """Returns a snapshot used to detect changes the index hasn't seen"""
+        return (
+            ColorCorrection._id_generation,  # pylint: disable=W0212
+            ColorDecision._cc_generation,  # pylint: disable=W0212
+        )
+
+    # =========================================================================
+
+    def _iter_elements_ccc(self):
+        """Yields the ColorCorrection elements of a CCC one at a time"""
+        for color_correct in self.color_corrections:
+            yield color_correct._element()  # pylint: disable=W0212
+        # We'll need to extract the ColorCorrections from the
+        # ColorDecisions
+        for color_decision in self.color_decisions:
+            if color_decision.is_ref:
+                color_correction = color_decision.cc.cc
+            else:
+                color_correction = color_decision.cc
+
+            # We do one last check to ensure that we actually have a
+            # returned ColorCorrection, as ColorCorrectionRef will
+            # return None if it's an unresolved reference and no
+            # HALT behavior was set.
+            if color_correction:
+                yield color_correction._element()  # pylint: disable=W0212
+
+    # =========================================================================
+
+    def _iter_elements_cdl(self):
+        """Yields the ColorDecision elements of a CDL one at a time"""
+        for color_decision in self.color_decisions:
+            if color_decision.cc.id in self._child_ids():
+                resolve = False
+            else:
+                try:
+                    color_correction = color_decision.cc.cc
+                except ValueError:
+                    # ValueError will be raised if we can't resolve the
+                    # reference. This shouldn't be a game-stopper here.
+                    #
+                    # We'll just add the unresolved reference
+                    resolve = False
+                else:
+                    resolve = True if color_correction else False
+
+            yield color_decision.build_element(resolve=resolve)
+
+        if self.color_corrections:
+            # We'll create some temporary ColorDecision instances, and place
+            # the ColorCorrects inside of them.
+            #
+            # We need to store the ColorDecision member dictionary, so that
+            # we can return it to the state it was in prior to us creating
+            # these temporary ColorDecisions
+            color_decisions_members = self._registry.members(ColorDecision)
+
+            try:
+                for color_correction in self.color_corrections:
+                    color_decision = ColorDecision(
+                        color_correction, registry=self._registry
+                    )
+                    yield color_decision._element()  # pylint: disable=W0212
+            finally:
+                # Now reset the ColorDecision member dictionary to the state
+                # it was in prior to us creating temp ColorDecisions
+                self._registry.set_members(
+                    ColorDecision, color_decisions_members
+                )
+
+    # =========================================================================
+
+    def _list_changed(self):
+        """Drops the id index and our XML when a children list changes"""
+        self._id_index = None
+        self.invalidate_xml()
+
+    # =========================================================================
+
     @staticmethod
     def _list_setter(list_name, color_class, values):
         """Sets a list to provided values but first checks membership"""
         if values is None:
             return []
-        elif type(values) in [list, tuple, set]:
+        elif isinstance(values, (list, tuple, set)):
             for color in values:
                 # We need to make sure each member is of the correct class.
                 if color.__class__ != color_class:
@@ -370,8 +557,61 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
                 )
             )
 
+    # =========================================================================
+
+    def _xml_state(self):
+        """Returns the XML version of each of our children
+
+        Children are handed to copies and merges of a collection, which
+        become their parent, so changes to them can't be relied on to
+        invalidate us. Collections holding ColorCorrectionRefs aren't cached
+        at all, since references are resolved against the registry every
+        time we're built.
+
+        """
+        # pylint: disable=W0212
+        state = [child._xml_version for child in self._color_corrections]
+        for decision in self._color_decisions:
+            if decision.is_ref:
+                return None
+            state.append((decision._xml_version, ) + decision._xml_state())
+        return tuple(state)
+
     # Public Methods ==========================================================
 
+    def apply(self, image, max_bytes=None):
+        """Grades an image with every correction, see apply_collection
+
+        **Args:**
+            image : (numpy.ndarray)
+                A float32 or float64 array with RGB on its last axis. It
+                isn't modified.
+
+            max_bytes=None : (int)
+                If given, caps the temporary memory used while grading.
+
+        **Returns:**
+            (numpy.ndarray)
+                An array of shape ``(N,) + image.shape`` holding the image
+                graded by each of the N ``color_corrections`` , then by the
+                correction of each of ``color_decisions`` , in order.
+
+        **Raises:**
+            ImportError:
+                If numpy isn't installed.
+
+            TypeError:
+                If ``image`` isn't a float32 or float64 numpy array.
+
+            ValueError:
+                If ``image`` doesn't have 3 channels on its last axis, or
+                ``max_bytes`` can't fit a single variant.
+
+        """
+        return apply_collection(self, image, max_bytes=max_bytes)
+
+    # =========================================================================
+
     def append_child(self, child):
         """Appends a given child to the correct list of children"""
         # We need to make sure not to append a ColorDecision or ColorCorrection
@@ -385,21 +625,27 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         dup = False
 
         if child.__class__ == ColorCorrection:
-            if child.id in self.id_list:
+            if child.id in self._child_ids():
                 dup = True
             else:
-                self._color_corrections.append(child)
+                # The index is updated below, rather than dropped as any
+                # other change to the list would.
+                list.append(self._color_corrections, child)
 
         elif child.__class__ == ColorDecision:
-            if not child.is_ref and child.cc.id in self.id_list:
+            if not child.is_ref and child.cc.id in self._child_ids():
                 dup = True
             else:
-                self._color_decisions.append(child)
+                list.append(self._color_decisions, child)
         else:
 
             raise TypeError("Can only append ColorCorrection and "
                             "ColorDecision objects.")
 
+        if not dup:
+            self._index_child(child)
+            self._id_index_state = self._index_state()
+
         if dup:
             if config.HALT_ON_ERROR:
                 raise ValueError(
@@ -412,6 +658,7 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             return False
         else:
             child.parent = self
+            self.invalidate_xml()
             return True
 
     # =========================================================================
@@ -434,35 +681,9 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     def build_element_ccc(self):
         """Builds a CCC XML element representing this ColorCollection"""
-        ccc_xml = ElementTree.Element('ColorCorrectionCollection')
-        ccc_xml.attrib = {'xmlns': self.xmlns}
-        if self.input_desc:
-            input_desc = ElementTree.SubElement(ccc_xml, 'InputDescription')
-            input_desc.text = self.input_desc
-        if self.viewing_desc:
-            viewing_desc = ElementTree.SubElement(ccc_xml, 'ViewingDescription')
-            viewing_desc.text = self.viewing_desc
-        for description in self.desc:
-            desc = ElementTree.SubElement(ccc_xml, 'Description')
-            desc.text = description
-        if self.color_corrections:
-            for color_correct in self.color_corrections:
-                ccc_xml.append(color_correct.element)
-        if self.color_decisions:
-            # We'll need to extract the ColorCorrections from the
-            # ColorDecisions
-            for color_decision in self.color_decisions:
-                if color_decision.is_ref:
-                    color_correction = color_decision.cc.cc
-                else:
-                    color_correction = color_decision.cc
-
-                # We do one last check to ensure that we actually have a
-                # returned ColorCorrection, as ColorCorrectionRef will
-                # return None if it's an unresolved reference and no
-                # HALT behavior was set.
-                if color_correction:
-                    ccc_xml.append(color_correction.element)
+        ccc_xml = self._build_shell('ColorCorrectionCollection')
+        for child in self._iter_elements_ccc():
+            ccc_xml.append(child)
 
         return ccc_xml
 
@@ -470,51 +691,9 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     def build_element_cdl(self):
         """Builds a CDL XML element representing this ColorCollection"""
-        cdl_xml = ElementTree.Element('ColorDecisionList')
-        cdl_xml.attrib = {'xmlns': self.xmlns}
-        if self.input_desc:
-            input_desc = ElementTree.SubElement(cdl_xml, 'InputDescription')
-            input_desc.text = self.input_desc
-        if self.viewing_desc:
-            viewing_desc = ElementTree.SubElement(cdl_xml, 'ViewingDescription')
-            viewing_desc.text = self.viewing_desc
-        for description in self.desc:
-            desc = ElementTree.SubElement(cdl_xml, 'Description')
-            desc.text = description
-        if self.color_decisions:
-            for color_decision in self.color_decisions:
-                if color_decision.cc.id in self.id_list:
-                    resolve = False
-                else:
-                    try:
-                        color_correction = color_decision.cc.cc
-                    except ValueError:
-                        # ValueError will be raised if we can't resolve the
-                        # reference. This shouldn't be a game-stopper here.
-                        #
-                        # We'll just add the unresolved reference
-                        resolve = False
-                    else:
-                        resolve = True if color_correction else False
-
-                cdl_xml.append(color_decision.build_element(resolve=resolve))
-
-        if self.color_corrections:
-            # We'll create some temporary ColorDecision instances, and place
-            # the ColorCorrects inside of them.
-            #
-            # We need to store the ColorDecision member dictionary, so that
-            # we can return it to the state it was in prior to us creating
-            # these temporary ColorDecisions
-            color_decisions_members = ColorDecision.members
-
-            for color_correction in self.color_corrections:
-                color_decision = ColorDecision(color_correction)
-                cdl_xml.append(color_decision.element)
-
-            # Now reset the ColorDecision member dictionary to the state it was
-            # in prior to us creating temp ColorDecisions
-            ColorDecision.members = color_decisions_members
+        cdl_xml = self._build_shell('ColorDecisionList')
+        for child in self._iter_elements_cdl():
+            cdl_xml.append(child)
 
         return cdl_xml
 
@@ -522,7 +701,7 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     def copy_collection(self):
         """Creates and returns a copy of this collection"""
-        new_col = ColorCollection()
+        new_col = ColorCollection(registry=self._registry)
         new_col.desc = self.desc
         new_col.file_in = self.file_in if self.file_in else None
         new_col.input_desc = self.input_desc
@@ -533,16 +712,25 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     # =========================================================================
 
-    def determine_dest(self, directory):
-        """Determines the destination file and sets it on the cdl"""
+    def determine_dest(self, directory, ext=None):
+        """Determines the destination file and sets it on the cdl
+
+        The extension is the collection ``type`` unless ``ext`` is given,
+        for formats such as ``cdlb`` that can hold either type.
+
+        """
         if self.file_in:
             filename = os.path.splitext(os.path.basename(self.file_in))[0]
         else:
             filename = 'color_collection_{id}'.format(
-                id=str(ColorCollection.members.index(self)).rjust(3, '0')
+                id=str(
+                    self._registry.members(ColorCollection).index(self)
+                ).rjust(3, '0')
             )
 
-        filename = "{file_in}.{ext}".format(file_in=filename, ext=self.type)
+        filename = "{file_in}.{ext}".format(
+            file_in=filename, ext=ext or self.type
+        )
 
         self._file_out = os.path.join(directory, filename)
 
@@ -599,10 +787,11 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         if not cc_nodes:
             return False
 
-        for cc_node in xml_element.findall('ColorCorrection'):
-            cdl = parse.parse_cc(cc_node)
-            cdl.parent = self
-            self._color_corrections.append(cdl)
+        with self._registry:
+            for cc_node in xml_element.findall('ColorCorrection'):
+                cdl = parse.parse_cc(cc_node)
+                cdl.parent = self
+                self._color_corrections.append(cdl)
 
         return True
 
@@ -629,7 +818,7 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             return False
 
         for cd_node in xml_element.findall('ColorDecision'):
-            color_decision = ColorDecision()
+            color_decision = ColorDecision(registry=self._registry)
             color_decision.parse_xml_color_decision(cd_node)
             color_decision.parent = self
             self._color_decisions.append(color_decision)
@@ -655,9 +844,11 @@ class ColorCollection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
     def set_to_ccc(self):
         """Switches the type of the ColorCollection to export .ccc style xml"""
         self._type = 'ccc'
+        self.invalidate_xml()
 
     # =========================================================================
 
     def set_to_cdl(self):
         """Switches the type of the ColorCollection to export .cdl style xml"""
         self._type = 'cdl'
+        self.invalidate_xml()
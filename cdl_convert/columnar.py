@@ -0,0 +1,573 @@
+#!/usr/bin/env python
+"""
+
+CDL Convert Columnar
+====================
+
+A compact, column oriented store for collections too large to comfortably
+hold as a graph of :class:`ColorCorrection` objects.
+
+## Public Classes
+
+    ColumnarCollection
+        Holds the ids, SOP & SAT values and descriptions of many color
+        corrections in a handful of flat buffers, rather than one object
+        graph per correction.
+
+    CorrectionView
+        A lightweight, read only window onto one row of a
+        :class:`ColumnarCollection` . Can be materialized into a full
+        :class:`ColorCorrection` on demand.
+
+## License
+
+The MIT License (MIT)
+
+cdl_convert
+Copyright (c) 2015 Sean Wallitsch
+http://github.com/shidarin/cdl_convert/
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Standard Imports
+
+from array import array
+
+# Third Party Imports
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # pylint: disable=C0103
+
+# cdl_convert imports
+
+from .collection import ColorCollection
+from .correction import ColorCorrection
+from .decision import ColorDecision
+from . import parse
+from .registry import Registry
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+# Each row of values holds slope RGB, offset RGB, power RGB and saturation.
+ROW_WIDTH = 10
+IDENTITY_ROW = (1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+
+# Flags recording which nodes a correction actually had, so that a
+# materialized correction writes out the same nodes.
+HAS_SOP = 1
+HAS_SAT = 2
+
+# Descriptions can't contain NUL characters in XML, so it safely separates
+# the descriptions of a single correction within the blob.
+DESC_SEPARATOR = u'\x00'
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+__all__ = [
+    'ColumnarCollection',
+    'CorrectionView',
+]
+
+# ==============================================================================
+# CLASSES
+# ==============================================================================
+
+
+class ColumnarCollection(object):
+    """A struct of arrays store of many color corrections
+
+    Description
+    ~~~~~~~~~~~
+
+    A :class:`ColorCollection` holding 100k corrections holds 100k
+    :class:`ColorCorrection` objects, each with a :class:`SopNode` , a
+    :class:`SatNode` , lists of Decimals and description lists. That's
+    several KB per grade.
+
+    This store keeps the same information in a few flat buffers instead:
+
+    * ids are UTF-8 encoded into one blob, with an array of offsets.
+    * SOP and SAT values are packed into one contiguous float64 buffer, ten
+      values per correction, in the order slope RGB, offset RGB, power RGB
+      and saturation. Missing nodes are stored as identity values.
+    * descriptions are stored the same way as ids, in a second blob.
+
+    Indexing or iterating returns a :class:`CorrectionView` , which reads its
+    values straight out of the buffers. Only ``materialize()`` on a view (or
+    ``to_collection()`` on the store) builds real :class:`ColorCorrection`
+    objects.
+
+    Values are stored as floats, so the store has the same precision as
+    ``config.FAST_MATH`` . Only the id, SOP, SAT and descriptions of each
+    correction are kept; input & viewing descriptions, and descriptions
+    on the SOP and SAT nodes themselves, are not.
+
+    **Attributes:**
+
+        ids : [str]
+            A list of every id, in order. Built on access.
+
+        values : (numpy.ndarray)
+            A float64 array of shape (N, 10) sharing memory with the store.
+            While it's alive the store can't grow, and ``append`` raises
+            ``BufferError``. Requires numpy.
+
+    **Public Methods:**
+
+        append()
+            Adds a :class:`ColorCorrection` to the end of the store.
+
+        extend()
+            Appends every :class:`ColorCorrection` from an iterable.
+
+        from_collection()
+            Class method, builds a store from a :class:`ColorCollection` .
+
+        get()
+            Returns the :class:`CorrectionView` with a given id.
+
+        load()
+            Class method, builds a store straight from a file path.
+
+        stacked_values()
+            Returns the slope, offset and power as (N, 3) arrays and the
+            saturation as an (N,) array, for the functions in ``evaluate``.
+
+        to_collection()
+            Materializes every row into a new :class:`ColorCollection` .
+
+    """
+
+    def __init__(self, corrections=None):
+        self._id_blob = bytearray()
+        self._id_offsets = array('q', [0])
+        self._desc_blob = bytearray()
+        self._desc_offsets = array('q', [0])
+        self._values = array('d')
+        self._flags = bytearray()
+        # Maps id to row, built the first time an id is looked up
+        self._index = None
+
+        if corrections is not None:
+            self.extend(corrections)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(
+                "ColumnarCollection index {index} out of range".format(
+                    index=index
+                )
+            )
+        return CorrectionView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield CorrectionView(self, index)
+
+    def __len__(self):
+        return len(self._flags)
+
+    # Properties ==============================================================
+
+    @property
+    def ids(self):
+        """Returns a list of every id in the store"""
+        return [self._id(i) for i in range(len(self))]
+
+    @property
+    def values(self):
+        """Returns the (N, 10) value buffer as a numpy array"""
+        if numpy is None:
+            raise ImportError("ColumnarCollection.values requires numpy.")
+        return numpy.frombuffer(
+            self._values, dtype=numpy.float64
+        ).reshape(-1, ROW_WIDTH)
+
+    # Private Methods =========================================================
+
+    def _descs(self, index):
+        """Returns the list of descriptions of a row"""
+        blob = self._desc_blob[
+            self._desc_offsets[index]:self._desc_offsets[index + 1]
+        ].decode('utf-8')
+        return blob.split(DESC_SEPARATOR) if blob else []
+
+    # =========================================================================
+
+    def _id(self, index):
+        """Returns the id of a row"""
+        return self._id_blob[
+            self._id_offsets[index]:self._id_offsets[index + 1]
+        ].decode('utf-8')
+
+    # =========================================================================
+
+    def _row(self, index):
+        """Returns the 10 values of a row"""
+        return self._values[index * ROW_WIDTH:(index + 1) * ROW_WIDTH]
+
+    # Public Methods ==========================================================
+
+    def append(self, color_correction):
+        """Adds a ColorCorrection to the end of the store
+
+        **Args:**
+            color_correction : (ColorCorrection|ColorDecision)
+                The correction to copy into the store. A ColorDecision is
+                stored as the ColorCorrection it holds.
+
+        **Returns:**
+            None
+
+        **Raises:**
+            BufferError:
+                If a numpy array from ``values`` still references the
+                buffer, which therefore can't be resized.
+
+            ValueError:
+                If given a ColorDecision holding a ColorCorrectionRef that
+                doesn't resolve.
+
+        Ids aren't checked for uniqueness, since anything appended has
+        already been through a :class:`Registry` .
+
+        """
+        if isinstance(color_correction, ColorDecision):
+            if color_correction.is_ref:
+                # Resolve the ColorCorrectionRef
+                ref = color_correction.cc
+                color_correction = ref.cc
+                if color_correction is None:
+                    raise ValueError(
+                        "Can't append unresolved ColorCorrectionRef "
+                        "'{id}'.".format(id=ref.id)
+                    )
+            else:
+                color_correction = color_correction.cc
+
+        cc_id = color_correction.id
+        row = list(IDENTITY_ROW)
+        flags = 0
+        # Reading slope or sat would create a default node, so check first.
+        if color_correction.has_sop:
+            row[0:9] = [
+                float(i) for values in (
+                    color_correction.slope,
+                    color_correction.offset,
+                    color_correction.power,
+                ) for i in values
+            ]
+            flags |= HAS_SOP
+        if color_correction.has_sat:
+            row[9] = float(color_correction.sat)
+            flags |= HAS_SAT
+
+        # The value buffer is extended first, as it's the one a live numpy
+        # view can stop from growing.
+        self._values.extend(row)
+        self._flags.append(flags)
+        self._id_blob.extend(cc_id.encode('utf-8'))
+        self._id_offsets.append(len(self._id_blob))
+        self._desc_blob.extend(
+            DESC_SEPARATOR.join(color_correction.desc).encode('utf-8')
+        )
+        self._desc_offsets.append(len(self._desc_blob))
+
+        if self._index is not None:
+            self._index.setdefault(cc_id, len(self) - 1)
+
+    # =========================================================================
+
+    def extend(self, corrections):
+        """Appends every ColorCorrection (or ColorDecision) in corrections"""
+        for color_correction in corrections:
+            self.append(color_correction)
+
+    # =========================================================================
+
+    @classmethod
+    def from_collection(cls, collection):
+        """Builds a store holding every correction of a ColorCollection
+
+        Decisions holding a ColorCorrectionRef that doesn't resolve have no
+        correction to store, and are skipped.
+
+        """
+        store = cls()
+        store.extend(collection.color_corrections)
+        store.extend(
+            decision for decision in collection.color_decisions
+            if not decision.is_ref or decision.cc.cc is not None
+        )
+        return store
+
+    # =========================================================================
+
+    def get(self, cc_id):
+        """Returns the CorrectionView with the given id
+
+        **Args:**
+            cc_id : (str)
+                The id to look up.
+
+        **Returns:**
+            (:class:`CorrectionView` |None)
+                The first row with that id, or None if the id isn't in the
+                store.
+
+        **Raises:**
+            None
+
+        """
+        if self._index is None:
+            self._index = {}
+            for i in range(len(self)):
+                self._index.setdefault(self._id(i), i)
+        index = self._index.get(cc_id)
+        return None if index is None else CorrectionView(self, index)
+
+    # =========================================================================
+
+    @classmethod
+    def load(cls, filepath, filetype=None):
+        """Builds a store straight from a file of any supported input format
+
+        Corrections are parsed one at a time with ``iter_file`` into a
+        private :class:`Registry` , which is discarded along with the
+        parsed objects once they've been copied into the store.
+
+        """
+        with Registry() as registry:
+            return cls(
+                parse.iter_file(filepath, filetype, registry=registry)
+            )
+
+    # =========================================================================
+
+    def stacked_values(self, dtype=None):
+        """Returns slope, offset & power as (N, 3) arrays, sat as (N,)
+
+        **Args:**
+            dtype=None : (numpy.dtype)
+                The dtype of the returned arrays. Defaults to float64.
+
+        **Returns:**
+            (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+                Slope, offset, power and saturation of every row. Rows
+                without a SOP or SAT node hold identity values.
+
+        **Raises:**
+            ImportError:
+                If numpy isn't installed.
+
+        """
+        values = self.values.astype(dtype or numpy.float64)
+        return values[:, 0:3], values[:, 3:6], values[:, 6:9], values[:, 9]
+
+    # =========================================================================
+
+    def to_collection(self, registry=None):
+        """Materializes every row into a new ColorCollection
+
+        **Args:**
+            registry=None : ( :class:`Registry` )
+                The registry the new collection and corrections register
+                with. Defaults to the active registry.
+
+        **Returns:**
+            (:class:`ColorCollection`)
+                A collection holding a new :class:`ColorCorrection` for
+                every row, in order.
+
+        **Raises:**
+            ValueError:
+                If ``HALT_ON_ERROR`` is set and an id is already registered.
+
+        """
+        collection = ColorCollection(registry=registry)
+        collection.append_children(
+            [view.materialize(registry=collection.registry) for view in self]
+        )
+        return collection
+
+# ==============================================================================
+
+
+class CorrectionView(object):
+    """A read only view of a single row of a ColumnarCollection
+
+    Description
+    ~~~~~~~~~~~
+
+    Reads each attribute from the store when it's accessed, and holds
+    nothing but the store and its row number. Values are returned as floats
+    rather than Decimals.
+
+    **Attributes:**
+
+        desc : [str]
+            The descriptions of the correction.
+
+        has_sat : (bool)
+            True if the stored correction had a SatNode.
+
+        has_sop : (bool)
+            True if the stored correction had a SopNode.
+
+        id : (str)
+            The id of the correction.
+
+        index : (int)
+            The row of the store this view reads from.
+
+        offset : (float, float, float)
+            RGB offset values.
+
+        power : (float, float, float)
+            RGB power values.
+
+        sat : (float)
+            Saturation value.
+
+        slope : (float, float, float)
+            RGB slope values.
+
+    **Public Methods:**
+
+        materialize()
+            Builds a full :class:`ColorCorrection` from this row.
+
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, CorrectionView) and
+            self._store is other._store and  # pylint: disable=W0212
+            self._index == other._index  # pylint: disable=W0212
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._store), self._index))
+
+    # Properties ==============================================================
+
+    @property
+    def desc(self):
+        """Returns the list of descriptions"""
+        return self._store._descs(self._index)  # pylint: disable=W0212
+
+    @property
+    def has_sat(self):
+        """Returns True if the stored correction had a SatNode"""
+        return bool(
+            self._store._flags[self._index] & HAS_SAT  # pylint: disable=W0212
+        )
+
+    @property
+    def has_sop(self):
+        """Returns True if the stored correction had a SopNode"""
+        return bool(
+            self._store._flags[self._index] & HAS_SOP  # pylint: disable=W0212
+        )
+
+    @property
+    def id(self):  # pylint: disable=C0103
+        """Returns the id"""
+        return self._store._id(self._index)  # pylint: disable=W0212
+
+    @property
+    def index(self):
+        """Returns the row of the store this view reads from"""
+        return self._index
+
+    @property
+    def offset(self):
+        """Returns RGB offset values"""
+        return tuple(self._store._row(self._index)[3:6])  # pylint: disable=W0212
+
+    @property
+    def power(self):
+        """Returns RGB power values"""
+        return tuple(self._store._row(self._index)[6:9])  # pylint: disable=W0212
+
+    @property
+    def sat(self):
+        """Returns the saturation value"""
+        return self._store._row(self._index)[9]  # pylint: disable=W0212
+
+    @property
+    def slope(self):
+        """Returns RGB slope values"""
+        return tuple(self._store._row(self._index)[0:3])  # pylint: disable=W0212
+
+    # Public Methods ==========================================================
+
+    def materialize(self, registry=None):
+        """Builds a full ColorCorrection from this row
+
+        **Args:**
+            registry=None : ( :class:`Registry` )
+                The registry the new correction registers with. Defaults to
+                the active registry.
+
+        **Returns:**
+            (:class:`ColorCorrection`)
+                A new correction with this row's id, descriptions, and the
+                same SOP and SAT nodes the stored correction had.
+
+        **Raises:**
+            ValueError:
+                If ``HALT_ON_ERROR`` is set and the id is already registered.
+
+        """
+        color_correction = ColorCorrection(self.id, registry=registry)
+        row = self._store._row(self._index)  # pylint: disable=W0212
+        if self.has_sop:
+            color_correction.slope = list(row[0:3])
+            color_correction.offset = list(row[3:6])
+            color_correction.power = list(row[6:9])
+        if self.has_sat:
+            color_correction.sat = row[9]
+        color_correction.desc = self.desc
+        return color_correction
@@ -8,6 +8,18 @@ Contains simple configuration parameters.
 
 ## GLOBALS
 
+    ATOMIC_WRITES
+        Writes each output to a temp file beside it, then renames the temp
+        file over the output, so readers never see a partly written file.
+
+        Default: False
+
+    FSYNC
+        With ATOMIC_WRITES, flushes each output to disk before renaming it,
+        and flushes its directory after, so that a crash can't lose it.
+
+        Default: False
+
     HALT_ON_ERROR
         Parameter to be used globally to determine if common exceptions should
         be handled by default behavior or raise. Setting this to True causes
@@ -15,14 +27,38 @@ Contains simple configuration parameters.
 
         Default: False
 
+    LUT_SIZE
+        Number of lattice points along each axis when baking a 3D LUT.
+
+        Default: 33
+
+    SKIP_UNCHANGED
+        Leaves output files alone if they already hold exactly what would be
+        written to them, keeping their modification times.
+
+        Default: False
+
     COLLECTION_FORMATS
         List containing all the formats which are represented by
         ColorCollection.
 
+    LUT_FORMATS
+        List containing the 3D LUT output formats, which ColorCorrections
+        are baked to one per file.
+
     SINGLE_FORMATS
         List containing all the formats which are represented by a single
         ColorCorrection.
 
+    PROCESS_SETTINGS
+        List containing the names of the settings above, which are copied
+        into worker processes so they convert and write the same way.
+
+    XML_COLLECTION_FORMATS
+        List containing the collection formats a ColorCollection's type can
+        be set to. Other collection outputs, such as cdlb, store whichever
+        type the collection already has.
+
 ## License
 
 The MIT License (MIT)
@@ -55,6 +91,19 @@ SOFTWARE.
 # GLOBALS
 # ==============================================================================
 
+# ATOMIC_WRITES writes each output to a temp file in the same directory, then
+# renames it over the destination. Readers see either the old file or the new
+# one, never part of one, and a crash never leaves a corrupt output behind.
+#
+# FSYNC adds an fsync of each temp file before its rename, and of the
+# directory after, so a written output survives a power loss. Within
+# write.batch_writes each directory is only synced once, when the batch ends.
+#
+# Used in the following places:
+#   Every writer in write, through _open_out
+ATOMIC_WRITES = False
+FSYNC = False
+
 # HALT_ON_ERROR is the exception handling variable for exceptions that can
 # be handled silently.
 #
@@ -73,11 +122,52 @@ SOFTWARE.
 #   If a ColorCorrection is given a duplicate ID
 HALT_ON_ERROR = False
 
-COLLECTION_FORMATS = ['ale', 'ccc', 'cdl', 'flex']
-SINGLE_FORMATS = ['cc', 'rcdl']
+# FAST_MATH stores slope, offset, power and saturation values as native floats
+# rather than Decimals. This is a memory saving mode: large files take about
+# 40% less memory to hold, at the cost of exact decimal representation.
+# It doesn't make converting meaningfully faster. Floats are quicker to set
+# from text, but slower to write back out, and the numbers are a small part
+# of the time spent either way. Values are still written out through the
+# same de-exponent formatting.
+#
+# Used in the following places:
+#   ColorNodeBase._check_single_value, which converts every SOP & SAT value
+#   SatNode and SopNode default values
+FAST_MATH = False
+
+# LUT_SIZE is the number of lattice points along each axis of baked 3D LUTs.
+# 33 is the most widely supported size, 65 is used for higher precision.
+#
+# Used in the following places:
+#   write_3dl, write_cube and write_spi3d
+LUT_SIZE = 33
+
+# SKIP_UNCHANGED builds each output in memory and compares it with the file
+# already at the destination, only writing if they differ. Re-exporting
+# unchanged grades then leaves their files, and their modification times,
+# untouched.
+#
+# Used in the following places:
+#   Every writer in write, through _open_out
+SKIP_UNCHANGED = False
+
+COLLECTION_FORMATS = ['ale', 'ccc', 'cdl', 'cdlb', 'flex']
+LUT_FORMATS = ['3dl', 'cube', 'spi3d']
+SINGLE_FORMATS = ['cc', 'rcdl'] + LUT_FORMATS
+XML_COLLECTION_FORMATS = ['ccc', 'cdl']
+
+# Spawned (rather than forked) worker processes don't inherit any of these, so
+# they're copied into every worker.
+PROCESS_SETTINGS = [
+    'ATOMIC_WRITES', 'FAST_MATH', 'FSYNC', 'HALT_ON_ERROR', 'LUT_SIZE',
+    'SKIP_UNCHANGED',
+]
 
 # ==============================================================================
 # EXPORTS
 # ==============================================================================
 
-__all__ = ['HALT_ON_ERROR']
+__all__ = [
+    'ATOMIC_WRITES', 'FAST_MATH', 'FSYNC', 'HALT_ON_ERROR', 'LUT_SIZE',
+    'SKIP_UNCHANGED',
+]
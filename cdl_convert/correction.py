@@ -67,8 +67,10 @@ from xml.etree import ElementTree
 
 # cdl_convert imports
 
-from .base import AscColorSpaceBase, AscDescBase, AscXMLBase, ColorNodeBase
+from .base import AscColorSpaceBase, AscXMLBase, ColorNodeBase
 from . import config
+from .evaluate import apply_cdl
+from .registry import current_registry
 
 # Python 3 compatibility
 
@@ -92,7 +94,7 @@ __all__ = [
 # ==============================================================================
 
 
-class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disable=R0902,R0904
+class ColorCorrection(AscColorSpaceBase, AscXMLBase):  # pylint: disable=R0902,R0904
     """The basic class for the ASC CDL
 
     Description
@@ -116,7 +118,9 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         members : {str: :class`ColorCorrection` }
             All instanced :class:`ColorCorrection` are added to this member
             dictionary, with their unique id being the key and the
-            :class:`ColorCorrection` being the value.
+            :class:`ColorCorrection` being the value. Instances created
+            while a :class:`Registry` is active are added to that registry
+            instead.
 
     **Attributes:**
 
@@ -151,9 +155,9 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         id : (str)
             Unique XML URI to identify this CDL. Often a shot or sequence name.
 
-            Changing this value does a check against the cls.members dictionary
-            to ensure the new id is open. If it is, the key is changed to the
-            new id and the id is changed.
+            Changing this value does a check against the members of our
+            ``registry`` to ensure the new id is open. If it is, the key is
+            changed to the new id and the id is changed.
 
             Note that this shadows the builtin id.
 
@@ -161,9 +165,19 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             Description of the color space, format and properties of the input
             images. Inherited from :class:`AscColorSpaceBase` .
 
+        metadata : {str: str}
+            Extra fields that came with this correction in its input file,
+            but have no place in the ASC CDL, such as the ``Tape`` or
+            ``Start`` columns of an ALE. Parsers only fill this in when
+            asked to. It's never written out to XML.
+
         parent : (:class:`ColorCollection`)
             The parent node that contains this node.
 
+        registry : ( :class:`Registry` )
+            The registry this node's id is registered with. Set on creation,
+            either from the ``registry`` argument or the active registry.
+
         sat_node : ( :class:`SatNode` )
             Contains a reference to a single instance of :class:`SatNode` ,
             which contains the saturation value and descriptions.
@@ -188,6 +202,10 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     **Public Methods:**
 
+        apply()
+            Grades a NumPy image array in place with this correction's
+            slope, offset, power and saturation. Requires numpy.
+
         build_element()
             Builds an ElementTree XML Element for this node and all nodes it
             contains. ``element``, ``xml``, and ``xml_root`` attributes use
@@ -219,12 +237,28 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     """
 
-    members = {}
+    __slots__ = (
+        '_registry', '_file_in', '_file_out', 'parent', '_id', '_sat_node',
+        '_sop_node', '_metadata',
+    )
 
-    def __init__(self, id, input_file=None):  # pylint: disable=W0622
+    members = {}
+    # Next numeric suffix to try for each id that has collided. Keeps
+    # duplicate resolution from rescanning every registered member.
+    _id_counts = {}
+    # Bumped on every rename, so that collections know their id index may
+    # be stale.
+    _id_generation = 0
+
+    def __init__(self, id, input_file=None, registry=None):  # pylint: disable=W0622
         """Inits an instance of a ColorCorrection"""
         super(ColorCorrection, self).__init__()
 
+        self._registry = (
+            registry if registry is not None else current_registry()
+        )
+        members = self._registry.members(ColorCorrection)
+
         # File Attributes
         self._file_in = os.path.abspath(input_file) if input_file else None
         self._file_out = None
@@ -235,7 +269,7 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         # The id is really the only required part of a ColorCorrection node
         # Each ID should be unique
         id = _sanitize(id)
-        if id in ColorCorrection.members.keys():
+        if id in members:
             if config.HALT_ON_ERROR:
                 raise ValueError(
                     'Error initiating id to "{id}". This id is already a '
@@ -244,22 +278,16 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
                     )
                 )
             else:
-                id = '{id}{num:0>3}'.format(
-                    id=id,
-                    num=len(
-                        [cc for cc in ColorCorrection.members
-                         if cc.startswith(id)]
-                    )
-                )
+                id = self._next_free_id(id)
         elif not id:
             if config.HALT_ON_ERROR:
                 raise ValueError('Blank id given to ColorCorrection.')
             else:
-                id = str(len(ColorCorrection.members) + 1).rjust(3, '0')
+                id = str(len(members) + 1).rjust(3, '0')
         self._id = id
 
         # Register with member dictionary
-        ColorCorrection.members[self._id] = self
+        members[self._id] = self
 
         # ASC_SAT attribute
         self._sat_node = None
@@ -267,6 +295,9 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         # ASC_SOP attributes
         self._sop_node = None
 
+        # Extra fields from the input file, built on first use.
+        self._metadata = None
+
     # Properties ==============================================================
 
     @property
@@ -285,6 +316,11 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         """Returns a theoretical absolute filepath based on output ext"""
         return self._file_out
 
+    @property
+    def registry(self):
+        """Returns the registry this ColorCorrection is registered with"""
+        return self._registry
+
     @property
     def has_sat(self):
         """Returns True if SOP values are set"""
@@ -311,6 +347,13 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         """Before setting make sure new id is unique"""
         self._set_id(value)
 
+    @property
+    def metadata(self):
+        """Returns the dictionary of extra fields read from the input file"""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
     @property
     def offset(self):
         """Returns list of RGB offset values"""
@@ -336,6 +379,7 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         """Initializes a SatNode if one doesn't already exist"""
         if not self._sat_node:
             self._sat_node = SatNode(self)
+            self.invalidate_xml()
         return self._sat_node
 
     @property
@@ -353,6 +397,7 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         """Initializes a SopNode if one doesn't already exist"""
         if not self._sop_node:
             self._sop_node = SopNode(self)
+            self.invalidate_xml()
         return self._sop_node
 
     @property
@@ -370,8 +415,9 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
     def _set_id(self, new_id):
         """Changes the id field if the new id is unique"""
         cc_id = _sanitize(new_id)
+        members = self._registry.members(ColorCorrection)
         # Check if this id is already registered
-        if cc_id in ColorCorrection.members.keys():
+        if cc_id in members:
             raise ValueError(
                 'Error setting the id to "{cc_id}". This id is already a '
                 'registered id.'.format(
@@ -379,14 +425,57 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
                 )
             )
         else:
+            ColorCorrection._id_generation += 1
             # Clear the current id from the dictionary
-            ColorCorrection.members.pop(self._id)
+            members.pop(self._id)
             self._id = cc_id
             # Register the new id with the dictionary
-            ColorCorrection.members[self._id] = self
+            members[self._id] = self
+            self.invalidate_xml()
+
+    def _next_free_id(self, cc_id):
+        """Returns the next unregistered suffixed variant of a taken id"""
+        members = self._registry.members(ColorCorrection)
+        id_counts = self._registry.id_counts(ColorCorrection)
+        num = id_counts.get(cc_id, 1)
+        new_id = '{id}{num:0>3}'.format(id=cc_id, num=num)
+        while new_id in members:
+            num += 1
+            new_id = '{id}{num:0>3}'.format(id=cc_id, num=num)
+        id_counts[cc_id] = num + 1
+        return new_id
 
     # Public Methods ==========================================================
 
+    def apply(self, image, chunk_rows=None):
+        """Grades an image array in place, see :func:`apply_cdl`
+
+        **Args:**
+            image : (numpy.ndarray)
+                A float32 or float64 array with RGB on its last axis.
+
+            chunk_rows=None : (int)
+                If given, grade this many rows at a time.
+
+        **Returns:**
+            (numpy.ndarray)
+                The graded ``image``.
+
+        **Raises:**
+            ImportError:
+                If numpy isn't installed.
+
+            TypeError:
+                If ``image`` isn't a float32 or float64 numpy array.
+
+            ValueError:
+                If ``image`` doesn't have 3 channels on its last axis.
+
+        """
+        return apply_cdl(image, self, chunk_rows=chunk_rows)
+
+    # =========================================================================
+
     def build_element(self):
         """Builds an ElementTree XML element representing this CC"""
         cc_xml = ElementTree.Element('ColorCorrection')
@@ -397,15 +486,15 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
         if self.viewing_desc:
             viewing_desc = ElementTree.SubElement(cc_xml, 'ViewingDescription')
             viewing_desc.text = self.viewing_desc
-        for description in self.desc:
+        for description in self._desc or ():
             desc = ElementTree.SubElement(cc_xml, 'Description')
             desc.text = description
         # We need to make sure we call the private attributes here, since
         # we don't want to trigger a virgin sop or sat being initialized.
         if self._sop_node:
-            cc_xml.append(self.sop_node.element)
+            cc_xml.append(self.sop_node._element())  # pylint: disable=W0212
         if self._sat_node:
-            cc_xml.append(self.sat_node.element)
+            cc_xml.append(self.sat_node._element())  # pylint: disable=W0212
 
         return cc_xml
 
@@ -424,6 +513,7 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
     def reset_members(cls):
         """Resets the class level members dictionary"""
         cls.members = {}
+        cls._id_counts = {}
 
 # ==============================================================================
 
@@ -492,6 +582,8 @@ class SatNode(ColorNodeBase):
 
     """
 
+    __slots__ = ('_parent', '_sat')
+
     # XML Fields for SopNodes can be one of these names:
     element_names = ['ASC_SAT', 'SATNode', 'SatNode']
 
@@ -499,7 +591,7 @@ class SatNode(ColorNodeBase):
         super(SatNode, self).__init__()
 
         self._parent = parent
-        self._sat = Decimal('1.0')
+        self._sat = 1.0 if config.FAST_MATH else Decimal('1.0')
 
     # Properties ==============================================================
 
@@ -523,7 +615,8 @@ class SatNode(ColorNodeBase):
             except (TypeError, ValueError):
                 raise
             else:
-                self._sat = Decimal(value)
+                self._sat = value
+                self.invalidate_xml()
         else:
             raise TypeError(
                 'Saturation cannot be set directly with objects of type: '
@@ -538,7 +631,7 @@ class SatNode(ColorNodeBase):
     def build_element(self):
         """Builds an ElementTree XML Element representing this SatNode"""
         sat = ElementTree.Element('SATNode')
-        for description in self.desc:
+        for description in self._desc or ():
             desc = ElementTree.SubElement(sat, 'Description')
             desc.text = description
         op_node = ElementTree.SubElement(sat, 'Saturation')
@@ -642,6 +735,8 @@ class SopNode(ColorNodeBase):
 
     """
 
+    __slots__ = ('_parent', '_slope', '_offset', '_power')
+
     # XML Fields for SopNodes can be one of these names:
     element_names = ['ASC_SOP', 'SOPNode', 'SopNode']
 
@@ -650,9 +745,14 @@ class SopNode(ColorNodeBase):
 
         self._parent = parent
 
-        self._slope = [Decimal('1.0')] * 3
-        self._offset = [Decimal('0.0')] * 3
-        self._power = [Decimal('1.0')] * 3
+        if config.FAST_MATH:
+            self._slope = [1.0] * 3
+            self._offset = [0.0] * 3
+            self._power = [1.0] * 3
+        else:
+            self._slope = [Decimal('1.0')] * 3
+            self._offset = [Decimal('0.0')] * 3
+            self._power = [Decimal('1.0')] * 3
 
     # Properties ==============================================================
 
@@ -671,6 +771,7 @@ class SopNode(ColorNodeBase):
         """Runs tests and converts slope rgb values before setting"""
         value = self._check_setter_value(value, 'slope')
         self._slope = value
+        self.invalidate_xml()
 
     @property
     def offset(self):
@@ -682,6 +783,7 @@ class SopNode(ColorNodeBase):
         """Runs tests and converts offset rgb values before setting"""
         value = self._check_setter_value(value, 'offset', True)
         self._offset = value
+        self.invalidate_xml()
 
     @property
     def power(self):
@@ -693,6 +795,7 @@ class SopNode(ColorNodeBase):
         """Runs tests and converts power rgb values before setting"""
         value = self._check_setter_value(value, 'power')
         self._power = value
+        self.invalidate_xml()
 
     # Private Methods =========================================================
 
@@ -736,19 +839,8 @@ class SopNode(ColorNodeBase):
                 )
             )
 
-        values = list(values)
-
-        for i in xrange(len(values)):
-            try:
-                values[i] = self._check_single_value(
-                    values[i],
-                    name,
-                    negative_allow
-                )
-            except (TypeError, ValueError):
-                raise
-
-        return values
+        check = self._check_single_value
+        return [check(value, name, negative_allow) for value in values]
 
     # =========================================================================
 
@@ -813,7 +905,7 @@ class SopNode(ColorNodeBase):
         """Builds an ElementTree XML Element representing this SopNode"""
         sop = ElementTree.Element('SOPNode')
         fields = ['Slope', 'Offset', 'Power']
-        for description in self.desc:
+        for description in self._desc or ():
             desc = ElementTree.SubElement(sop, 'Description')
             desc.text = description
         for i, grade in enumerate([self.slope, self.offset, self.power]):
@@ -848,11 +940,12 @@ def _de_exponent(notation):
             Returns a quantized value without any scientific notation.
 
     """
-    notation = str(notation).lower()
-    if 'e' not in notation:
+    notation = str(notation)
+    # Floats print a lower case exponent, Decimals an upper case one.
+    if 'e' not in notation and 'E' not in notation:
         return notation
 
-    notation = notation.split('e')
+    notation = notation.lower().split('e')
     # Grab the exponent value
     digits = int(notation[-1])
     # Grab the value we'll be adding 0s to
@@ -84,9 +84,10 @@ from xml.etree import ElementTree
 
 # cdl_convert imports
 
-from .base import AscColorSpaceBase, AscDescBase, AscXMLBase
+from .base import AscColorSpaceBase, AscXMLBase
 from . import config
 from .correction import ColorCorrection
+from .registry import current_registry
 
 # ==============================================================================
 # EXPORTS
@@ -141,6 +142,10 @@ class ColorCorrectionRef(AscXMLBase):
         parent : (:class:`ColorDecision`)
             The parent :class:`ColorDecision` that contains this node.
 
+        registry : ( :class:`Registry` )
+            The registry this node is registered with. Set on creation,
+            either from the ``registry`` argument or the active registry.
+
         id : (str)
             The :class:`ColorCorrection` id that this reference refers to. If
             ``HALT_ON_ERROR`` is set to ``True``, will raise a ``ValueError``
@@ -171,7 +176,8 @@ class ColorCorrectionRef(AscXMLBase):
 
         resolve_reference()
             Attempts to return the :class:`ColorCorrection` that this
-            reference is supposed to refer to.
+            reference is supposed to refer to, looking in our ``registry``
+            unless another registry is given.
 
             If ``HALT_ON_ERROR`` is set to ``True``, resolving a bad reference
             will raise a ``ValueError`` exception. If not set, it will simply
@@ -183,10 +189,15 @@ class ColorCorrectionRef(AscXMLBase):
 
     """
 
+    __slots__ = ('_registry', '_id', 'parent')
+
     members = {}
 
-    def __init__(self, id):  # pylint: disable=W0622
+    def __init__(self, id, registry=None):  # pylint: disable=W0622
         super(ColorCorrectionRef, self).__init__()
+        self._registry = (
+            registry if registry is not None else current_registry()
+        )
         self._id = None
         # Bypass cc id existence checks on first set by calling private
         # method directly.
@@ -212,7 +223,8 @@ class ColorCorrectionRef(AscXMLBase):
     @id.setter
     def id(self, ref_id):  # pylint: disable=C0103
         """Sets the reference id"""
-        if ref_id not in ColorCorrection.members and config.HALT_ON_ERROR:
+        cc_members = self._registry.members(ColorCorrection)
+        if ref_id not in cc_members and config.HALT_ON_ERROR:
             raise ValueError(
                 "Reference id '{id}' does not match any existing "
                 "ColorCorrection id in ColorCorrection.members "
@@ -222,24 +234,31 @@ class ColorCorrectionRef(AscXMLBase):
             )
 
         self._set_id(ref_id)
+        self.invalidate_xml()
+
+    @property
+    def registry(self):
+        """Returns the registry this reference is registered with"""
+        return self._registry
 
     # Private Methods =========================================================
 
     def _set_id(self, new_ref):
         """Changes the id field and updates members dictionary"""
+        members = self._registry.members(ColorCorrectionRef)
         # The only time it won't be in here is if this is the first time
         # we set it.
-        if self.id in ColorCorrectionRef.members:
-            ColorCorrectionRef.members[self.id].remove(self)
+        if self.id in members:
+            members[self.id].remove(self)
             # If the remaining list is empty, we'll pop it out
-            if not ColorCorrectionRef.members[self.id]:
-                ColorCorrectionRef.members.pop(self.id)
+            if not members[self.id]:
+                members.pop(self.id)
 
         # Check if this id is already registered
-        if new_ref in ColorCorrectionRef.members:
-            ColorCorrectionRef.members[new_ref].append(self)
+        if new_ref in members:
+            members[new_ref].append(self)
         else:
-            ColorCorrectionRef.members[new_ref] = [self]
+            members[new_ref] = [self]
 
         self._id = new_ref
 
@@ -261,10 +280,30 @@ class ColorCorrectionRef(AscXMLBase):
 
     # =========================================================================
 
-    def resolve_reference(self):
-        """Returns the ColorCorrection this reference points to"""
-        if self.id in ColorCorrection.members:
-            return ColorCorrection.members[self.id]
+    def resolve_reference(self, registry=None):
+        """Returns the ColorCorrection this reference points to
+
+        **Args:**
+            registry=None : ( :class:`Registry` )
+                The registry to look the id up in. Defaults to the registry
+                this reference was created in.
+
+        **Returns:**
+            ( :class:`ColorCorrection` |None)
+                The referenced ColorCorrection, or None if it can't be found
+                and ``HALT_ON_ERROR`` is not set.
+
+        **Raises:**
+            ValueError:
+                If the reference can't be resolved and ``HALT_ON_ERROR`` is
+                set.
+
+        """
+        if registry is None:
+            registry = self._registry
+        cc_members = registry.members(ColorCorrection)
+        if self.id in cc_members:
+            return cc_members[self.id]
         else:
             if config.HALT_ON_ERROR:
                 raise ValueError(
@@ -278,7 +317,7 @@ class ColorCorrectionRef(AscXMLBase):
 # ==============================================================================
 
 
-class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disable=R0903
+class ColorDecision(AscColorSpaceBase, AscXMLBase):  # pylint: disable=R0903
     """Contains a media ref and a ColorCorrection or reference to CC.
 
     Description
@@ -369,6 +408,10 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
         parent : (:class:`ColorDecisionList`)
             The parent node that contains this node.
 
+        registry : ( :class:`Registry` )
+            The registry this node is registered with. Set on creation,
+            either from the ``registry`` argument or the active registry.
+
         set_parentage()
             Sets child :class:`ColorCorrection` (or
             :class:`ColorCorrectionRef`) and :class:`MediaRef` (if
@@ -428,11 +471,19 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
 
     """
 
+    __slots__ = ('_registry', 'parent', '_cc', '_media_ref')
+
     members = {}
+    # Bumped whenever a ColorDecision swaps out an existing cc, so that
+    # collections know their id index may be stale.
+    _cc_generation = 0
 
-    def __init__(self, color_correct=None, media=None):
+    def __init__(self, color_correct=None, media=None, registry=None):
         """Inits an instance of ColorDecision"""
         super(ColorDecision, self).__init__()
+        self._registry = (
+            registry if registry is not None else current_registry()
+        )
         self.parent = None
         self._cc = None
         self._set_cc(color_correct)
@@ -452,6 +503,7 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
     def cc(self, new_cc):  # pylint: disable=C0103
         """Sets the contained cc, updates dictionary and parentage"""
         self._set_cc(new_cc)
+        self.invalidate_xml()
 
     @property
     def is_ref(self):
@@ -469,33 +521,56 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
         self._media_ref = new_media_ref
         if new_media_ref:
             new_media_ref.parent = self
+        self.invalidate_xml()
+
+    @property
+    def registry(self):
+        """Returns the registry this ColorDecision is registered with"""
+        return self._registry
 
     # Private Methods =========================================================
 
     def _set_cc(self, new_cc):
         """Sets cc to new_cc and updates members dictionary"""
+        members = self._registry.members(ColorDecision)
         if self.cc:
+            ColorDecision._cc_generation += 1
             # If we have a cc, we've already been added to the member's list,
             # and need to update membership.
-            if self.cc.id in ColorDecision.members:
-                ColorDecision.members[self.cc.id].remove(self)
+            if self.cc.id in members:
+                members[self.cc.id].remove(self)
                 # If the remaining list is empty, we'll pop it out
-                if not ColorDecision.members[self.cc.id]:
-                    ColorDecision.members.pop(self.cc.id)
+                if not members[self.cc.id]:
+                    members.pop(self.cc.id)
         if new_cc:
             # It's possible to have new_cc be None, in which case we won't
             # assign this ColorDecision to the member dictionary.
             #
             # Check if this id is already registered
-            if new_cc.id in ColorDecision.members:
-                ColorDecision.members[new_cc.id].append(self)
+            if new_cc.id in members:
+                members[new_cc.id].append(self)
             else:
-                ColorDecision.members[new_cc.id] = [self]
+                members[new_cc.id] = [self]
 
             new_cc.parent = self
 
         self._cc = new_cc
 
+    # =========================================================================
+
+    def _xml_state(self):
+        """Returns the XML version of our cc and MediaRef
+
+        The same ColorCorrection can be given to more than one ColorDecision,
+        and only the last one is its ``parent`` , so changes to it can't be
+        relied on to invalidate us.
+
+        """
+        return tuple(
+            node._xml_version  # pylint: disable=W0212
+            for node in (self._cc, self._media_ref) if node is not None
+        )
+
     # Public Methods ==========================================================
 
     def build_element(self, resolve=False):  # pylint: disable=W0221
@@ -507,24 +582,24 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
         if self.viewing_desc:
             viewing_desc = ElementTree.SubElement(cd_xml, 'ViewingDescription')
             viewing_desc.text = self.viewing_desc
-        for description in self.desc:
+        for description in self._desc or ():
             desc = ElementTree.SubElement(cd_xml, 'Description')
             desc.text = description
         # Customary for the Media Ref element to go first (if there is one)
         if self.media_ref:
-            cd_xml.append(self.media_ref.element)
+            cd_xml.append(self.media_ref._element())  # pylint: disable=W0212
 
         # The resolve arg should only be applied to reference color decisions.
         #
         # Our behavior for non-reference CDs is the same as our behavior
         # for non-resolving.
         if not resolve or not self.is_ref:
-            cd_xml.append(self.cc.element)
+            cd_xml.append(self.cc._element())  # pylint: disable=W0212
         elif resolve:
             # We're a reference and we need to be resolved
             # Note that this will raise an exception if called when a reference
             # cannot be resolve due to a non-existent ColorCorrection.
-            cd_xml.append(self.cc.cc.element)
+            cd_xml.append(self.cc.cc._element())  # pylint: disable=W0212
 
         return cd_xml
 
@@ -542,12 +617,15 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
             else:
                 # Parse the ColorCorrectionRef
                 ref_id = cc_elem.attrib['ref']
-                self.cc = ColorCorrectionRef(ref_id)  # pylint: disable=C0103
+                self.cc = ColorCorrectionRef(  # pylint: disable=C0103
+                    ref_id, registry=self._registry
+                )
                 self.cc.parent = self
         else:
             from . import parse
             # Parse the ColorCorrection
-            self.cc = parse.parse_cc(cc_elem)
+            with self._registry:
+                self.cc = parse.parse_cc(cc_elem)
             self.cc.parent = self
 
         return True
@@ -594,7 +672,7 @@ class ColorDecision(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: disa
         media_ref_elem = xml_element.find('MediaRef')
         if media_ref_elem is not None:
             ref_uri = media_ref_elem.attrib['ref']
-            self.media_ref = MediaRef(ref_uri=ref_uri)
+            self.media_ref = MediaRef(ref_uri=ref_uri, registry=self._registry)
 
     # =========================================================================
 
@@ -705,6 +783,10 @@ class MediaRef(AscXMLBase):
             filename. If there is no protocol and no filename, ``ref`` is
             identical to ``directory``.
 
+        registry : ( :class:`Registry` )
+            The registry this node is registered with. Set on creation,
+            either from the ``registry`` argument or the active registry.
+
         seq : (str)
             If ``is_seq`` finds that the filename or directory refers to one or
             more image sequences, ``seq`` will return the first found sequence
@@ -748,10 +830,18 @@ class MediaRef(AscXMLBase):
 
     """
 
+    __slots__ = (
+        '_registry', '_protocol', '_dir', '_filename', 'parent', '_is_seq',
+        '_sequences',
+    )
+
     members = {}
 
-    def __init__(self, ref_uri, parent=None):
+    def __init__(self, ref_uri, parent=None, registry=None):
         super(MediaRef, self).__init__()
+        self._registry = (
+            registry if registry is not None else current_registry()
+        )
         self._protocol, self._dir, self._filename = self._split_uri(ref_uri)
         self.parent = parent
 
@@ -881,6 +971,11 @@ class MediaRef(AscXMLBase):
                 )
             )
 
+    @property
+    def registry(self):
+        """Returns the registry this MediaRef is registered with"""
+        return self._registry
+
     @property
     def seq(self):
         """Returns first found sequence with frames as # padding"""
@@ -926,9 +1021,10 @@ class MediaRef(AscXMLBase):
             N/A
 
         """
+        members = self._registry.members(MediaRef)
         if old_ref:
             try:
-                MediaRef.members[old_ref].remove(self)
+                members[old_ref].remove(self)
             except (KeyError, ValueError):
                 # Either the key doesn't exist or we're not in the list.
                 # Either way, it doesn't matter to us.
@@ -936,12 +1032,12 @@ class MediaRef(AscXMLBase):
             else:
                 # Now that we're removed, we need to see if the list is empty,
                 # and if so, delete the key ref.
-                if not MediaRef.members[old_ref]:
-                    del MediaRef.members[old_ref]
+                if not members[old_ref]:
+                    del members[old_ref]
         try:
-            MediaRef.members[self.ref].append(self)
+            members[self.ref].append(self)
         except KeyError:
-            MediaRef.members[self.ref] = [self]
+            members[self.ref] = [self]
 
     # =========================================================================
 
@@ -1000,6 +1096,7 @@ class MediaRef(AscXMLBase):
         """Resets cached attributes back to init values"""
         self._is_seq = None
         self._sequences = None
+        self.invalidate_xml()
 
     # =========================================================================
 
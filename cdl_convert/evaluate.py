@@ -0,0 +1,455 @@
+#!/usr/bin/env python
+"""
+
+CDL Convert Evaluate
+====================
+
+Applies the ASC CDL math to image data held in NumPy arrays. NumPy is an
+optional dependency, only needed if these functions are called.
+
+## Public Functions
+
+    apply_cdl()
+        Grades an HxWx3 float array in place with a single
+        :class:`ColorCorrection` .
+
+    apply_collection()
+        Grades one image with every :class:`ColorCorrection` of a
+        :class:`ColorCollection` at once, returning all the variants stacked
+        into one array.
+
+    bake_lut()
+        Evaluates a :class:`ColorCorrection` over a full 3D lattice of RGB
+        input values, ready to be written out as a LUT.
+
+    iter_apply_collection()
+        Like ``apply_collection()``, but yields the variants a chunk at a
+        time, so that the full stack never needs to fit in memory.
+
+## Globals
+
+    LUMA_WEIGHTS
+        The Rec. 709 luma coefficients used by the saturation operation.
+
+## License
+
+The MIT License (MIT)
+
+cdl_convert
+Copyright (c) 2015 Sean Wallitsch
+http://github.com/shidarin/cdl_convert/
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Third Party Imports
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # pylint: disable=C0103
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+LUMA_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+__all__ = [
+    'apply_cdl',
+    'apply_collection',
+    'bake_lut',
+    'iter_apply_collection',
+]
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _apply_block(block, slope, offset, power, sat, weights):
+    """Grades a block of pixels in place
+
+    The values can be single values, or stacks that broadcast against the
+    block to grade many variants at once.
+
+    """
+    numpy.multiply(block, slope, out=block)
+    numpy.add(block, offset, out=block)
+    numpy.clip(block, 0.0, 1.0, out=block)
+    numpy.power(block, power, out=block)
+
+    if numpy.any(sat != 1):
+        # luma + sat * (out - luma), rearranged so that variants with a sat
+        # of 1 come out exactly unchanged.
+        luma = numpy.dot(block, weights)[..., numpy.newaxis]
+        numpy.multiply(luma, 1 - sat, out=luma)
+        numpy.multiply(block, sat, out=block)
+        numpy.add(block, luma, out=block)
+        numpy.clip(block, 0.0, 1.0, out=block)
+
+# ==============================================================================
+
+
+def _check_image(image):
+    """Raises if image isn't a float array with RGB as its last axis"""
+    if numpy is None:
+        raise ImportError(
+            "Applying a ColorCorrection to an image requires numpy."
+        )
+    if not isinstance(image, numpy.ndarray):
+        raise TypeError(
+            "Image must be a numpy array, not {type}".format(
+                type=type(image).__name__
+            )
+        )
+    if image.dtype not in (numpy.float32, numpy.float64):
+        raise TypeError(
+            "Image must be a float32 or float64 array, not {dtype}".format(
+                dtype=image.dtype
+            )
+        )
+    if image.ndim < 1 or image.shape[-1] != 3:
+        raise ValueError(
+            "Image must have 3 channels on its last axis, got shape "
+            "{shape}".format(shape=image.shape)
+        )
+
+# ==============================================================================
+
+
+def _cdl_values(color_correction, dtype):
+    """Returns the slope, offset, power and sat of a cc as dtype arrays"""
+    # Reading slope or sat creates a default node on corrections that
+    # don't have one, which would then be written out, so check first.
+    if color_correction.has_sop:
+        sop = (
+            color_correction.slope,
+            color_correction.offset,
+            color_correction.power,
+        )
+    else:
+        sop = ((1, 1, 1), (0, 0, 0), (1, 1, 1))
+    sat = color_correction.sat if color_correction.has_sat else 1
+
+    slope, offset, power = [
+        numpy.array([float(i) for i in values], dtype=dtype)
+        for values in sop
+    ]
+    return slope, offset, power, dtype.type(float(sat))
+
+# ==============================================================================
+
+
+def _collection_values(collection, dtype):
+    """Returns the corrections of a collection, and their stacked values"""
+    if hasattr(collection, 'stacked_values'):
+        # A ColumnarCollection already holds its values stacked.
+        return list(collection), collection.stacked_values(dtype)
+    if hasattr(collection, 'color_decisions'):
+        corrections = list(collection.color_corrections)
+        for decision in collection.color_decisions:
+            # A ColorCorrectionRef is resolved to the correction it points
+            # to, unless it can't be, in which case there's nothing to apply.
+            if decision.is_ref:
+                color_correction = decision.cc.cc
+            else:
+                color_correction = decision.cc
+            if color_correction is not None:
+                corrections.append(color_correction)
+    else:
+        corrections = list(collection)
+    return corrections, _stack_values(corrections, dtype)
+
+# ==============================================================================
+
+
+def _grade_stack(out, image, values, weights):
+    """Grades image with a stack of cdl values into out, one per variant"""
+    # Add an axis for every image axis but the channels, so (N, 3) values
+    # broadcast against the (N, ..., 3) output.
+    expand = (slice(None),) + (numpy.newaxis,) * (image.ndim - 1)
+    slope, offset, power = [i[expand] for i in values[:3]]
+    sat = values[3][expand + (numpy.newaxis,)]
+
+    out[...] = image
+    _apply_block(out, slope, offset, power, sat, weights)
+
+# ==============================================================================
+
+
+def _stack_values(corrections, dtype):
+    """Stacks the cdl values of many corrections into (N, 3) and (N,)"""
+    values = [_cdl_values(i, dtype) for i in corrections]
+    if not values:
+        empty = numpy.empty((0, 3), dtype=dtype)
+        return empty, empty, empty, numpy.empty((0,), dtype=dtype)
+    return tuple(numpy.array(i, dtype=dtype) for i in zip(*values))
+
+# ==============================================================================
+
+
+def _variants_per_chunk(image, count, max_bytes, output=True):
+    """Returns how many variants can be graded at once within max_bytes"""
+    if max_bytes is None:
+        return max(count, 1)
+    # Saturation needs one luma value per pixel, on top of the graded
+    # output itself when that is being allocated per chunk.
+    per_variant = image.nbytes // 3
+    if output:
+        per_variant += image.nbytes
+    if max_bytes < per_variant:
+        raise ValueError(
+            "max_bytes of {cap} is too small to grade a single variant of "
+            "this image, which needs {need} bytes".format(
+                cap=max_bytes, need=per_variant
+            )
+        )
+    return max_bytes // per_variant
+
+# ==============================================================================
+# PUBLIC FUNCTIONS
+# ==============================================================================
+
+
+def apply_cdl(image, color_correction, chunk_rows=None):
+    """Applies a ColorCorrection to an image array in place
+
+    **Args:**
+        image : (numpy.ndarray)
+            A float32 or float64 array whose last axis holds the red, green
+            and blue channels, usually HxWx3. It's graded in place, so it
+            must be writeable. A ``numpy.memmap`` works for frames that
+            don't fit in memory.
+
+        color_correction : (:class:`ColorCorrection`)
+            The correction whose ``slope``, ``offset``, ``power`` and
+            ``sat`` are applied.
+
+        chunk_rows=None : (int)
+            If given, the image is graded this many rows (entries along the
+            first axis) at a time. Saturation needs a temporary luma array
+            the size of whatever is being graded, so this caps the extra
+            memory needed for very large frames.
+
+    **Returns:**
+        (numpy.ndarray)
+            The same ``image`` that was passed in, now graded.
+
+    **Raises:**
+        ImportError:
+            If numpy isn't installed.
+
+        TypeError:
+            If ``image`` isn't a float32 or float64 numpy array.
+
+        ValueError:
+            If ``image`` doesn't have 3 channels on its last axis, or
+            ``chunk_rows`` is less than 1.
+
+    The operations follow the ASC CDL spec, in order:
+
+        out = clamp(in * slope + offset) ** power
+        luma = 0.2126 * R + 0.7152 * G + 0.0722 * B
+        out = clamp(luma + sat * (out - luma))
+
+    Where clamp limits values to the 0-1 range. Saturation is skipped
+    entirely when ``sat`` is 1.
+
+    """
+    _check_image(image)
+    if chunk_rows is not None and chunk_rows < 1:
+        raise ValueError(
+            "chunk_rows must be at least 1, got {rows}".format(rows=chunk_rows)
+        )
+
+    slope, offset, power, sat = _cdl_values(color_correction, image.dtype)
+    weights = numpy.array(LUMA_WEIGHTS, dtype=image.dtype)
+
+    if chunk_rows is None or image.ndim == 1:
+        _apply_block(image, slope, offset, power, sat, weights)
+    else:
+        for start in range(0, image.shape[0], chunk_rows):
+            _apply_block(
+                image[start:start + chunk_rows],
+                slope, offset, power, sat, weights
+            )
+
+    return image
+
+# ==============================================================================
+
+
+def bake_lut(color_correction, size=33):
+    """Evaluates a ColorCorrection over a 3D lattice in one vectorized pass
+
+    **Args:**
+        color_correction : (:class:`ColorCorrection`)
+            The correction to bake.
+
+        size=33 : (int)
+            Number of lattice points along each axis. Input values are
+            spaced evenly from 0 to 1, inclusive.
+
+    **Returns:**
+        (numpy.ndarray)
+            A float64 array of shape ``(size, size, size, 3)``, indexed by
+            the red, green and blue lattice positions, in that order, and
+            holding the graded RGB value for each.
+
+    **Raises:**
+        ImportError:
+            If numpy isn't installed.
+
+        ValueError:
+            If ``size`` is less than 2.
+
+    """
+    if numpy is None:
+        raise ImportError("Baking a LUT requires numpy.")
+    if size < 2:
+        raise ValueError(
+            "LUT size must be at least 2, got {size}".format(size=size)
+        )
+
+    steps = numpy.linspace(0.0, 1.0, size)
+    lattice = numpy.empty((size, size, size, 3), dtype=numpy.float64)
+    lattice[..., 0] = steps[:, numpy.newaxis, numpy.newaxis]
+    lattice[..., 1] = steps[numpy.newaxis, :, numpy.newaxis]
+    lattice[..., 2] = steps[numpy.newaxis, numpy.newaxis, :]
+
+    return apply_cdl(lattice, color_correction)
+
+# ==============================================================================
+
+
+def apply_collection(collection, image, max_bytes=None):
+    """Grades one image with every ColorCorrection in a collection
+
+    **Args:**
+        collection : (ColorCollection|ColumnarCollection|[ColorCorrection])
+            The collection whose ``color_corrections`` and then the
+            corrections of its ``color_decisions`` are applied, or any
+            sequence of ColorCorrections. A :class:`ColumnarCollection` is
+            graded straight from its value buffer.
+
+        image : (numpy.ndarray)
+            A float32 or float64 array with the red, green and blue channels
+            on its last axis, usually HxWx3. It isn't modified.
+
+        max_bytes=None : (int)
+            Caps the temporary memory used on top of the returned array.
+            The variants are graded in chunks small enough to stay within
+            it. With no cap, every variant is graded in one pass.
+
+    **Returns:**
+        (numpy.ndarray)
+            An array of shape ``(N,) + image.shape`` and the same dtype as
+            ``image``, holding the image graded by each of the N
+            corrections, in order.
+
+    **Raises:**
+        ImportError:
+            If numpy isn't installed.
+
+        TypeError:
+            If ``image`` isn't a float32 or float64 numpy array.
+
+        ValueError:
+            If ``image`` doesn't have 3 channels on its last axis, or
+            ``max_bytes`` can't fit even a single variant.
+
+    The slope, offset, power and saturation of every correction are stacked
+    into (N, 3) and (N,) arrays and broadcast against the image, so there's
+    no Python loop over the corrections or the pixels.
+
+    """
+    _check_image(image)
+    corrections, values = _collection_values(collection, image.dtype)
+    weights = numpy.array(LUMA_WEIGHTS, dtype=image.dtype)
+
+    graded = numpy.empty((len(corrections),) + image.shape, dtype=image.dtype)
+    chunk = _variants_per_chunk(
+        image, len(corrections), max_bytes, output=False
+    )
+    for start in range(0, len(corrections), chunk):
+        _grade_stack(
+            graded[start:start + chunk],
+            image,
+            [i[start:start + chunk] for i in values],
+            weights
+        )
+
+    return graded
+
+# ==============================================================================
+
+
+def iter_apply_collection(collection, image, max_bytes):
+    """Grades one image with every ColorCorrection, a chunk at a time
+
+    **Args:**
+        collection : (ColorCollection|ColumnarCollection|[ColorCorrection])
+            The collection whose ``color_corrections`` and then the
+            corrections of its ``color_decisions`` are applied, or any
+            sequence of ColorCorrections. A :class:`ColumnarCollection` is
+            graded straight from its value buffer.
+
+        image : (numpy.ndarray)
+            A float32 or float64 array with the red, green and blue channels
+            on its last axis, usually HxWx3. It isn't modified.
+
+        max_bytes : (int)
+            The most memory each chunk may use, counting both the graded
+            variants it yields and the temporaries needed to grade them.
+
+    **Yields:**
+        ([:class:`ColorCorrection`], numpy.ndarray)
+            The corrections in this chunk, and an array of shape
+            ``(len(corrections),) + image.shape`` holding the image graded
+            by each of them. Each array is newly allocated, so callers can
+            keep or discard it.
+
+    **Raises:**
+        Same as ``apply_collection()``.
+
+    """
+    _check_image(image)
+    corrections, values = _collection_values(collection, image.dtype)
+    weights = numpy.array(LUMA_WEIGHTS, dtype=image.dtype)
+
+    chunk = _variants_per_chunk(image, len(corrections), max_bytes)
+    for start in range(0, len(corrections), chunk):
+        chunk_values = [i[start:start + chunk] for i in values]
+        graded = numpy.empty(
+            (len(chunk_values[3]),) + image.shape, dtype=image.dtype
+        )
+        _grade_stack(graded, image, chunk_values, weights)
+        yield corrections[start:start + chunk], graded
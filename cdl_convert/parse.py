@@ -8,6 +8,15 @@ Contains parser functions for converting files to cdl_convert objects.
 
 ## Public Functions
 
+    find_correction()
+        Finds a single ColorCorrection by id within a large CCC or CDL, by
+        parsing only that correction's slice of the file.
+
+    iter_file()
+        Determines which iterator to use based on file extension (or provided
+        ext arg) and returns a generator that yields each ColorCorrection or
+        ColorDecision as it is parsed.
+
     parse_ale()
         Parses an ALE EDL file into a ColorCollection set to ccc.
 
@@ -20,6 +29,10 @@ Contains parser functions for converting files to cdl_convert objects.
     parse_cdl
         Parses an XML CDL file into a ColorCollection set to cdl.
 
+    parse_cdlb()
+        Parses a binary CDLB file into a ColorCollection of the type it was
+        written from.
+
     parse_file()
         Determines which parse function to call based on file extension (or
         provided ext arg) and calls that function. Returns result.
@@ -37,6 +50,14 @@ Contains parser functions for converting files to cdl_convert objects.
         A dictionary whose keys are file extensions and values are the above
         functions. Used by ``parse_file()`` to determine what parser to call.
 
+    ITER_FORMATS
+        A dictionary whose keys are file extensions and values are generator
+        functions. Used by ``iter_file()`` to determine what iterator to call.
+
+    CORRECTION_INDEX_EXT
+        The extension added to a CCC or CDL's filename to name the sidecar
+        index ``find_correction()`` writes beside it.
+
 ## License
 
 The MIT License (MIT)
@@ -73,47 +94,157 @@ from __future__ import absolute_import, print_function
 
 # Standard Imports
 
-from ast import literal_eval
+import functools
+import json
+import mmap
 import os
 import re
+import sys
+import tempfile
 from xml.etree import ElementTree
+from xml.sax.saxutils import unescape
 
 # cdl_convert imports
 
-from . import collection, correction
+from . import cdlb, collection, correction, decision
 
 # ==============================================================================
 # EXPORTS
 # ==============================================================================
 
 __all__ = [
+    'find_correction',
+    'iter_file',
     'parse_ale',
     'parse_cc',
     'parse_ccc',
     'parse_cdl',
+    'parse_cdlb',
     'parse_file',
     'parse_flex',
     'parse_rnh_cdl'
 ]
 
+# ==============================================================================
+# DECORATORS
+# ==============================================================================
+
+
+def _accepts_registry(func):
+    """Adds a ``registry`` keyword argument to a parse function
+
+    When a :class:`Registry` is given, it's made the active registry for the
+    duration of the call, so every node the parser builds registers with it.
+
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """Runs the wrapped parser inside the given registry"""
+        registry = kwargs.pop('registry', None)
+        if registry is None:
+            return func(*args, **kwargs)
+        with registry:
+            return func(*args, **kwargs)
+    return wrapper
+
 # ==============================================================================
 # FUNCTIONS
 # ==============================================================================
 
 
-def parse_ale(input_file):  # pylint: disable=R0914
+@_accepts_registry
+def find_correction(filepath, cc_id):
+    """Parses a single ColorCorrection out of a CCC or CDL by its id
+
+    **Args:**
+        filepath : (str)
+            The filepath to the CCC or CDL.
+
+        cc_id : (str)
+            The id of the ColorCorrection to find, as written in the file.
+
+        registry=None : ( :class:`Registry` )
+            If given, the found correction registers with this registry
+            instead of the active one.
+
+    **Returns:**
+        (:class:`ColorCorrection`|None)
+            The correction with that id, or None if the file doesn't
+            contain one. Only the first correction with an id is found.
+
+    **Raises:**
+        ValueError:
+            Bad XML formatting of the found correction can raise ValueError
+            if it's missing required elements.
+
+    The first lookup in a file memory maps it and scans for every
+    ``<ColorCorrection>`` element, recording the byte offsets where each
+    starts and ends. That index is written beside the file, with
+    ``CORRECTION_INDEX_EXT`` added to its name, and kept in memory. Each
+    lookup then reads and parses just the one element with ``parse_cc`` ,
+    rather than the whole file with ``parse_ccc`` .
+
+    The index records the size and mtime of the file it was built from, and
+    is rebuilt whenever the file no longer matches. If the index can't be
+    written, because the directory is read only, it's only kept in memory.
+
+    """
+    filepath = os.path.abspath(filepath)
+    for attempt in range(2):
+        span = _correction_index(filepath, rebuild=attempt > 0).get(cc_id)
+        if span is None:
+            return None
+
+        with open(filepath, 'rb') as xml_file:
+            xml_file.seek(span[0])
+            element = ElementTree.fromstring(
+                xml_file.read(span[1] - span[0])
+            )
+        for child in element.iter():
+            child.tag = child.tag.split('}')[-1]
+
+        # If the file was rewritten within the resolution of its mtime, the
+        # offsets might not point at the correction any more.
+        if element.tag == 'ColorCorrection' and \
+                element.attrib.get('id') == cc_id:
+            break
+    else:
+        return None
+
+    cdl = parse_cc(element)
+    cdl.file_in = filepath
+    return cdl
+
+# ==============================================================================
+
+
+@_accepts_registry
+def parse_ale(input_file, columns=None):
     """Parses an Avid Log Exchange (ALE) file for CDLs
 
     **Args:**
-        input_file : (str)
-            The filepath to the ALE EDL
+        input_file : (str|iter)
+            The filepath to the ALE EDL, or any iterable of its lines, such
+            as an open file, a gzip stream or ``sys.stdin``. Lines are read
+            one at a time, so memory use doesn't grow with the size of the
+            EDL.
+
+        columns=None : ([str])
+            Names of extra ALE columns, such as ``Tape``, ``Start`` and
+            ``End``, to store in the ``metadata`` of each correction.
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
 
     **Returns:**
         (:class:`ColorCollection`)
             A collection that contains all found ColorCorrections
 
     **Raises:**
-        N/A
+        ValueError:
+            If the ALE is missing one of the ``columns`` asked for, or one of
+            the columns needed to build a correction.
 
     An ALE file is traditionally gathered during a telecine transfer using
     standard ASCII characters. Each line theoretically represents a single
@@ -125,74 +256,21 @@ def parse_ale(input_file):  # pylint: disable=R0914
     The Data line indicates that all the following lines are comprised of
     shot information.
 
-    """
-    # When we enter a section, we're store the section name
-    section = {
-        'column': False,
-        'data': False
-    }
-
-    # We'll store the correlation between index and field name
-    ale_indexes = {}
-
-    cdls = []
-
-    with open(input_file, 'r') as edl:
-        lines = edl.readlines()
-        for line in lines:
-            if line.startswith('Column'):
-                section['column'] = True
-                continue
-            elif line.startswith('Data'):
-                section['data'] = True
-                continue
-            elif section['column']:
-                for i, field in enumerate(line.split('\t')):
-                    ale_indexes[field.strip()] = i
-                section['column'] = False
-            elif section['data']:
-                cdl_data = line.split('\t')
-
-                sat = cdl_data[ale_indexes['ASC_SAT']]
-                sop = cdl_data[ale_indexes['ASC_SOP']]
-                try:
-                    cc_id = cdl_data[ale_indexes['Scan Filename']]
-                except KeyError:
-                    # Scan Filename is usually more descriptive, but we can
-                    # fall back on the always present 'Name' field if
-                    # Scan Filename is missing.
-                    cc_id = cdl_data[ale_indexes['Name']]
-
-                # Determine slope, offset and power from sop
-                # sop should look like:
-                # (1.4 1.9 1.7)(-0.1 -0.26 -0.20)(0.87 1.0 1.32)
-                sop = sop.replace(' ', ', ')
-                sop = sop.replace(')(', ')|(')
-                sop = sop.split('|')
-                sop_values = {
-                    'slope': literal_eval(sop[0]),
-                    'offset': literal_eval(sop[1]),
-                    'power': literal_eval(sop[2])
-                }
-
-                cdl = correction.ColorCorrection(cc_id, input_file)
-
-                cdl.sat = sat
-                cdl.slope = sop_values['slope']
-                cdl.offset = sop_values['offset']
-                cdl.power = sop_values['power']
-
-                cdls.append(cdl)
+    Real ALE exports often have dozens of columns, so the positions of the
+    few fields we read are looked up once from the Column line, and each
+    data line is only split as far as the last of them.
 
+    """
     ccc = collection.ColorCollection()
-    ccc.file_in = input_file
-    ccc.append_children(cdls)
+    ccc.file_in = _edl_path(input_file)
+    ccc.append_children(_iter_ale(input_file, columns or ()))
 
     return ccc
 
 # ==============================================================================
 
 
+@_accepts_registry
 def parse_cc(input_file):  # pylint: disable=R0912
     """Parses a .cc file for ASC CDL information
 
@@ -200,6 +278,10 @@ def parse_cc(input_file):  # pylint: disable=R0912
         input_file : (str|<ElementTree.Element>)
             The filepath to the CC or the ``ElementTree.Element`` object.
 
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
     **Returns:**
         (:class:`ColorCorrection`)
             The :class:`ColorCorrection` described within.
@@ -332,13 +414,24 @@ def parse_cc(input_file):  # pylint: disable=R0912
 # ==============================================================================
 
 
-def parse_ccc(input_file):
+@_accepts_registry
+def parse_ccc(input_file, stream=False):
     """Parses a .ccc file into a :class:`ColorCollection` with type 'ccc'
 
     **Args:**
         input_file : (str)
             The filepath to the CCC.
 
+        stream=False : (bool)
+            If True, the file is read incrementally with ``iterparse``, and
+            each ColorCorrection element is discarded as soon as it has been
+            converted. Peak memory no longer scales with the size of the XML
+            document, which matters for very large show-wide collections.
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
     **Returns:**
         (:class:`ColorCollection`)
             A collection of all the found :class:`ColorCorrection` as well
@@ -359,6 +452,9 @@ def parse_ccc(input_file):
     as any relevant hardware devices used to view or grade.
 
     """
+    if stream:
+        return _parse_ccc_stream(input_file)
+
     root = _remove_xmlns(input_file)
 
     if root.tag != 'ColorCorrectionCollection':
@@ -388,13 +484,23 @@ def parse_ccc(input_file):
 # ==============================================================================
 
 
-def parse_cdl(input_file):
+@_accepts_registry
+def parse_cdl(input_file, stream=False):
     """Parses a .cdl file into a :class:`ColorCollection` with type 'cdl'
 
     **Args:**
         input_file : (str)
             The filepath to the CDL.
 
+        stream=False : (bool)
+            If True, the file is read incrementally with ``iterparse``, and
+            each ColorDecision element is discarded as soon as it has been
+            converted.
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
     **Returns:**
         (:class:`ColorCollection`)
             A collection of all the found :class:`ColorDecisions` as well
@@ -416,6 +522,9 @@ def parse_cdl(input_file):
     as any relevant hardware devices used to view or grade.
 
     """
+    if stream:
+        return _parse_cdl_stream(input_file)
+
     root = _remove_xmlns(input_file)
 
     if root.tag != 'ColorDecisionList':
@@ -445,12 +554,51 @@ def parse_cdl(input_file):
 # ==============================================================================
 
 
-def parse_flex(input_file):  # pylint: disable=R0912,R0914
-    """Parses a DaVinci FLEx telecine EDL for ASC CDL information.
+@_accepts_registry
+def parse_cdlb(input_file):
+    """Parses a binary .cdlb file into a :class:`ColorCollection`
 
     **Args:**
         input_file : (str)
-            The filepath to the FLEx EDL
+            The filepath to the CDLB.
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
+    **Returns:**
+        (:class:`ColorCollection`)
+            A collection with the same type, descriptions, ColorCorrections
+            and ColorDecisions as the collection that was written.
+
+    **Raises:**
+        ValueError:
+            If the file isn't a CDLB file, or is corrupt.
+
+    A CDLB file holds a whole ColorCollection as a string table and packed
+    values, and loads much faster than the same collection as XML. To read
+    only a few corrections from a large CDLB, use :class:`cdlb.CdlbFile`
+    directly.
+
+    """
+    with cdlb.CdlbFile(input_file) as cdlb_file:
+        return cdlb_file.to_collection()
+
+# ==============================================================================
+
+
+@_accepts_registry
+def parse_flex(input_file):
+    """Parses a DaVinci FLEx telecine EDL for ASC CDL information.
+
+    **Args:**
+        input_file : (str|iter)
+            The filepath to the FLEx EDL, or any iterable of its lines. Like
+            ``parse_ale``, lines are read one at a time.
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
 
     **Returns:**
         (:class:`ColorCollection`)
@@ -496,108 +644,16 @@ def parse_flex(input_file):  # pylint: disable=R0912,R0914
     actual input filename, which is far from ideal.
 
     """
-
-    cdls = []
-
-    with open(input_file, 'r') as edl:
-        lines = edl.readlines()
-
-        filename = os.path.basename(input_file).split('.')[0]
-
-        title = None
-        # Metadata will store, in order, the various scene, take, reel fields
-        # it finds.
-        metadata = []
-
-        sop = {}
-        sat = None
-
-        def build_cc(line_id, edl_path, sop_dict, sat_value, title_line):
-            """Builds and returns a cc if sop/sat values found"""
-            col_cor = correction.ColorCorrection(line_id, edl_path)
-            if title_line:
-                col_cor.desc = title_line
-            if sop_dict:
-                # If it finds the 701 line, it will have all three
-                col_cor.slope = sop_dict['slope']
-                col_cor.offset = sop_dict['offset']
-                col_cor.power = sop_dict['power']
-            if sat_value:
-                col_cor.sat = sat_value
-
-            return col_cor
-
-        for line in lines:
-            if line.startswith('100'):
-                # This is the start of a take/shot
-                # We need to dump the previous records to a CDL
-                # Then clear the records.
-                # Note that the first data line will also hit this.
-                metadata = [i for i in metadata if i != '']
-                if metadata:
-                    cc_id = '_'.join(metadata)
-                else:
-                    field = title if title else filename
-                    cc_id = field + str(len(cdls) + 1).rjust(3, '0')
-
-                # If we already have values:
-                if sop or sat:
-                    cdl = build_cc(cc_id, input_file, sop, sat, title)
-                    cdls.append(cdl)
-
-                metadata = []
-                sop = {}
-                sat = None
-
-            elif line.startswith('010'):
-                # Title Line
-                # 10-79 Title
-                title = line[10:80].strip()
-            elif line.startswith('110'):
-                # Slate Information
-                # 10-17 Scene
-                # 24-31 Take ID
-                # 42-49 Camera Reel ID
-                metadata = [
-                    line[10:18].strip(),  # Scene
-                    line[24:32].strip(),  # Take
-                    line[42:50].strip(),  # Reel
-                ]
-            elif line.startswith('701'):
-                # ASC SOP
-                # 701 ASC_SOP(# # #)(-# -# -#)(# # #)
-                sop = {
-                    'slope': line[12:32].split(),
-                    'offset': line[34:57].split(),
-                    'power': line[59:79].split()
-                }
-            elif line.startswith('702'):
-                # ASC SAT
-                # 702 ASC_SAT ######
-                sat = line.split()[-1]
-
-    # We need to dump the last record to the cdl list
-    metadata = [i for i in metadata if i != '']
-    if metadata:
-        cc_id = '_'.join(metadata)
-    else:
-        field = title if title else filename
-        cc_id = field + str(len(cdls) + 1).rjust(3, '0')
-
-    # If we found values at all:
-    if sop or sat:
-        cdl = build_cc(cc_id, input_file, sop, sat, title)
-        cdls.append(cdl)
-
     ccc = collection.ColorCollection()
-    ccc.file_in = input_file
-    ccc.append_children(cdls)
+    ccc.file_in = _edl_path(input_file)
+    ccc.append_children(_iter_flex(input_file))
 
     return ccc
 
 # ==============================================================================
 
 
+@_accepts_registry
 def parse_rnh_cdl(input_file):
     """Parses a space separated .cdl file for ASC CDL information.
 
@@ -605,6 +661,10 @@ def parse_rnh_cdl(input_file):
         input_file : (str)
             The filepath to the CDL
 
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
     **Returns:**
         (:class:`ColorCorrection`)
             The single ColorCorrection object retrieved from the beta CDL
@@ -652,6 +712,520 @@ def parse_rnh_cdl(input_file):
 # ==============================================================================
 
 
+def _ale_columns(line, columns):
+    """Returns the indexes of the fields we read, from an ALE Column line
+
+    The indexes of ``ASC_SAT``, ``ASC_SOP`` and the id field come first,
+    followed by one for each of the extra ``columns`` requested.
+
+    """
+    ale_indexes = {}
+    for i, field in enumerate(line.split('\t')):
+        ale_indexes[field.strip()] = i
+
+    # Scan Filename is usually more descriptive, but we can fall back on the
+    # always present 'Name' field if Scan Filename is missing.
+    if 'Scan Filename' in ale_indexes:
+        id_field = 'Scan Filename'
+    else:
+        id_field = 'Name'
+
+    needed = ['ASC_SAT', 'ASC_SOP', id_field] + list(columns)
+    missing = [field for field in needed if field not in ale_indexes]
+    if missing:
+        raise ValueError(
+            'ALE has no column named: {missing}'.format(
+                missing=', '.join('"{0}"'.format(i) for i in missing)
+            )
+        )
+
+    return [ale_indexes[field] for field in needed]
+
+# ==============================================================================
+
+
+def _build_correction_index(filepath):
+    """Scans an XML file for the byte offsets of each ColorCorrection"""
+    index = {}
+    with open(filepath, 'rb') as xml_file:
+        if not os.fstat(xml_file.fileno()).st_size:
+            # An empty file can't be mapped
+            return index
+        mapped = mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            position = 0
+            while True:
+                start = _CORRECTION_START.search(mapped, position)
+                if start is None:
+                    break
+                if start.group(1).endswith(b'/'):
+                    position = start.end()
+                else:
+                    end = _CORRECTION_END.search(mapped, start.end())
+                    if end is None:
+                        break
+                    position = end.end()
+
+                found = _XML_ID.search(start.group(1))
+                if found:
+                    cc_id = unescape(
+                        (found.group(1) or found.group(2) or b'').decode(
+                            'utf-8'
+                        ),
+                        {'&quot;': '"', '&apos;': "'"}
+                    )
+                    if cc_id not in index:
+                        index[cc_id] = [start.start(), position]
+        finally:
+            mapped.close()
+    return index
+
+# ==============================================================================
+
+
+def _build_flex_cc(metadata, title, filename, number, edl_path, sop, sat):
+    """Builds and returns a cc from the records of a single FLEx shot"""
+    metadata = [i for i in metadata if i != '']
+    if metadata:
+        cc_id = '_'.join(metadata)
+    else:
+        field = title if title else filename
+        cc_id = field + str(number).rjust(3, '0')
+
+    col_cor = correction.ColorCorrection(cc_id, edl_path)
+    if title:
+        col_cor.desc = title
+    if sop:
+        # If it finds the 701 line, it will have all three
+        col_cor.slope = sop['slope']
+        col_cor.offset = sop['offset']
+        col_cor.power = sop['power']
+    if sat:
+        col_cor.sat = sat
+
+    return col_cor
+
+# ==============================================================================
+
+
+def _correction_index(filepath, rebuild=False):
+    """Returns the ColorCorrection byte offset index of an XML file
+
+    The index is taken from memory, or the sidecar file beside filepath, if
+    either was built from the file as it is now. Otherwise, or if rebuild is
+    True, it's built again and saved to both.
+
+    """
+    stat = os.stat(filepath)
+    fingerprint = [stat.st_size, getattr(stat, 'st_mtime_ns', stat.st_mtime)]
+    sidecar = filepath + CORRECTION_INDEX_EXT
+
+    if not rebuild:
+        known = _CORRECTION_INDEXES.get(filepath)
+        if known is not None and known[0] == fingerprint:
+            return known[1]
+
+        try:
+            with open(sidecar, 'r') as sidecar_file:
+                saved = json.load(sidecar_file)
+        except (IOError, OSError, ValueError):
+            saved = None
+        if isinstance(saved, dict) and saved.get('fingerprint') == fingerprint:
+            _CORRECTION_INDEXES[filepath] = (fingerprint, saved['ids'])
+            return saved['ids']
+
+    index = _build_correction_index(filepath)
+
+    stat = os.stat(filepath)
+    if fingerprint != [
+            stat.st_size, getattr(stat, 'st_mtime_ns', stat.st_mtime)
+    ]:
+        # Changed while we scanned it, don't keep an index that may not
+        # match either version.
+        return index
+    _CORRECTION_INDEXES[filepath] = (fingerprint, index)
+
+    try:
+        handle, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(filepath), suffix='.tmp'
+        )
+    except (IOError, OSError):
+        return index
+    try:
+        with os.fdopen(handle, 'w') as temp_file:
+            json.dump({'fingerprint': fingerprint, 'ids': index}, temp_file)
+        # Renamed into place, so concurrent lookups never read half an index
+        getattr(os, 'replace', os.rename)(temp_path, sidecar)
+    except (IOError, OSError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    return index
+
+# ==============================================================================
+
+
+def _edl_lines(input_file):
+    """Yields each line of an EDL, given its filepath or an iterable of lines
+
+    Lines are pulled from the file or iterable one at a time, so the whole
+    EDL is never held in memory. Binary streams, like sockets or gzip files
+    opened in ``rb`` mode, are decoded as UTF-8.
+
+    """
+    if isinstance(input_file, _PATH_TYPES):
+        with open(_path_str(input_file), 'r') as edl:
+            for line in edl:
+                yield line
+        return
+
+    for line in input_file:
+        if not isinstance(line, str):
+            line = line.decode('UTF-8')
+        yield line
+
+# ==============================================================================
+
+
+def _edl_path(input_file):
+    """Returns the filepath of an EDL given as a path or an iterable of lines
+
+    Open files report the path they were opened with. Iterables without a
+    path on disk, such as ``sys.stdin`` or a list of lines, return None.
+
+    """
+    if isinstance(input_file, _PATH_TYPES):
+        return _path_str(input_file)
+    name = getattr(input_file, 'name', None)
+    if isinstance(name, _PATH_TYPES) and os.path.isfile(name):
+        return _path_str(name)
+    return None
+
+# ==============================================================================
+
+
+def _iter_ale(input_file, columns=()):  # pylint: disable=R0914
+    """Yields each ColorCorrection found in an ALE as it is parsed"""
+    # When we enter a section, we're store the section name
+    section = {
+        'column': False,
+        'data': False
+    }
+
+    edl_path = _edl_path(input_file)
+
+    for row, line in enumerate(_edl_lines(input_file), 1):
+        if line.startswith('Column'):
+            section['column'] = True
+            continue
+        elif line.startswith('Data'):
+            section['data'] = True
+            continue
+        elif section['column']:
+            indexes = _ale_columns(line, columns)
+            sat_index, sop_index, id_index = indexes[:3]
+            extra = list(zip(columns, indexes[3:]))
+            # Rows are only split as far as the last field we read, so the
+            # columns past it are never copied out of the line.
+            max_split = max(indexes) + 1
+            section['column'] = False
+        elif section['data']:
+            cdl_data = line.split('\t', max_split)
+
+            slope, offset, power = _split_sop(
+                cdl_data[sop_index], edl_path, row
+            )
+
+            cdl = correction.ColorCorrection(cdl_data[id_index], edl_path)
+
+            cdl.sat = cdl_data[sat_index]
+            cdl.slope = slope
+            cdl.offset = offset
+            cdl.power = power
+
+            for field, index in extra:
+                cdl.metadata[field] = cdl_data[index].strip()
+
+            yield cdl
+
+# ==============================================================================
+
+
+def _iter_cc(input_file):
+    """Yields the single ColorCorrection found in a .cc file"""
+    yield parse_cc(input_file)
+
+# ==============================================================================
+
+
+def _iter_ccc(input_file):
+    """Yields each ColorCorrection found in a .ccc file as it is parsed"""
+    elements = _iter_xml_children(input_file, 'ColorCorrection')
+
+    root = next(elements)
+    if root.tag != 'ColorCorrectionCollection':
+        # This is not a CCC file...
+        raise ValueError('CCC parsed but no ColorCorrectionCollection found')
+
+    found = False
+    for cc_node in elements:
+        found = True
+        yield parse_cc(cc_node)
+
+    if not found:
+        raise ValueError(
+            'ColorCorrectionCollections require at least one ColorCorrection '
+            'node, but no ColorCorrection nodes were found.'
+        )
+
+# ==============================================================================
+
+
+def _iter_cdl(input_file):
+    """Yields each ColorDecision found in a .cdl file as it is parsed"""
+    elements = _iter_xml_children(input_file, 'ColorDecision')
+
+    root = next(elements)
+    if root.tag != 'ColorDecisionList':
+        # This is not a CDL file...
+        raise ValueError('CDL parsed but no ColorDecisionList found')
+
+    found = False
+    for cd_node in elements:
+        found = True
+        color_decision = decision.ColorDecision()
+        color_decision.parse_xml_color_decision(cd_node)
+        yield color_decision
+
+    if not found:
+        raise ValueError(
+            'ColorDecisionLists require at least one ColorDecision node, but '
+            'no ColorDecision nodes were found.'
+        )
+
+# ==============================================================================
+
+
+def _iter_cdlb(input_file):
+    """Yields each ColorCorrection found in a .cdlb file as it is decoded"""
+    with cdlb.CdlbFile(input_file) as cdlb_file:
+        for cc in cdlb_file:
+            yield cc
+
+# ==============================================================================
+
+
+def _iter_flex(input_file):  # pylint: disable=R0912,R0914
+    """Yields each ColorCorrection found in a FLEx EDL as it is parsed"""
+    # Number of ColorCorrections yielded so far, used for fallback ids.
+    count = 0
+
+    edl_path = _edl_path(input_file)
+    filename = os.path.basename(edl_path).split('.')[0] if edl_path else ''
+
+    title = None
+    # Metadata will store, in order, the various scene, take, reel fields
+    # it finds.
+    metadata = []
+
+    sop = {}
+    sat = None
+
+    for row, line in enumerate(_edl_lines(input_file), 1):
+        if line.startswith('100'):
+            # This is the start of a take/shot
+            # We need to dump the previous records to a CDL
+            # Then clear the records.
+            # Note that the first data line will also hit this.
+            if sop or sat:
+                count += 1
+                yield _build_flex_cc(
+                    metadata, title, filename, count, edl_path, sop, sat
+                )
+
+            metadata = []
+            sop = {}
+            sat = None
+
+        elif line.startswith('010'):
+            # Title Line
+            # 10-79 Title
+            title = line[10:80].strip()
+        elif line.startswith('110'):
+            # Slate Information
+            # 10-17 Scene
+            # 24-31 Take ID
+            # 42-49 Camera Reel ID
+            metadata = [
+                line[10:18].strip(),  # Scene
+                line[24:32].strip(),  # Take
+                line[42:50].strip(),  # Reel
+            ]
+        elif line.startswith('701'):
+            # ASC SOP
+            # 701 ASC_SOP(# # #)(-# -# -#)(# # #)
+            slope, offset, power = _split_sop(line[3:], edl_path, row)
+            sop = {
+                'slope': slope,
+                'offset': offset,
+                'power': power
+            }
+        elif line.startswith('702'):
+            # ASC SAT
+            # 702 ASC_SAT ######
+            sat = line.split()[-1]
+
+    # We need to dump the last record to the cdl list
+    if sop or sat:
+        count += 1
+        yield _build_flex_cc(
+            metadata, title, filename, count, edl_path, sop, sat
+        )
+
+# ==============================================================================
+
+
+def _iter_rnh_cdl(input_file):
+    """Yields the single ColorCorrection found in a space separated .cdl"""
+    yield parse_rnh_cdl(input_file)
+
+# ==============================================================================
+
+
+def _iter_in_registry(iterator, registry):
+    """Advances iterator with registry active, yielding each result"""
+    while True:
+        with registry:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+# ==============================================================================
+
+
+def _iter_xml_children(input_file, child_tag):
+    """Incrementally parses an XML file, yielding elements as they complete
+
+    **Args:**
+        input_file : (str)
+            The filepath to the XML file.
+
+        child_tag : (str)
+            The tag of the direct children of the root we want to receive.
+
+    **Yields:**
+        (<ElementTree.Element>)
+            The root element is yielded first, as soon as its start tag has
+            been read, and will still be empty. After that, every direct child
+            of the root whose tag matches ``child_tag`` is yielded once its end
+            tag has been read.
+
+    **Raises:**
+        N/A
+
+    Namespaces are stripped from every tag as it arrives, which makes the
+    resulting elements identical to those returned by ``_remove_xmlns``.
+
+    Matching children are removed from the root after they've been yielded,
+    so callers must be finished with the element before asking for the next
+    one. All other children of the root (descriptions and the like) are left
+    attached to the root, to be parsed once iteration is complete.
+
+    """
+    depth = 0
+    root = None
+    with open(input_file, 'rb') as xml_file:
+        events = ElementTree.iterparse(xml_file, events=('start', 'end'))
+        for event, element in events:
+            if event == 'start':
+                # Tags arrive as '{namespace}Tag' when an xmlns is present.
+                element.tag = element.tag.split('}')[-1]
+                if root is None:
+                    root = element
+                    yield root
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 1 and element.tag == child_tag:
+                    yield element
+                    root.remove(element)
+
+# ==============================================================================
+
+
+def _parse_ccc_stream(input_file):
+    """Streaming implementation of parse_ccc"""
+    elements = _iter_xml_children(input_file, 'ColorCorrection')
+
+    root = next(elements)
+    if root.tag != 'ColorCorrectionCollection':
+        # This is not a CCC file...
+        raise ValueError('CCC parsed but no ColorCorrectionCollection found')
+
+    ccc = collection.ColorCollection()
+    ccc.set_to_ccc()
+    ccc.file_in = input_file
+
+    for cc_node in elements:
+        cdl = parse_cc(cc_node)
+        cdl.parent = ccc
+        ccc.color_corrections.append(cdl)
+
+    if not ccc.color_corrections:
+        raise ValueError(
+            'ColorCorrectionCollections require at least one ColorCorrection '
+            'node, but no ColorCorrection nodes were found.'
+        )
+
+    # By now the root only holds the collection level metadata.
+    ccc.parse_xml_descs(root)
+    ccc.parse_xml_viewing_desc(root)
+    ccc.parse_xml_input_desc(root)
+
+    return ccc
+
+# ==============================================================================
+
+
+def _parse_cdl_stream(input_file):
+    """Streaming implementation of parse_cdl"""
+    elements = _iter_xml_children(input_file, 'ColorDecision')
+
+    root = next(elements)
+    if root.tag != 'ColorDecisionList':
+        # This is not a CDL file...
+        raise ValueError('CDL parsed but no ColorDecisionList found')
+
+    cdl = collection.ColorCollection()
+    cdl.set_to_cdl()
+    cdl.file_in = input_file
+
+    for cd_node in elements:
+        color_decision = decision.ColorDecision()
+        color_decision.parse_xml_color_decision(cd_node)
+        color_decision.parent = cdl
+        cdl.color_decisions.append(color_decision)
+
+    if not cdl.color_decisions:
+        raise ValueError(
+            'ColorDecisionLists require at least one ColorDecision node, but '
+            'no ColorDecision nodes were found.'
+        )
+
+    # By now the root only holds the collection level metadata.
+    cdl.parse_xml_descs(root)
+    cdl.parse_xml_viewing_desc(root)
+    cdl.parse_xml_input_desc(root)
+
+    return cdl
+
+# ==============================================================================
+
+
 def _remove_xmlns(input_file):
     """Removes the xmlns attribute from XML files, then returns the element"""
     # We're going to open the file as a string and remove the xmlns, as
@@ -665,6 +1239,48 @@ def _remove_xmlns(input_file):
     return ElementTree.fromstring(xml_string)
 
 # ==============================================================================
+
+
+def _split_sop(sop, input_file, row):
+    """Returns the slope, offset and power strings of an ASC_SOP field
+
+    **Args:**
+        sop : (str)
+            The ASC_SOP field, like ``(1.4 1.9 1.7)(-0.1 -0.26 -0.2)(1 1 1)``,
+            optionally labeled with a leading ``ASC_SOP``.
+
+        input_file : (str|None)
+            The file the field was read from, for error messages. None if
+            the lines didn't come from a file on disk.
+
+        row : (int)
+            The line number the field was read from, for error messages.
+
+    **Returns:**
+        ((str, str, str), (str, str, str), (str, str, str))
+            The slope, offset and power values, still as strings so that they
+            convert to Decimals without any float rounding.
+
+    **Raises:**
+        ValueError:
+            If the field doesn't hold exactly three groups of three numbers.
+
+    """
+    found = ASC_SOP_PATTERN.match(sop)
+    if not found:
+        line = 'Line {row}'.format(row=row)
+        if input_file:
+            line += ' of "{file}"'.format(file=input_file)
+        raise ValueError(
+            '{line} has a malformed ASC_SOP field: "{sop}". ASC_SOP fields '
+            'should look like "(# # #)(# # #)(# # #)".'.format(
+                line=line, sop=sop.strip()
+            )
+        )
+    values = found.groups()
+    return values[0:3], values[3:6], values[6:9]
+
+# ==============================================================================
 # GLOBALS
 # ==============================================================================
 
@@ -673,16 +1289,107 @@ INPUT_FORMATS = {
     'ccc': parse_ccc,
     'cc': parse_cc,
     'cdl': parse_cdl,
+    'cdlb': parse_cdlb,
     'flex': parse_flex,
     'rcdl': parse_rnh_cdl,
 }
 
+ITER_FORMATS = {
+    'ale': _iter_ale,
+    'ccc': _iter_ccc,
+    'cc': _iter_cc,
+    'cdl': _iter_cdl,
+    'cdlb': _iter_cdlb,
+    'flex': _iter_flex,
+    'rcdl': _iter_rnh_cdl,
+}
+
+# Input files given as one of these are treated as filepaths, anything else
+# as an iterable of lines.
+if sys.version_info[0] >= 3:  # pragma: no cover
+    _PATH_TYPES = (str, bytes, getattr(os, 'PathLike', str))
+    _path_str = os.fsdecode  # pylint: disable=C0103
+else:  # pragma: no cover
+    _PATH_TYPES = (basestring, )  # pylint: disable=E0602
+    _path_str = lambda x: x  # pylint: disable=C0103
+
+CORRECTION_INDEX_EXT = '.ccindex'
+
+# Byte offset indexes already loaded by find_correction, by filepath. Each is
+# stored with the size and mtime of the file it was built from.
+_CORRECTION_INDEXES = {}
+
+# The start tag of a ColorCorrection (but not a ColorCorrectionRef), with its
+# attributes as the first group. Quoted attribute values may contain '>'.
+_CORRECTION_START = re.compile(
+    br'<ColorCorrection((?:\s(?:[^>"\']|"[^"]*"|\'[^\']*\')*)?)>'
+)
+_CORRECTION_END = re.compile(br'</ColorCorrection\s*>')
+_XML_ID = re.compile(br'\sid\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+# A single ASC_SOP value, such as ``-0.26``, ``1`` or ``1.13e-17``.
+_SOP_NUMBER = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+_SOP_GROUP = r'\(\s*{0}\s+{0}\s+{0}\s*\)'.format(_SOP_NUMBER)
+
+# Matches an entire ASC_SOP field, with or without the ``ASC_SOP`` label that
+# FLEx puts in front of it:
+# (1.4 1.9 1.7)(-0.1 -0.26 -0.20)(0.87 1.0 1.32)
+# The nine groups are the slope, offset and power values, in order.
+ASC_SOP_PATTERN = re.compile(
+    r'\s*(?:ASC_SOP)?\s*{0}\s*{0}\s*{0}\s*$'.format(_SOP_GROUP)
+)
+
 # ==============================================================================
 # PARSE FILE
 # ==============================================================================
 
 
-def parse_file(filepath, filetype=None):
+def iter_file(filepath, filetype=None, registry=None):
+    """Determines & uses the correct iterator to lazily parse a CDL file
+
+    Args:
+        filepath : (str|iter)
+            The filepath to the file. Must exist. ``ale`` and ``flex`` input
+            can also be any iterable of lines, as long as ``filetype`` is
+            given.
+
+        filetype=None : (str)
+            A file extension corresponding to the CDL type to convert from.
+            If not provided, we'll derive it from the filepath.
+
+            Should not include a '.'
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
+    Raises:
+        N/A
+
+    Returns:
+        (generator)
+            A generator that yields each :class:`ColorCorrection` (or
+            :class:`ColorDecision` for ``cdl`` files) as soon as it has been
+            parsed. Single correction formats yield exactly once.
+
+    Unlike ``parse_file``, no :class:`ColorCollection` is built. Collection
+    level metadata like descriptions is not available, but downstream work
+    can start before the file is fully read, and callers that stop iterating
+    early never pay to build the remaining corrections.
+
+    """
+    if not filetype:
+        filetype = os.path.basename(filepath).split('.')[-1].lower()
+
+    if registry is None:
+        return ITER_FORMATS[filetype](filepath)
+    return _iter_in_registry(ITER_FORMATS[filetype](filepath), registry)
+
+# ==============================================================================
+
+
+@_accepts_registry
+def parse_file(filepath, filetype=None, cache=None):
     """Determines & uses the correct parser to use on a CDL file
 
     Args:
@@ -695,6 +1402,15 @@ def parse_file(filepath, filetype=None):
 
             Should not include a '.'
 
+        cache=None : ( :class:`ParseCache` )
+            If given, the parse result is loaded from this cache when the
+            file hasn't changed since it was last parsed, and stored in it
+            when it has.
+
+        registry=None : ( :class:`Registry` )
+            If given, every node built while parsing registers with this
+            registry instead of the active one.
+
     Raises:
         N/A
 
@@ -706,6 +1422,9 @@ def parse_file(filepath, filetype=None):
             :class:`ColorCorrection` or :class:`ColorDecision`
 
     """
+    if cache is not None:
+        return cache.load(filepath, filetype)
+
     if not filetype:
         filetype = os.path.basename(filepath).split('.')[-1].lower()
 
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""
+
+CDL Convert Registry
+====================
+
+Holds the member dictionaries that ColorCorrection, ColorCorrectionRef,
+ColorDecision, MediaRef and ColorCollection register themselves with.
+
+## Public Classes
+
+    Registry
+        An isolated namespace of members. Every node built while a registry
+        is active, either by using it as a context manager or by passing it
+        as the ``registry`` argument, registers with it instead of with the
+        class level ``members`` attributes.
+
+## Public Functions
+
+    current_registry()
+        Returns the registry new nodes register with on this thread.
+
+## Globals
+
+    DEFAULT_REGISTRY
+        The registry used when no other registry is active. It is backed by
+        the class level ``members`` attributes, so existing code that reads
+        or resets ``ColorCorrection.members`` keeps working.
+
+## License
+
+The MIT License (MIT)
+
+cdl_convert
+Copyright (c) 2015 Sean Wallitsch
+http://github.com/shidarin/cdl_convert/
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Standard Imports
+
+import threading
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+# Each thread keeps its own stack of active registries, so conversions
+# running in a thread pool never see each other's registries.
+_LOCAL = threading.local()
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+__all__ = [
+    'current_registry',
+    'DEFAULT_REGISTRY',
+    'Registry',
+]
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _active_stack():
+    """Returns this thread's stack of active registries"""
+    try:
+        return _LOCAL.stack
+    except AttributeError:
+        _LOCAL.stack = []
+        return _LOCAL.stack
+
+# ==============================================================================
+# CLASSES
+# ==============================================================================
+
+
+class Registry(object):
+    """An isolated namespace of ColorCorrection ids and other node members
+
+    Description
+    ~~~~~~~~~~~
+
+    Normally every node registers with the class level ``members``
+    attribute of its class, which is shared by the entire process. A
+    Registry holds its own set of those members, so that two conversions
+    using two registries can reuse the same ids without colliding, and can
+    safely run at the same time on different threads.
+
+    A registry becomes active on the current thread when used as a context
+    manager. Any node built while it is active registers with it, and keeps
+    using it for id checks and reference resolution afterwards:
+
+        with Registry() as registry:
+            ccc = parse_ccc('reel1.ccc')
+
+    Parsers also accept a ``registry`` argument which does the same thing,
+    and every registered node class accepts one on creation.
+
+    **Public Methods:**
+
+        id_counts()
+            Returns the dictionary of the next free duplicate suffix for each
+            id of the given class.
+
+        members()
+            Returns the member dictionary (or list, for ColorCollection) for
+            the given class.
+
+        reset()
+            Empties all members held by the registry.
+
+        set_members()
+            Replaces the members held for the given class.
+
+    """
+
+    def __init__(self):
+        self._members = {}
+        self._id_counts = {}
+
+    def __enter__(self):
+        _active_stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active_stack().pop()
+        return False
+
+    # Public Methods ==========================================================
+
+    def id_counts(self, cls):
+        """Returns the next free duplicate id suffix for each id of cls"""
+        try:
+            return self._id_counts[cls]
+        except KeyError:
+            self._id_counts[cls] = {}
+            return self._id_counts[cls]
+
+    # =========================================================================
+
+    def members(self, cls):
+        """Returns the members registered for cls
+
+        **Args:**
+            cls : (class)
+                One of the registered node classes.
+
+        **Returns:**
+            (dict|list)
+                The same type as the class level ``members`` attribute of cls,
+                but only holding nodes that registered with this registry.
+
+        **Raises:**
+            None
+
+        """
+        try:
+            return self._members[cls]
+        except KeyError:
+            self._members[cls] = type(cls.members)()
+            return self._members[cls]
+
+    # =========================================================================
+
+    def reset(self):
+        """Empties every member dictionary held by this registry"""
+        self._members = {}
+        self._id_counts = {}
+
+    # =========================================================================
+
+    def set_members(self, cls, members):
+        """Replaces the members registered for cls"""
+        self._members[cls] = members
+
+# ==============================================================================
+
+
+class _ClassRegistry(Registry):
+    """The default registry, stored on the class level members attributes"""
+
+    def id_counts(self, cls):
+        """Returns the next free duplicate id suffix for each id of cls"""
+        return cls._id_counts  # pylint: disable=W0212
+
+    # =========================================================================
+
+    def members(self, cls):
+        """Returns the class level members attribute of cls"""
+        return cls.members
+
+    # =========================================================================
+
+    def reset(self):
+        """Resets every class level members attribute"""
+        from . import reset_all
+        reset_all()
+
+    # =========================================================================
+
+    def set_members(self, cls, members):
+        """Replaces the class level members attribute of cls"""
+        cls.members = members
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+DEFAULT_REGISTRY = _ClassRegistry()
+
+# ==============================================================================
+# PUBLIC FUNCTIONS
+# ==============================================================================
+
+
+def current_registry():
+    """Returns the registry new nodes register with on this thread
+
+    **Returns:**
+        (:class:`Registry`)
+            The innermost registry entered as a context manager on this
+            thread, or ``DEFAULT_REGISTRY`` if there isn't one.
+
+    """
+    stack = _active_stack()
+    return stack[-1] if stack else DEFAULT_REGISTRY
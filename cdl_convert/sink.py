@@ -0,0 +1,504 @@
+#!/usr/bin/env python
+"""
+
+CDL Convert Sink
+================
+
+Destinations for written files other than the paths they were written to,
+such as a single archive holding every correction of a collection.
+
+While a sink is active, as the context manager of a ``with`` block, every
+writer in ``write`` hands its output to the sink instead of opening
+``file_out`` . The sink decides where the output really goes, and keeps an
+index of which ColorCorrection ids went into which member.
+
+## Public Classes
+
+    OutputSink
+        Base class for sinks, which become active as context managers.
+
+    DirectorySink
+        Writes each output to its own ``file_out`` , as if no sink were
+        active, but also writes an index of them.
+
+    MemorySink
+        Keeps every output in memory, without writing anything.
+
+    TarSink
+        Writes every output into one tar archive, optionally gzipped.
+
+    ZipSink
+        Writes every output into one zip archive.
+
+## Public Functions
+
+    active_sink()
+        Returns the sink writers are currently handing their output to.
+
+## License
+
+The MIT License (MIT)
+
+cdl_convert
+Copyright (c) 2015 Sean Wallitsch
+http://github.com/shidarin/cdl_convert/
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# ==============================================================================
+# IMPORTS
+# ==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Standard Imports
+
+import abc
+from contextlib import contextmanager
+from io import BytesIO
+import json
+import os
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+
+# ==============================================================================
+# GLOBALS
+# ==============================================================================
+
+# Name of the index member within archives
+INDEX_NAME = 'index.json'
+
+# Each thread keeps its own stack of active sinks, innermost last. Writer
+# pools are handed the sink active where they were started explicitly.
+_LOCAL = threading.local()
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+__all__ = [
+    'active_sink',
+    'DirectorySink',
+    'MemorySink',
+    'OutputSink',
+    'TarSink',
+    'ZipSink',
+]
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _active_stack():
+    """Returns this thread's stack of active sinks"""
+    try:
+        return _LOCAL.stack
+    except AttributeError:
+        _LOCAL.stack = []
+        return _LOCAL.stack
+
+# ==============================================================================
+
+
+@contextmanager
+def _sink_active(sink):
+    """Makes a sink opened on another thread active on this one
+
+    Unlike entering the sink, leaving the block doesn't close it, which is
+    left to the thread that opened it. A sink of None leaves the active sink
+    as it is.
+
+    """
+    if sink is None:
+        yield
+        return
+    stack = _active_stack()
+    stack.append(sink)
+    try:
+        yield
+    finally:
+        stack.remove(sink)
+
+# ==============================================================================
+# CLASSES
+# ==============================================================================
+
+
+# Python 2 and 3 spell metaclasses differently, but both can call one.
+class OutputSink(abc.ABCMeta('_ABC', (object, ), {})):
+    """Base class for everywhere written output can be handed to
+
+    Description
+    ~~~~~~~~~~~
+
+    A sink becomes active when used as a context manager, and is closed when
+    the ``with`` block exits. If the block raises, the sink is abandoned
+    instead, which for archives written with ``config.ATOMIC_WRITES`` means
+    no archive is left behind at all.
+
+    Outputs are added by the path they would have been written to. Each is
+    given a member name, its path relative to ``directory`` with ``/``
+    separators, or just its filename if it's outside ``directory`` .
+
+    Sinks are safe to add to from many threads at once. A sink is only
+    active on the thread that entered it, but ``write.write_many`` makes it
+    active on its writer threads too.
+
+    Subclasses must implement ``_store`` .
+
+    **Attributes:**
+
+        directory : (str)
+            Absolute path that member names are relative to.
+
+        index : {str: [str]}
+            Each ColorCorrection id added, mapped to the members holding it,
+            in the order they were added.
+
+    **Public Methods:**
+
+        add()
+            Adds the output for a path, holding the given ids.
+
+        close()
+            Finishes writing everything added, including the index.
+
+        member()
+            Returns the member name a path is added as.
+
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.index = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        _active_stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active_stack().remove(self)
+        if exc_type is None:
+            self.close()
+        else:
+            self._abandon(exc_type, exc_value, traceback)
+        return False
+
+    # Private Methods =========================================================
+
+    def _abandon(self, exc_type, exc_value, traceback):
+        """Stops writing after an error, by default closing as normal"""
+        self.close()
+
+    def _index_json(self):
+        """Returns the index as UTF-8 encoded JSON"""
+        return json.dumps(
+            self.index, indent=4, separators=(',', ': '), sort_keys=True
+        ).encode('utf-8')
+
+    @abc.abstractmethod
+    def _store(self, member, filepath, data, ids):
+        """Stores data for a member, which was going to be written to path"""
+
+    # Public Methods ==========================================================
+
+    def add(self, filepath, data, ids=()):
+        """Adds the output for filepath, holding the given ids
+
+        **Args:**
+            filepath : (str)
+                The path the output would have been written to.
+
+            data : (bytes)
+                The whole output.
+
+            ids=() : [str]
+                Ids of every ColorCorrection in the output.
+
+        **Returns:**
+            None
+
+        **Raises:**
+            ValueError:
+                If the sink has been closed.
+
+        """
+        if self._closed:
+            raise ValueError(
+                "Can't add {path} to a closed sink".format(path=filepath)
+            )
+        member = self.member(filepath)
+        self._store(member, filepath, data, ids)
+        with self._lock:
+            for cc_id in ids:
+                members = self.index.setdefault(cc_id, [])
+                if member not in members:
+                    members.append(member)
+
+    # =========================================================================
+
+    def close(self):
+        """Finishes writing everything added, including the index"""
+        self._closed = True
+
+    # =========================================================================
+
+    def member(self, filepath):
+        """Returns the member name filepath is added as"""
+        try:
+            member = os.path.relpath(
+                os.path.abspath(filepath), self.directory
+            )
+        except ValueError:
+            # On Windows, filepath is on another drive.
+            member = os.pardir
+        if member == os.pardir or member.startswith(os.pardir + os.sep):
+            member = os.path.basename(filepath)
+        return member.replace(os.sep, '/')
+
+# ==============================================================================
+
+
+class DirectorySink(OutputSink):
+    """Writes each output to its own path, and an index of them
+
+    Description
+    ~~~~~~~~~~~
+
+    Outputs are written just as they would be with no sink active, honoring
+    ``config.SKIP_UNCHANGED`` and ``config.ATOMIC_WRITES`` . When closed,
+    the index is written to ``index_path`` , if one was given.
+
+    **Attributes:**
+
+        index_path : (str|None)
+            Absolute path the index is written to.
+
+    """
+
+    def __init__(self, directory, index_path=None):
+        super(DirectorySink, self).__init__(directory)
+        self.index_path = index_path
+        if index_path:
+            self.index_path = os.path.abspath(index_path)
+
+    # Private Methods =========================================================
+
+    def _store(self, member, filepath, data, ids):
+        """Writes data to filepath"""
+        from .write import _write_output
+        _write_output(filepath, data)
+
+    # Public Methods ==========================================================
+
+    def close(self):
+        """Writes the index, if there's anywhere to write it"""
+        if self._closed:
+            return
+        super(DirectorySink, self).close()
+        if self.index_path:
+            from .write import _write_output
+            _write_output(self.index_path, self._index_json())
+
+# ==============================================================================
+
+
+class MemorySink(OutputSink):
+    """Keeps every output in memory rather than writing it
+
+    **Attributes:**
+
+        outputs : [(str, bytes, [str])]
+            The path, data and correction ids of each output, in the order
+            added.
+
+    """
+
+    def __init__(self, directory=os.curdir):
+        super(MemorySink, self).__init__(directory)
+        self.outputs = []
+
+    # Private Methods =========================================================
+
+    def _store(self, member, filepath, data, ids):
+        """Keeps the path, data and ids"""
+        with self._lock:
+            self.outputs.append((filepath, data, list(ids)))
+
+# ==============================================================================
+
+
+class _ArchiveSink(OutputSink):
+    """Base class for sinks writing every output into a single archive
+
+    The archive itself is written through ``write._open_dest`` , so it's
+    replaced atomically, and synced, just like any other output. Nothing is
+    opened until the sink is entered, or the first output is added to it, so
+    a sink that's never used leaves nothing behind.
+
+    """
+
+    def __init__(self, filepath, directory=None):
+        self.filepath = os.path.abspath(filepath)
+        if directory is None:
+            directory = os.path.dirname(self.filepath)
+        super(_ArchiveSink, self).__init__(directory)
+
+        self._dest = None
+        self._archive = None
+
+    def __enter__(self):
+        with self._lock:
+            self._open()
+        return super(_ArchiveSink, self).__enter__()
+
+    # Private Methods =========================================================
+
+    def _abandon(self, exc_type, exc_value, traceback):
+        """Closes the archive, and lets its destination clean up"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._archive is None:
+            return
+        with self._lock:
+            self._archive.close()
+        self._dest.__exit__(exc_type, exc_value, traceback)
+
+    def _open(self):
+        """Opens the destination and the archive, if they aren't already
+
+        Must be called with ``_lock`` held.
+
+        """
+        if self._archive is not None:
+            return
+        from .write import _open_dest
+
+        dest = _open_dest(self.filepath)
+        archive_file = dest.__enter__()
+        try:
+            self._archive = self._open_archive(archive_file)
+        except BaseException:
+            dest.__exit__(*sys.exc_info())
+            raise
+        self._dest = dest
+
+    @abc.abstractmethod
+    def _open_archive(self, archive_file):
+        """Returns the archive object writing to archive_file"""
+
+    @abc.abstractmethod
+    def _write_member(self, member, data):
+        """Writes data to the archive as member"""
+
+    def _store(self, member, filepath, data, ids):
+        """Writes data into the archive"""
+        with self._lock:
+            self._open()
+            self._write_member(member, data)
+
+    # Public Methods ==========================================================
+
+    def close(self):
+        """Writes the index into the archive, then finishes the archive
+
+        A sink that was never entered or added to has nothing to finish.
+
+        """
+        if self._closed:
+            return
+        super(_ArchiveSink, self).close()
+        if self._archive is None:
+            return
+        with self._lock:
+            self._write_member(INDEX_NAME, self._index_json())
+            self._archive.close()
+        self._dest.__exit__(None, None, None)
+
+# ==============================================================================
+
+
+class TarSink(_ArchiveSink):
+    """Writes every output into a tar archive, gzipped if named .gz or .tgz
+
+    **Attributes:**
+
+        filepath : (str)
+            Absolute path of the archive.
+
+    """
+
+    # Private Methods =========================================================
+
+    def _open_archive(self, archive_file):
+        """Opens a tar archive, compressed if filepath asks for it"""
+        mode = 'w'
+        if self.filepath.lower().endswith(('.gz', '.tgz')):
+            mode = 'w:gz'
+        return tarfile.open(fileobj=archive_file, mode=mode)
+
+    def _write_member(self, member, data):
+        """Adds a regular file member holding data"""
+        info = tarfile.TarInfo(member)
+        info.size = len(data)
+        info.mtime = time.time()
+        info.mode = 0o644
+        self._archive.addfile(info, BytesIO(data))
+
+# ==============================================================================
+
+
+class ZipSink(_ArchiveSink):
+    """Writes every output into a deflate compressed zip archive
+
+    **Attributes:**
+
+        filepath : (str)
+            Absolute path of the archive.
+
+    """
+
+    # Private Methods =========================================================
+
+    def _open_archive(self, archive_file):
+        """Opens a zip archive"""
+        return zipfile.ZipFile(archive_file, 'w', zipfile.ZIP_DEFLATED)
+
+    def _write_member(self, member, data):
+        """Adds a member holding data"""
+        self._archive.writestr(member, data)
+
+# ==============================================================================
+# PUBLIC FUNCTIONS
+# ==============================================================================
+
+
+def active_sink():
+    """Returns the innermost sink active on this thread, or None"""
+    stack = _active_stack()
+    return stack[-1] if stack else None
@@ -15,6 +15,10 @@ Contains basic utility functions for cdl_convert.
     to_decimal()
         Converts floats, ints, and strings to Decimal() in a predictable way.
 
+    to_float()
+        Converts Decimals, ints, and strings to float, for use when
+        ``config.FAST_MATH`` is enabled.
+
 ## License
 
 The MIT License (MIT)
@@ -57,6 +61,8 @@ from decimal import Decimal, InvalidOperation
 # GLOBALS
 # ==============================================================================
 
+_INF = float('inf')
+
 # Python 3 Compatibility
 
 try:
@@ -70,7 +76,8 @@ except NameError:  # pragma: no cover
 
 __all__ = [
     'sanity_check',
-    'to_decimal'
+    'to_decimal',
+    'to_float',
 ]
 
 # ==============================================================================
@@ -173,7 +180,8 @@ def to_decimal(value, name='Value'):
     elif type(value) is Decimal:
         return value
     elif type(value) is str:
-        if '.' not in value:
+        # Exponent notation such as '3e-2' can't take a trailing '.0'
+        if '.' not in value and 'e' not in value.lower():
             value += '.0'
 
         try:
@@ -197,3 +205,59 @@ def to_decimal(value, name='Value'):
         )
 
     return Decimal(value)
+
+# ==============================================================================
+
+
+def to_float(value, name='Value'):
+    """Converts an incoming value to a native float
+
+    **Args:**
+        value : (Decimal|str|float|int)
+            Any numeric value to be checked.
+
+        name='Value' : (str)
+            The type of value being checked: slope, offset, etc.
+
+    **Returns:**
+        (float)
+            If value passes all tests, returns value as float.
+
+    **Raises:**
+        TypeError:
+            If value given is not a finite number.
+
+        ValueError:
+            If given a value that isn't an allowed type.
+
+    """
+    value_type = type(value)
+    if value_type is float:
+        result = value
+    elif value_type is str or value_type is int or value_type is Decimal:
+        try:
+            result = float(value)
+        except ValueError:
+            result = None
+    else:
+        raise ValueError(
+            '{name} cannot be set directly with objects of type: "{type}". '
+            'Value given: "{value}".'.format(
+                name=name.title(),
+                type=type(value),
+                value=value,
+            )
+        )
+
+    # float() happily takes 'nan' and 'inf', which can't be written to a CDL.
+    # NaN fails every comparison, so this catches both.
+    if result is None or not -_INF < result < _INF:
+        raise TypeError(
+            'Error setting {name} with value: "{value}". '
+            'Value is not a number.'.format(
+                name=name,
+                value=value
+            )
+        )
+
+    return result
@@ -8,6 +8,14 @@ Functions for writing different types of cdls.
 
 ## Public Functions
 
+    batch_writes()
+        Context manager which, with ``config.FSYNC`` , syncs each directory
+        written to once when it exits rather than syncing after every file.
+
+    write_3dl()
+        Bakes a given ColorCorrection to a 3D LUT in the Autodesk .3dl format.
+        ``file_out`` should already be set on the ColorCorrection.
+
     write_cc()
         Writes a given ColorCorrection to disk. ``file_out`` should already be
         set on the ColorCorrection.
@@ -20,10 +28,27 @@ Functions for writing different types of cdls.
         Writes a given ColorCollection to disk. ``file_out`` should already be
         set on the ColorCollection.
 
+    write_cdlb()
+        Writes a given ColorCollection to disk in the binary CDLB format.
+        ``file_out`` should already be set on the ColorCollection.
+
+    write_cube()
+        Bakes a given ColorCorrection to a 3D LUT in the .cube format.
+        ``file_out`` should already be set on the ColorCorrection.
+
+    write_many()
+        Writes many ColorCorrections to one output format at once, using a
+        bounded pool of threads or processes.
+
     write_rnh_cdl()
         Writes a given ColorCorrection to disk. ``file_out`` should already be
         set on the ColorCorrection.
 
+    write_spi3d()
+        Bakes a given ColorCorrection to a 3D LUT in the Sony Pictures
+        Imageworks .spi3d format. ``file_out`` should already be set on the
+        ColorCorrection.
+
 ## License
 
 The MIT License (MIT)
@@ -60,15 +85,54 @@ from __future__ import absolute_import, print_function
 
 # Standard Imports
 
+from collections import deque
+from contextlib import contextmanager
+import errno
+from io import BytesIO
+import multiprocessing
+import os
 import sys
+import threading
+import uuid
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+except ImportError:  # pragma: no cover
+    # Python 2 needs the 'futures' backport for parallel writes.
+    ProcessPoolExecutor = None  # pylint: disable=C0103
+    ThreadPoolExecutor = None  # pylint: disable=C0103
+
+# Third Party Imports
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # pylint: disable=C0103
 
 # Local Imports
+from . import cdlb
+from .cache import _dump_cc, _load_cc
 from .collection import ColorCollection
+from . import config
+from .evaluate import bake_lut
+from .registry import Registry
+from .sink import (
+    DirectorySink, MemorySink, TarSink, ZipSink, _sink_active, active_sink
+)
 
 # ==============================================================================
 # GLOBALS
 # ==============================================================================
 
+# Corrections sent to a writer process at a time
+PROCESS_CHUNK = 64
+
+# Each thread keeps its own stack of open batch_writes, innermost last, each
+# the set of directories written to within it. write_many hands its writer
+# threads the batch open where it was called, so the sets need a lock.
+_LOCAL = threading.local()
+_BATCH_LOCK = threading.Lock()
+
 if sys.version_info[0] >= 3:  # pragma: no cover
     enc = lambda x: bytes(x, 'UTF-8')  # pylint: disable=C0103
 else:  # pragma: no cover
@@ -79,10 +143,16 @@ else:  # pragma: no cover
 # ==============================================================================
 
 __all__ = [
+    'batch_writes',
+    'write_3dl',
     'write_cc',
     'write_ccc',
     'write_cdl',
+    'write_cdlb',
+    'write_cube',
+    'write_many',
     'write_rnh_cdl',
+    'write_spi3d',
 ]
 
 # ==============================================================================
@@ -90,9 +160,269 @@ __all__ = [
 # ==============================================================================
 
 
+@contextmanager
+def _batch_open(batch):
+    """Adds writes on this thread to a batch, without taking ownership of it
+
+    Leaving the block doesn't sync anything, that's left to whoever opened
+    the batch. A batch of None leaves the open batch as it is.
+
+    """
+    if batch is None:
+        yield
+        return
+    stack = _batch_stack()
+    stack.append(batch)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+# ==============================================================================
+
+
+def _batch_stack():
+    """Returns this thread's stack of open batches"""
+    try:
+        return _LOCAL.batches
+    except AttributeError:
+        _LOCAL.batches = []
+        return _LOCAL.batches
+
+# ==============================================================================
+
+
+def _current_batch():
+    """Returns the set of directories of the innermost batch, or None"""
+    stack = _batch_stack()
+    return stack[-1] if stack else None
+
+# ==============================================================================
+
+
+def _format_rows(columns):
+    """Formats columns of non-negative numbers into lines of text
+
+    **Args:**
+        columns : [(numpy.ndarray, int)]
+            Each column of the table as a 1D array of values, paired with the
+            number of decimal places to write it with. All columns must be
+            the same length.
+
+    **Returns:**
+        (bytes)
+            One line per row, with the columns separated by single spaces.
+            The same text as formatting each value with ``'%.{decimals}f'``
+            for the 6 or fewer decimals LUTs use, but built as whole-array
+            operations rather than value by value.
+
+    LUTs hold hundreds of thousands of values, and formatting them one at a
+    time takes far longer than evaluating the CDL math for them.
+
+    """
+    rows = len(columns[0][0])
+    scaled_columns = []
+    for values, decimals in columns:
+        scaled = numpy.rint(values * 10 ** decimals).astype(numpy.int64)
+        whole = len(str(int(scaled.max()) // 10 ** decimals)) if rows else 1
+        if whole + decimals < 10:
+            # Integer math is much faster on 32 bits.
+            scaled = scaled.astype(numpy.int32)
+        scaled_columns.append((scaled, whole, decimals))
+
+    width = sum(
+        whole + (decimals + 1 if decimals else 0) + 1
+        for scaled, whole, decimals in scaled_columns
+    )
+    # Each character position is filled for every row at once, so the
+    # table is built transposed, keeping those writes contiguous.
+    chars = numpy.empty((width, rows), dtype=numpy.uint8)
+    keep = None
+    position = 0
+    for scaled, whole, decimals in scaled_columns:
+        digit = numpy.empty_like(scaled)
+        for place in range(whole + decimals - 1, -1, -1):
+            if place == decimals - 1:
+                chars[position] = ord('.')
+                position += 1
+            numpy.floor_divide(scaled, 10 ** place, out=digit)
+            numpy.remainder(digit, 10, out=digit)
+            numpy.add(digit, ord('0'), out=chars[position], casting='unsafe')
+            position += 1
+        if whole > 1:
+            # Leading zeros of the whole number part are dropped, keeping
+            # at least the ones digit.
+            if keep is None:
+                keep = numpy.ones((width, rows), dtype=bool)
+            start = position - whole - (decimals + 1 if decimals else 0)
+            keep[start:start + whole - 1] = numpy.cumsum(
+                chars[start:start + whole - 1] != ord('0'), axis=0
+            ) > 0
+        chars[position] = ord(' ')
+        position += 1
+    chars[-1] = ord('\n')
+
+    if keep is None:
+        return chars.T.tobytes()
+    return chars.T[keep.T].tobytes()
+
+# ==============================================================================
+
+
+def _fsync_directory(directory):
+    """Flushes a directory's entries, such as a rename into it, to disk"""
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Windows can't open directories, and doesn't need them synced.
+        return
+    try:
+        os.fsync(handle)
+    finally:
+        os.close(handle)
+
+# ==============================================================================
+
+
+def _make_temp(filepath):
+    """Creates a temp file to write filepath through, beside it
+
+    **Args:**
+        filepath : (str)
+            The file the temp file will be renamed over.
+
+    **Returns:**
+        (int, str)
+            The open OS level handle of the temp file, and its path.
+
+    **Raises:**
+        Anything raised creating the file, other than a name already taken.
+
+    Unlike ``tempfile.mkstemp`` , which makes files only its owner can read,
+    the temp file is created with the mode a plain ``open`` would give
+    filepath, the umask applied by the OS.
+
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    prefix = os.path.join(
+        os.path.dirname(os.path.abspath(filepath)),
+        '.' + os.path.basename(filepath) + '.'
+    )
+    while True:
+        temp_path = prefix + uuid.uuid4().hex[:12] + '.tmp'
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except OSError as err:
+            if err.errno != errno.EEXIST:
+                raise
+
+# ==============================================================================
+
+
+@contextmanager
+def _open_dest(filepath):
+    """Opens filepath for writing bytes, atomically with ATOMIC_WRITES
+
+    **Args:**
+        filepath : (str)
+            The file to write.
+
+    **Yields:**
+        (file)
+            A binary file to write the output to. Normally this is filepath
+            itself. With ``config.ATOMIC_WRITES`` it's a temp file in the same
+            directory, which is renamed over filepath once it's closed, or
+            removed if writing it fails.
+
+    **Raises:**
+        Anything raised writing filepath.
+
+    """
+    if not config.ATOMIC_WRITES:
+        with open(filepath, 'wb') as dest_file:
+            yield dest_file
+        return
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    batch = _current_batch()
+
+    handle, temp_path = _make_temp(filepath)
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            yield temp_file
+            # The data has to be on disk before the rename is, or a crash
+            # can leave an empty file in place of the old output.
+            if config.FSYNC:
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+        try:
+            os.chmod(temp_path, os.stat(filepath).st_mode & 0o7777)
+        except OSError:
+            # Nothing to replace, and the temp file already has the mode a
+            # new file would.
+            pass
+        # os.rename replaces atomically on POSIX, but not on Windows
+        getattr(os, 'replace', os.rename)(temp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if config.FSYNC:
+        if batch is None:
+            _fsync_directory(directory)
+        else:
+            with _BATCH_LOCK:
+                batch.add(directory)
+
+# ==============================================================================
+
+
+@contextmanager
+def _open_out(node):
+    """Opens the file_out of node to write bytes to, or its active sink
+
+    **Args:**
+        node : (:class:`ColorCorrection` | :class:`ColorCollection`)
+            The node being written. It's ``file_out`` should already be set.
+
+    **Yields:**
+        (file)
+            A binary file-like object to write the output to. Normally this is
+            ``file_out`` , opened by ``_open_dest`` . If a sink is active, the
+            output is gathered in memory and handed to the sink, along with
+            the ids of the corrections it holds. With
+            ``config.SKIP_UNCHANGED`` , it's gathered in memory and only
+            written to ``file_out`` if it differs from what is already there,
+            so an unchanged file keeps its modification time.
+
+    **Raises:**
+        Anything raised writing the output.
+
+    """
+    sink = active_sink()
+    if sink is None and not config.SKIP_UNCHANGED:
+        with _open_dest(node.file_out) as out_file:
+            yield out_file
+        return
+
+    out_file = BytesIO()
+    yield out_file
+    if sink is None:
+        _write_output(node.file_out, out_file.getvalue())
+    elif isinstance(node, ColorCollection):
+        sink.add(node.file_out, out_file.getvalue(), node.id_list)
+    else:
+        sink.add(node.file_out, out_file.getvalue(), [node.id])
+
+# ==============================================================================
+
+
 def _temp_container(cdl):
     """Builds a temporary collection container for a single cdl file."""
-    temp_cdl = ColorCollection()
+    temp_cdl = ColorCollection(registry=cdl.registry)
     orig_parent = cdl.parent
     temp_cdl.append_child(cdl)
     cdl.parent = orig_parent  # Restore original parentage away from temp cdl
@@ -100,14 +430,165 @@ def _temp_container(cdl):
     return temp_cdl
 
 # ==============================================================================
+
+
+def _unchanged(filepath, output):
+    """Returns True if filepath already holds exactly the bytes of output"""
+    try:
+        # Most changed files change size, and are caught without reading.
+        if os.path.getsize(filepath) != len(output):
+            return False
+        with open(filepath, 'rb') as existing_file:
+            return existing_file.read() == output
+    except (IOError, OSError):
+        # Missing or unreadable, either way it needs writing.
+        return False
+
+# ==============================================================================
+
+
+def _write_in(writer, cdl, sink, batch):
+    """Writes a correction on a worker thread, within the caller's sink & batch
+
+    A thread doesn't see the sink or batch active on the thread that started
+    it, so ``write_many`` passes them along.
+
+    """
+    with _sink_active(sink):
+        with _batch_open(batch):
+            writer(cdl)
+
+# ==============================================================================
+
+
+def _write_isolated(ext, chunk, settings, capture=False, batched=False):
+    """Rebuilds serialized ColorCorrections in a worker process and writes them
+
+    **Args:**
+        ext : (str)
+            The key in ``OUTPUT_FORMATS`` to write each correction with.
+
+        chunk : [(dict, str)]
+            Each correction as serialized by ``cache._dump_cc`` , along with
+            the ``file_out`` to write it to.
+
+        settings : {str: object}
+            The parent's value of each of ``config.PROCESS_SETTINGS`` , which
+            spawned (rather than forked) workers would otherwise not see.
+
+        capture=False : (bool)
+            Return the outputs rather than writing them, for the parent to
+            hand to its active sink.
+
+        batched=False : (bool)
+            Return the directories written to rather than syncing them, for
+            the parent to add to its open batch.
+
+    **Returns:**
+        [(str, bytes, [str])], [str], Exception|None
+            The outputs captured, as ``MemorySink.outputs`` , the directories
+            left for the parent to sync, and the first error raised by any of
+            the writes.
+
+    **Raises:**
+        None
+
+    Each correction is rebuilt in a registry of its own, so ids never collide
+    with corrections this worker wrote before.
+
+    """
+    for name, value in settings.items():
+        setattr(config, name, value)
+    errors = []
+    memory = MemorySink()
+    directories = set()
+    with _batch_open(directories) if batched else batch_writes():
+        with _sink_active(memory if capture else None):
+            for data, file_out in chunk:
+                try:
+                    with Registry():
+                        cdl = _load_cc(data)
+                    cdl._file_out = file_out  # pylint: disable=W0212
+                    OUTPUT_FORMATS[ext](cdl)
+                except Exception as err:  # pylint: disable=W0703
+                    errors.append(err)
+    return memory.outputs, sorted(directories), errors[0] if errors else None
+
+# ==============================================================================
+
+
+def _write_output(filepath, output):
+    """Writes the bytes of output to filepath, unless it already holds them"""
+    if config.SKIP_UNCHANGED and _unchanged(filepath, output):
+        return
+    with _open_dest(filepath) as out_file:
+        out_file.write(output)
+
+# ==============================================================================
 # PUBLIC FUNCTIONS
 # ==============================================================================
 
 
+@contextmanager
+def batch_writes():
+    """Defers directory fsyncs to one per directory, when the batch ends
+
+    With ``config.ATOMIC_WRITES`` and ``config.FSYNC`` , every output is
+    synced to disk before it's renamed into place, and its directory synced
+    after. For many small files written to the same few directories, most of
+    those directory syncs are repeats. Within a batch, outputs are still
+    synced before their rename, but each directory written to is only synced
+    once, when the outermost batch exits.
+
+    A batch is only open on the thread that opened it, and on the threads and
+    processes ``write_many`` starts within it.
+
+    **Yields:**
+        None
+
+    **Raises:**
+        Anything raised syncing a directory.
+
+    """
+    stack = _batch_stack()
+    stack.append(set())
+    try:
+        yield
+    finally:
+        directories = stack.pop()
+        if stack:
+            with _BATCH_LOCK:
+                stack[-1].update(directories)
+            directories = set()
+        for directory in sorted(directories):
+            _fsync_directory(directory)
+
+# ==============================================================================
+
+
+def write_3dl(cdl):
+    """Bakes the ColorCorrection to a .3dl 3D LUT
+
+    The first line lists the 10 bit input value of each lattice point. Each
+    following line holds a 12 bit output RGB value, with blue changing
+    fastest.
+
+    """
+    lut = bake_lut(cdl, config.LUT_SIZE).reshape(-1, 3)
+    lut = numpy.rint(lut * 4095)
+    mesh = numpy.rint(numpy.linspace(0, 1023, config.LUT_SIZE))
+
+    with _open_out(cdl) as cdl_f:
+        cdl_f.write(enc(' '.join(str(int(i)) for i in mesh) + '\n'))
+        cdl_f.write(_format_rows([(lut[:, i], 0) for i in range(3)]))
+
+# ==============================================================================
+
+
 def write_cc(cdl):
     """Writes the ColorCorrection to a .cc file"""
-    with open(cdl.file_out, 'wb') as cdl_f:
-        cdl_f.write(cdl.xml_root)
+    with _open_out(cdl) as cdl_f:
+        cdl.write_xml(cdl_f)
 
 # ==============================================================================
 
@@ -119,8 +600,8 @@ def write_ccc(cdl):
 
     collection_type = cdl.type
     cdl.set_to_ccc()
-    with open(cdl.file_out, 'wb') as cdl_f:
-        cdl_f.write(cdl.xml_root)
+    with _open_out(cdl) as cdl_f:
+        cdl.write_xml(cdl_f)
     cdl.type = collection_type
 
 # ==============================================================================
@@ -133,13 +614,164 @@ def write_cdl(cdl):
 
     collection_type = cdl.type
     cdl.set_to_cdl()
-    with open(cdl.file_out, 'wb') as cdl_f:
-        cdl_f.write(cdl.xml_root)
+    with _open_out(cdl) as cdl_f:
+        cdl.write_xml(cdl_f)
     cdl.type = collection_type
 
 # ==============================================================================
 
 
+def write_cdlb(cdl):
+    """Writes the ColorCollection to a binary .cdlb file"""
+    if not isinstance(cdl, ColorCollection):
+        cdl = _temp_container(cdl)
+
+    with _open_out(cdl) as cdl_f:
+        cdlb.dump(cdl, cdl_f)
+
+# ==============================================================================
+
+
+def write_cube(cdl):
+    """Bakes the ColorCorrection to a .cube 3D LUT, red changing fastest"""
+    # Reversing the lattice axes puts red last, so it changes fastest.
+    lut = bake_lut(cdl, config.LUT_SIZE).transpose(2, 1, 0, 3).reshape(-1, 3)
+
+    with _open_out(cdl) as cdl_f:
+        cdl_f.write(
+            enc(
+                'TITLE "{id}"\nLUT_3D_SIZE {size}\n'.format(
+                    id=cdl.id, size=config.LUT_SIZE
+                )
+            )
+        )
+        cdl_f.write(_format_rows([(lut[:, i], 6) for i in range(3)]))
+
+# ==============================================================================
+
+
+def write_many(cdls, ext, workers=None, processes=False, backlog=None):
+    """Writes many ColorCorrections to the same output format concurrently
+
+    **Args:**
+        cdls : [:class:`ColorCorrection`]
+            The corrections to write. ``file_out`` should already be set on
+            each of them.
+
+        ext : (str)
+            The key in ``OUTPUT_FORMATS`` to write each correction with.
+
+        workers=None : (int)
+            Maximum number of threads or processes to write with. Defaults to
+            the executor's default for this machine. With a single worker,
+            the corrections are written one at a time in this thread.
+
+        processes=False : (bool)
+            Write with a ``ProcessPoolExecutor`` rather than threads. Each
+            correction is serialized to plain data, rebuilt in a worker
+            process and written from there, so building and pretty printing
+            the XML isn't held up by the GIL. Corrections are sent to the
+            workers ``PROCESS_CHUNK`` at a time. If a sink is active, the
+            workers send their outputs back to be added to it.
+
+        backlog=None : (int)
+            Maximum number of writes (or chunks of writes, for processes)
+            submitted but not yet finished. Once it is reached, no more are
+            submitted until the oldest finishes, so a huge collection never
+            has all of its writes queued at once. Defaults to four for every
+            worker.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        The first error raised by any of the writes, in the order the
+        corrections were given, once every write has finished.
+
+    Baking a LUT spends nearly all of its time in NumPy, which releases the
+    GIL, so LUT formats bake in parallel on a thread pool. XML formats spend
+    most of their time in Python, and scale better across processes.
+    Without ``concurrent.futures`` the corrections are written one at a time.
+
+    """
+    writer = OUTPUT_FORMATS[ext]
+    # Workers don't share this thread's sink or batch, so they're handed them.
+    sink = active_sink()
+    batch = _current_batch()
+    if ThreadPoolExecutor is None or workers == 1 or len(cdls) < 2:
+        for cdl in cdls:
+            writer(cdl)
+        return
+
+    if not backlog:
+        backlog = 4 * (workers or multiprocessing.cpu_count())
+
+    if processes:
+        settings = dict(
+            (name, getattr(config, name)) for name in config.PROCESS_SETTINGS
+        )
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Chunks are only serialized as they're submitted, so the backlog
+        # bounds how many are held at once.
+        tasks = (
+            [
+                (_dump_cc(cdl), cdl.file_out)
+                for cdl in cdls[i:i + PROCESS_CHUNK]
+            ]
+            for i in range(0, len(cdls), PROCESS_CHUNK)
+        )
+
+        # Processes can't reach the sink or batch at all, so they send
+        # back their outputs and directories for them instead.
+        def submit(chunk):
+            """Sends a chunk of serialized corrections to a worker"""
+            return executor.submit(
+                _write_isolated, ext, chunk, settings, sink is not None,
+                batch is not None
+            )
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        tasks = cdls
+
+        def submit(cdl):
+            """Writes the correction on a worker thread"""
+            return executor.submit(_write_in, writer, cdl, sink, batch)
+
+    pending = deque()
+    errors = []
+
+    def finish_oldest():
+        """Waits for the oldest pending write, keeping any error it raised"""
+        try:
+            result = pending.popleft().result()
+            if processes:
+                outputs, directories, error = result
+                for filepath, data, ids in outputs:
+                    sink.add(filepath, data, ids)
+                if batch is not None:
+                    with _BATCH_LOCK:
+                        batch.update(directories)
+                if error is not None:
+                    raise error
+        except Exception as err:  # pylint: disable=W0703
+            errors.append(err)
+
+    try:
+        for task in tasks:
+            if len(pending) >= backlog:
+                finish_oldest()
+            pending.append(submit(task))
+        while pending:
+            finish_oldest()
+    finally:
+        executor.shutdown()
+
+    if errors:
+        raise errors[0]
+
+# ==============================================================================
+
+
 def write_rnh_cdl(cdl):
     """Writes the ColorCorrection to a space separated .cdl file"""
 
@@ -151,16 +783,49 @@ def write_rnh_cdl(cdl):
 
     ss_cdl = ' '.join(values)
 
-    with open(cdl.file_out, 'wb') as cdl_f:
+    with _open_out(cdl) as cdl_f:
         cdl_f.write(enc(ss_cdl))
 
 # ==============================================================================
+
+
+def write_spi3d(cdl):
+    """Bakes the ColorCorrection to a .spi3d 3D LUT, blue changing fastest"""
+    size = config.LUT_SIZE
+    lut = bake_lut(cdl, size).reshape(-1, 3)
+    index = numpy.indices((size, size, size)).reshape(3, -1)
+
+    with _open_out(cdl) as cdl_f:
+        cdl_f.write(
+            enc('SPILUT 1.0\n3 3\n{0} {0} {0}\n'.format(size))
+        )
+        cdl_f.write(
+            _format_rows(
+                [(index[i], 0) for i in range(3)] +
+                [(lut[:, i], 6) for i in range(3)]
+            )
+        )
+
+# ==============================================================================
 # GLOBALS
 # ==============================================================================
 
 OUTPUT_FORMATS = {
+    '3dl': write_3dl,
     'cc': write_cc,
     'ccc': write_ccc,
     'cdl': write_cdl,
+    'cdlb': write_cdlb,
+    'cube': write_cube,
     'rcdl': write_rnh_cdl,
+    'spi3d': write_spi3d,
+}
+
+# Where the outputs of each input file can be written to, other than their
+# own files. 'dir' writes them there anyway, but also writes an index.
+OUTPUT_SINKS = {
+    'dir': DirectorySink,
+    'tar': TarSink,
+    'tgz': TarSink,
+    'zip': ZipSink,
 }
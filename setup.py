@@ -151,6 +151,11 @@ setup(
     # project is installed.
     install_requires=['argparse'],
 
+    # Optional dependencies, only needed for applying grades to images.
+    extras_require={
+        'numpy': ['numpy'],
+    },
+
     # Testing
     test_suite='nose.collector',
     tests_require=['nose'],
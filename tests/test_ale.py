@@ -13,8 +13,14 @@ mock
 
 # Standard Imports
 from decimal import Decimal
+import gzip
 import os
+try:
+    from pathlib import Path
+except ImportError:  # pragma: no cover
+    Path = None
 from random import choice, randrange
+import re
 import sys
 import tempfile
 import unittest
@@ -271,6 +277,35 @@ class TestParseALEBasic(unittest.TestCase):
             self.cdl3.sat
         )
 
+    #==========================================================================
+
+    def testIterFile(self):
+        """Tests that iter_file yields the same corrections lazily"""
+        cdl_convert.reset_all()
+
+        corrections = cdl_convert.iter_file(self.filename, 'ale')
+
+        first = next(corrections)
+        self.assertEqual(
+            'bb94_x103_line1',
+            first.id
+        )
+        self.assertEqual(
+            self.slope1,
+            first.slope
+        )
+
+        # Nothing past the first correction has been built yet.
+        self.assertEqual(
+            ['bb94_x103_line1'],
+            list(cdl_convert.ColorCorrection.members.keys())
+        )
+
+        self.assertEqual(
+            ['bb94_x104_line2', 'bb94_x105_line3'],
+            [i.id for i in corrections]
+        )
+
 
 class TestParseALEShort(TestParseALEBasic):
     """Tests basic parsing of a shortened ALE with different tab"""
@@ -319,6 +354,293 @@ class TestParseALEShort(TestParseALEBasic):
         self.cdl2 = self.cdls.color_corrections[1]
         self.cdl3 = self.cdls.color_corrections[2]
 
+
+class TestParseALEMalformed(unittest.TestCase):
+    """Tests ASC_SOP fields that don't hold nine numbers"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.good = buildALELine(
+            decimalize(1.1, 1.2, 1.3), decimalize(0.1, 0.2, 0.3),
+            decimalize(0.9, 1.0, 1.1), Decimal('0.9'), 'bb94_x103_line1'
+        )
+        self.filename = None
+
+    #==========================================================================
+
+    def tearDown(self):
+        if self.filename:
+            os.remove(self.filename)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+
+    def parse_with_sop(self, sop):
+        """Parses an ALE whose second data line has the given ASC_SOP"""
+        bad = self.good.replace('bb94_x103_line1', 'bb94_x104_line2')
+        bad = re.sub(r'\(.*\)', sop, bad)
+
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(enc(ALE_HEADER + self.good + bad))
+            self.filename = f.name
+
+        return cdl_convert.parse_ale(self.filename)
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testRowNumber(self):
+        """Tests the error names the line and file of the malformed field"""
+        try:
+            self.parse_with_sop('(1.0 1.0)(0.0 0.0 0.0)(1.0 1.0 1.0)')
+        except ValueError as err:
+            self.assertTrue('Line 12 of' in str(err))
+            self.assertTrue(self.filename in str(err))
+            self.assertTrue('(1.0 1.0)(0.0 0.0 0.0)(1.0 1.0 1.0)' in str(err))
+        else:
+            self.fail('Malformed ASC_SOP did not raise')
+
+    #==========================================================================
+
+    def testMalformed(self):
+        """Tests malformed fields raise ValueError"""
+        for sop in [
+            '(1.0 1.0 1.0 1.0)(0.0 0.0 0.0)(1.0 1.0 1.0)',
+            '(1.0 1.0 1.0)(0.0 0.0 0.0)',
+            '(1.0 1.0 1.0)(0.0 0.0 0.0)(1.0 1.0 1.0)(1.0 1.0 1.0)',
+            '(1.01.0 1.0)(0.0 0.0 0.0)(1.0 1.0 1.0)',
+            '(a b c)(0.0 0.0 0.0)(1.0 1.0 1.0)',
+            '(1.0, 1.0, 1.0)(0.0 0.0 0.0)(1.0 1.0 1.0)',
+            "(__import__('os') 1 1)(0.0 0.0 0.0)(1.0 1.0 1.0)",
+            '',
+        ]:
+            cdl_convert.reset_all()
+            self.assertRaises(ValueError, self.parse_with_sop, sop)
+            os.remove(self.filename)
+            self.filename = None
+
+    #==========================================================================
+
+    def testLooseFormatting(self):
+        """Tests extra whitespace, signs and exponents are accepted"""
+        cdls = self.parse_with_sop(
+            '( 1.5  2 .25 ) (-0.1 +0.2 3e-2)(1. 1E1 0.5 )'
+        )
+        cdl = cdls.color_corrections[1]
+
+        self.assertEqual(decimalize(1.5, 2, 0.25), cdl.slope)
+        self.assertEqual(
+            (Decimal('-0.1'), Decimal('0.2'), Decimal('3E-2')), cdl.offset
+        )
+        self.assertEqual(
+            (Decimal('1.0'), Decimal('1E1'), Decimal('0.5')), cdl.power
+        )
+
+
+class TestParseALEStream(unittest.TestCase):
+    """Tests parsing an ALE from iterables of lines instead of a filepath"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.slope = decimalize(1.329, 0.9833, 1.003)
+        self.offset = decimalize(0.011, 0.013, 0.11)
+        self.power = decimalize(.993, .998, 1.0113)
+        self.lines = [ALE_HEADER] + [
+            buildALELine(
+                self.slope, self.offset, self.power, Decimal('1.01'),
+                'bb94_x10{0}_line{0}'.format(i)
+            ) for i in range(3)
+        ]
+        self.file = ''.join(self.lines)
+        self.lines = self.file.splitlines(True)
+        self.filename = None
+
+    #==========================================================================
+
+    def tearDown(self):
+        if self.filename:
+            os.remove(self.filename)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testList(self):
+        """Tests a list of lines parses, with no file_in"""
+        cdls = cdl_convert.parse_ale(self.lines)
+
+        self.assertEqual(
+            ['bb94_x100_line0', 'bb94_x101_line1', 'bb94_x102_line2'],
+            [cc.id for cc in cdls.color_corrections]
+        )
+        self.assertEqual(self.slope, cdls.color_corrections[2].slope)
+        self.assertEqual(None, cdls.file_in)
+        self.assertEqual(None, cdls.color_corrections[0].file_in)
+
+    #==========================================================================
+
+    def testOpenFile(self):
+        """Tests an open file parses, and keeps its path as file_in"""
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(enc(self.file))
+            self.filename = f.name
+
+        with open(self.filename, 'r') as ale:
+            cdls = cdl_convert.parse_ale(ale)
+
+        self.assertEqual(3, len(cdls.color_corrections))
+        self.assertEqual(self.filename, cdls.file_in)
+        self.assertEqual(self.filename, cdls.color_corrections[0].file_in)
+
+    #==========================================================================
+
+    @unittest.skipIf(Path is None, 'pathlib is not available')
+    def testPath(self):
+        """Tests a pathlib.Path is opened as a filepath"""
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(enc(self.file))
+            self.filename = f.name
+
+        cdls = cdl_convert.parse_ale(Path(self.filename))
+
+        self.assertEqual(3, len(cdls.color_corrections))
+        self.assertEqual(self.filename, cdls.file_in)
+        self.assertEqual(self.slope, cdls.color_corrections[2].slope)
+
+    #==========================================================================
+
+    def testGzipStream(self):
+        """Tests the binary lines of a gzip stream are decoded and parsed"""
+        with tempfile.NamedTemporaryFile(suffix='.ale.gz', delete=False) as f:
+            self.filename = f.name
+        with gzip.open(self.filename, 'wb') as ale:
+            ale.write(enc(self.file))
+
+        with gzip.open(self.filename, 'rb') as ale:
+            cdls = cdl_convert.parse_ale(ale)
+
+        self.assertEqual(self.power, cdls.color_corrections[1].power)
+
+    #==========================================================================
+
+    def testLazy(self):
+        """Tests corrections are yielded before the rest is read"""
+        read = []
+
+        def lines():
+            """Yields our lines, recording how many have been read"""
+            for line in self.lines:
+                read.append(line)
+                yield line
+
+        corrections = cdl_convert.iter_file(lines(), 'ale')
+        first = next(corrections)
+
+        self.assertEqual('bb94_x100_line0', first.id)
+        self.assertEqual(len(self.lines) - 2, len(read))
+
+    #==========================================================================
+
+    def testMalformedWithoutPath(self):
+        """Tests errors from pathless input still name the line"""
+        self.lines[-1] = re.sub(r'\(.*\)', '(1 1)', self.lines[-1])
+
+        try:
+            cdl_convert.parse_ale(self.lines)
+        except ValueError as err:
+            self.assertTrue(str(err).startswith('Line 13 has'))
+        else:
+            self.fail('Malformed ASC_SOP did not raise')
+
+
+class TestParseALEColumns(unittest.TestCase):
+    """Tests reading extra columns from a wide ALE"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        filler = ['Extra{0}'.format(i) for i in range(80)]
+        header = ['Name', 'Tape', 'Start', 'End', 'ASC_SAT', 'ASC_SOP']
+        self.lines = (
+            ALE_HEADER.split('Column')[0] +
+            'Column\n' + '\t'.join(header + filler) + '\n\nData\n'
+        )
+        for i in range(3):
+            self.lines += '\t'.join(
+                [
+                    'A00{0}C001'.format(i), 'TAPE{0}'.format(i),
+                    '01:00:0{0}:00'.format(i), '01:00:0{0}:12'.format(i),
+                    '0.9', '(1.1 1.2 1.3)(0.1 0.2 0.3)(0.9 1.0 1.1)',
+                ] + ['x{0}'.format(j) for j in range(80)]
+            ) + '\n'
+        self.lines = self.lines.splitlines(True)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testColumns(self):
+        """Tests requested columns are stored as metadata"""
+        cdls = cdl_convert.parse_ale(
+            self.lines, columns=['Tape', 'Start', 'End', 'Extra79']
+        )
+        cdl = cdls.color_corrections[2]
+
+        self.assertEqual('A002C001', cdl.id)
+        self.assertEqual(
+            {
+                'Tape': 'TAPE2',
+                'Start': '01:00:02:00',
+                'End': '01:00:02:12',
+                'Extra79': 'x79',
+            },
+            cdl.metadata
+        )
+        self.assertEqual(decimalize(1.1, 1.2, 1.3), cdl.slope)
+        self.assertEqual(Decimal('0.9'), cdl.sat)
+        # Metadata has no place in the ASC CDL
+        self.assertFalse(b'TAPE2' in cdl.xml)
+
+    #==========================================================================
+
+    def testNoColumns(self):
+        """Tests no metadata is stored unless asked for"""
+        cdls = cdl_convert.parse_ale(self.lines)
+
+        self.assertEqual({}, cdls.color_corrections[0].metadata)
+
+    #==========================================================================
+
+    def testMissingColumn(self):
+        """Tests asking for a column the ALE doesn't have raises"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_ale, self.lines, columns=['Tape', 'Camroll']
+        )
+
+    #==========================================================================
+
+    def testMissingSop(self):
+        """Tests an ALE without an ASC_SOP column raises"""
+        self.lines[7] = self.lines[7].replace('ASC_SOP', 'CDL')
+
+        self.assertRaises(ValueError, cdl_convert.parse_ale, self.lines)
+
 #==============================================================================
 # FUNCTIONS
 #==============================================================================
@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+"""
+Tests the on disk cache of parse results
+
+REQUIREMENTS:
+
+mock
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+from decimal import Decimal
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+CDL = """<?xml version="1.0" encoding="UTF-8"?>
+<ColorDecisionList xmlns="urn:ASC:CDL:v1.01">
+    <Description>CDL description 1</Description>
+    <InputDescription>CDL Input Desc Text</InputDescription>
+    <ViewingDescription>CDL Viewing Desc Text</ViewingDescription>
+    <ColorDecision>
+        <Description>CD description 1</Description>
+        <MediaRef ref="/best/path/ever.dpx"/>
+        <ColorCorrection id="014_xf_seqGrade_v01">
+            <Description>CC description 1</Description>
+            <InputDescription>Input Desc Text</InputDescription>
+            <SOPNode>
+                <Description>Sop description 1</Description>
+                <Slope>1.014 1.0104 0.62</Slope>
+                <Offset>-0.00315 -0.00124 0.3103</Offset>
+                <Power>1.0 0.9983 1.0</Power>
+            </SOPNode>
+            <SATNode>
+                <Description>Sat description 1</Description>
+                <Saturation>1.09</Saturation>
+            </SATNode>
+        </ColorCorrection>
+    </ColorDecision>
+    <ColorDecision>
+        <MediaRef ref="http://www.google.com/logo.jpg"/>
+        <ColorCorrectionRef ref="014_xf_seqGrade_v01"/>
+    </ColorDecision>
+    <ColorDecision>
+        <ColorCorrection id="burp_200.x15">
+            <SatNode>
+                <Saturation>1.00000</Saturation>
+            </SatNode>
+        </ColorCorrection>
+    </ColorDecision>
+</ColorDecisionList>
+"""
+
+CC = """<?xml version="1.0" encoding="UTF-8"?>
+<ColorCorrection id="shot1">
+    <SOPNode>
+        <Slope>1.2 1.3 1.4</Slope>
+        <Offset>0.3 0.0 0.0</Offset>
+        <Power>1.0 1.0 1.0</Power>
+    </SOPNode>
+</ColorCorrection>
+"""
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+class TestParseCache(unittest.TestCase):
+    """Tests loading parse results through a ParseCache"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = cdl_convert.ParseCache(
+            os.path.join(self.directory, 'cache')
+        )
+        self.filepath = self._write_file('show.cdl', CDL)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # UTILITIES
+    #==========================================================================
+
+    def _entry_files(self):
+        """Returns the entry files in the cache directory"""
+        return [
+            name for name in os.listdir(self.cache.directory)
+            if name.endswith('.cdlcache')
+        ]
+
+    #==========================================================================
+
+    def _write_file(self, name, contents):
+        """Writes contents into the temp directory and returns the path"""
+        filepath = os.path.join(self.directory, name)
+        with open(filepath, 'w') as source:
+            source.write(contents)
+        return filepath
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testHitSkipsParse(self):
+        """Tests a second load doesn't parse the file again"""
+        first = cdl_convert.parse_file(self.filepath, cache=self.cache)
+        cdl_convert.reset_all()
+
+        with mock.patch.dict(
+            cdl_convert.parse.INPUT_FORMATS, {'cdl': mock.Mock()}
+        ) as formats:
+            second = cdl_convert.parse_file(self.filepath, cache=self.cache)
+            self.assertFalse(formats['cdl'].called)
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(first.xml, second.xml)
+
+    #==========================================================================
+
+    def testRoundTrip(self):
+        """Tests every detail of a parsed cdl survives the cache"""
+        cdl_convert.parse_file(self.filepath, cache=self.cache)
+        cdl_convert.reset_all()
+        cdl = cdl_convert.parse_file(self.filepath, cache=self.cache)
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual('cdl', cdl.type)
+        self.assertEqual(self.filepath, cdl.file_in)
+        self.assertEqual(['CDL description 1'], cdl.desc)
+        self.assertEqual('CDL Input Desc Text', cdl.input_desc)
+        self.assertEqual('CDL Viewing Desc Text', cdl.viewing_desc)
+        self.assertEqual(3, len(cdl.color_decisions))
+
+        decision, ref_decision, sat_decision = cdl.color_decisions
+        self.assertEqual(['CD description 1'], decision.desc)
+        self.assertEqual('/best/path/ever.dpx', decision.media_ref.ref)
+        self.assertTrue(decision.parent is cdl)
+        self.assertTrue(decision.media_ref.parent is decision)
+
+        cc = decision.cc
+        self.assertTrue(cc.parent is decision)
+        self.assertEqual('014_xf_seqGrade_v01', cc.id)
+        self.assertEqual(['CC description 1'], cc.desc)
+        self.assertEqual('Input Desc Text', cc.input_desc)
+        self.assertEqual(
+            (Decimal('1.014'), Decimal('1.0104'), Decimal('0.62')),
+            cc.slope
+        )
+        self.assertEqual(Decimal('-0.00315'), cc.offset[0])
+        self.assertEqual(['Sop description 1'], cc.sop_node.desc)
+        self.assertEqual('1.09', str(cc.sat))
+        self.assertEqual(['Sat description 1'], cc.sat_node.desc)
+
+        self.assertTrue(ref_decision.is_ref)
+        self.assertEqual('014_xf_seqGrade_v01', ref_decision.cc.id)
+        self.assertTrue(ref_decision.cc.cc is cc)
+        self.assertEqual(
+            'http://www.google.com/logo.jpg', ref_decision.media_ref.ref
+        )
+
+        self.assertFalse(sat_decision.cc.has_sop)
+        self.assertEqual('1.00000', str(sat_decision.cc.sat))
+        self.assertEqual(None, sat_decision.media_ref)
+
+    #==========================================================================
+
+    def testTakenIdNotStored(self):
+        """Tests ids suffixed on a miss aren't stored suffixed"""
+        taken = cdl_convert.ColorCorrection('014_xf_seqGrade_v01')
+        cdl = cdl_convert.parse_file(self.filepath, cache=self.cache)
+
+        self.assertEqual(
+            '014_xf_seqGrade_v01001', cdl.color_decisions[0].cc.id
+        )
+        self.assertTrue(cdl.color_decisions[1].cc.cc is taken)
+
+        cdl_convert.reset_all()
+        cached = cdl_convert.parse_file(self.filepath, cache=self.cache)
+        cdl_convert.reset_all()
+        parsed = cdl_convert.parse_file(self.filepath)
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(parsed.xml, cached.xml)
+        self.assertEqual(
+            '014_xf_seqGrade_v01', cached.color_decisions[0].cc.id
+        )
+
+    #==========================================================================
+
+    def testMissMovesParsedNodes(self):
+        """Tests a miss hands back the parsed nodes, in the caller's registry"""
+        with cdl_convert.Registry() as registry:
+            cdl = self.cache.load(self.filepath)
+
+        cc = cdl.color_decisions[0].cc
+        self.assertTrue(cc.registry is registry)
+        self.assertTrue(
+            registry.members(cdl_convert.ColorCorrection)[cc.id] is cc
+        )
+        self.assertEqual(
+            cdl.color_decisions[0:2],
+            registry.members(cdl_convert.ColorDecision)[cc.id]
+        )
+        self.assertEqual([cdl], registry.members(cdl_convert.ColorCollection))
+        self.assertEqual(
+            [cdl.color_decisions[0].media_ref],
+            registry.members(cdl_convert.MediaRef)['/best/path/ever.dpx']
+        )
+        self.assertTrue(cdl.color_decisions[1].cc.cc is cc)
+        self.assertEqual({}, cdl_convert.ColorCorrection.members)
+
+    #==========================================================================
+
+    def testMissTakenIdHalts(self):
+        """Tests a taken id raises on a miss when halting, moving nothing"""
+        taken = cdl_convert.ColorCorrection('014_xf_seqGrade_v01')
+
+        with mock.patch('cdl_convert.config.HALT_ON_ERROR', True):
+            self.assertRaises(ValueError, self.cache.load, self.filepath)
+
+        self.assertEqual(
+            {'014_xf_seqGrade_v01': taken},
+            cdl_convert.ColorCorrection.members
+        )
+        self.assertEqual([], cdl_convert.ColorCollection.members)
+
+    #==========================================================================
+
+    def testSingleCorrection(self):
+        """Tests a cc file is cached as a single ColorCorrection"""
+        filepath = self._write_file('shot1.cc', CC)
+        first = cdl_convert.parse_file(filepath, cache=self.cache)
+        cdl_convert.reset_all()
+        second = cdl_convert.parse_file(filepath, cache=self.cache)
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertTrue(isinstance(second, cdl_convert.ColorCorrection))
+        self.assertEqual(first.xml, second.xml)
+        self.assertFalse(second.has_sat)
+
+    #==========================================================================
+
+    def testAle(self):
+        """Tests an ALE collection is cached"""
+        filepath = self._write_file(
+            'show.ale',
+            'Heading\nFIELD_DELIM\tTABS\n\nColumn\n'
+            'Name\tTape\tASC_SAT\tASC_SOP\n\nData\n'
+            'shot1\tA001\t0.9\t(1.1 1.2 1.3)(0.0 0.0 0.0)(1.0 1.0 1.0)\n'
+        )
+        cdl_convert.parse_file(filepath, cache=self.cache)
+        cdl_convert.reset_all()
+        ale = cdl_convert.parse_file(filepath, cache=self.cache)
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual('shot1', ale.color_corrections[0].id)
+        self.assertEqual(filepath, ale.color_corrections[0].file_in)
+        self.assertEqual(Decimal('0.9'), ale.color_corrections[0].sat)
+
+    #==========================================================================
+
+    def testMetadata(self):
+        """Tests the metadata of a correction is serialized"""
+        cc = cdl_convert.ColorCorrection('shot1')
+        cc.sat = 0.9
+        cc.metadata['Tape'] = 'A001'
+        data = cdl_convert.cache._dump_node(cc)
+        cdl_convert.reset_all()
+
+        cc = cdl_convert.cache._load_node(data)
+        self.assertEqual({'Tape': 'A001'}, cc.metadata)
+
+    #==========================================================================
+
+    def testChangedFileMisses(self):
+        """Tests changing the size or mtime of a file invalidates its entry"""
+        cdl_convert.parse_file(self.filepath, cache=self.cache)
+        cdl_convert.reset_all()
+
+        self._write_file('show.cdl', CDL.replace('1.09', '1.5'))
+        cdl = cdl_convert.parse_file(self.filepath, cache=self.cache)
+        self.assertEqual('1.5', str(cdl.color_decisions[0].cc.sat))
+        self.assertEqual(0, self.cache.hits)
+        cdl_convert.reset_all()
+
+        stat = os.stat(self.filepath)
+        os.utime(self.filepath, (stat.st_atime, stat.st_mtime + 10))
+        cdl_convert.parse_file(self.filepath, cache=self.cache)
+        self.assertEqual(0, self.cache.hits)
+        self.assertEqual(3, self.cache.misses)
+
+        # The stale entry was replaced, not added to
+        self.assertEqual(1, len(self._entry_files()))
+
+    #==========================================================================
+
+    def testHashContents(self):
+        """Tests hashing contents catches a same size, same mtime rewrite"""
+        cache = cdl_convert.ParseCache(
+            self.cache.directory, hash_contents=True
+        )
+        stat = os.stat(self.filepath)
+        cache.load(self.filepath)
+        cdl_convert.reset_all()
+
+        self._write_file('show.cdl', CDL.replace('1.09', '1.08'))
+        os.utime(self.filepath, (stat.st_atime, stat.st_mtime))
+        cdl = cache.load(self.filepath)
+
+        self.assertEqual(0, cache.hits)
+        self.assertEqual('1.08', str(cdl.color_decisions[0].cc.sat))
+
+    #==========================================================================
+
+    def testSettingsKeyed(self):
+        """Tests results parsed under other config settings aren't reused"""
+        self.cache.load(self.filepath)
+        cdl_convert.reset_all()
+
+        with mock.patch('cdl_convert.config.FAST_MATH', True):
+            cdl = self.cache.load(self.filepath)
+
+        self.assertEqual(0, self.cache.hits)
+        self.assertTrue(isinstance(cdl.color_decisions[0].cc.sat, float))
+
+        cdl_convert.reset_all()
+        with mock.patch('cdl_convert.config.FAST_MATH', True):
+            cdl = self.cache.load(self.filepath)
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertTrue(isinstance(cdl.color_decisions[0].cc.sat, float))
+        self.assertTrue(isinstance(cdl.color_decisions[0].cc.slope[0], float))
+
+    #==========================================================================
+
+    def testCorruptEntry(self):
+        """Tests an unreadable entry is treated as a miss"""
+        self.cache.load(self.filepath)
+        cdl_convert.reset_all()
+
+        entry = os.path.join(self.cache.directory, self._entry_files()[0])
+        with open(entry, 'wb') as entry_file:
+            entry_file.write(b'not a cache entry')
+
+        cdl = self.cache.load(self.filepath)
+        self.assertEqual(0, self.cache.hits)
+        self.assertEqual(3, len(cdl.color_decisions))
+        cdl_convert.reset_all()
+
+        # And was rewritten
+        self.cache.load(self.filepath)
+        self.assertEqual(1, self.cache.hits)
+
+    #==========================================================================
+
+    def testLruEviction(self):
+        """Tests the least recently used entries are evicted first"""
+        paths = [
+            self._write_file('shot{0}.cc'.format(i), CC) for i in range(3)
+        ]
+        for filepath in paths:
+            self.cache.load(filepath)
+            cdl_convert.reset_all()
+        # Entries hold mtimes, so they can differ by a few bytes once
+        # compressed.
+        entry_size = max(
+            os.path.getsize(os.path.join(self.cache.directory, name))
+            for name in self._entry_files()
+        )
+
+        # Age every entry, then use the first so it's the most recent
+        for name in self._entry_files():
+            entry = os.path.join(self.cache.directory, name)
+            old = time.time() - 100
+            os.utime(entry, (old, old))
+        self.cache.load(paths[0])
+        cdl_convert.reset_all()
+
+        self.cache.max_bytes = entry_size * 2 + entry_size // 2
+        self.cache.load(self._write_file('shot3.cc', CC))
+        cdl_convert.reset_all()
+        self.assertEqual(2, len(self._entry_files()))
+
+        hits = self.cache.hits
+        self.cache.load(paths[0])
+        self.assertEqual(hits + 1, self.cache.hits)
+
+    #==========================================================================
+
+    def testClear(self):
+        """Tests clear removes every entry"""
+        self.cache.load(self.filepath)
+        self.cache.clear()
+        self.assertEqual([], self._entry_files())
+
+    #==========================================================================
+
+    def testNegativeSize(self):
+        """Tests a negative size limit raises"""
+        self.assertRaises(
+            ValueError, cdl_convert.ParseCache, self.directory, -1
+        )
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
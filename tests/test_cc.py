@@ -820,7 +820,45 @@ class TestWriteCCFull(unittest.TestCase):
 
         mockOpen.assert_called_once_with('bobs_big_file.cc', 'wb')
 
-        mockOpen().write.assert_called_once_with(self.target_xml_root)
+        # Output is streamed to the file in pieces
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(
+                [i[0][0] for i in mockOpen().write.call_args_list]
+            )
+        )
+
+
+class TestWriteCCFullFastMath(TestWriteCCFull):
+    """Tests full writing of CC XML with values stored as floats"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        cdl_convert.config.FAST_MATH = True
+        super(TestWriteCCFullFastMath, self).setUp()
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.config.FAST_MATH = False
+        super(TestWriteCCFullFastMath, self).tearDown()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def test_float_storage(self):
+        """Tests that values are stored as floats"""
+        self.assertEqual(
+            [float] * 4,
+            [type(i) for i in (
+                self.cdl.slope[0], self.cdl.offset[1], self.cdl.power[2],
+                self.cdl.sat
+            )]
+        )
 
 
 class TestWriteCCOdd(TestWriteCCFull):
@@ -670,6 +670,32 @@ class TestParseCCCOdd(TestParseCCCFull):
         self.node = cdl_convert.parse_ccc(self.filename)
 
 
+class TestParseCCCFullStream(TestParseCCCFull):
+    """Tests a full CCC parse using the streaming parser"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        super(TestParseCCCFullStream, self).setUp()
+        cdl_convert.reset_all()
+        self.node = cdl_convert.parse_ccc(self.filename, stream=True)
+
+
+class TestParseCCCOddStream(TestParseCCCOdd):
+    """Tests an odd CCC parse using the streaming parser"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        super(TestParseCCCOddStream, self).setUp()
+        cdl_convert.reset_all()
+        self.node = cdl_convert.parse_ccc(self.filename, stream=True)
+
+
 class TestParseCCCExceptions(unittest.TestCase):
     """Tests that we run into the correct exceptions with bad XMLs"""
 
@@ -703,6 +729,13 @@ class TestParseCCCExceptions(unittest.TestCase):
             self.filename,
         )
 
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_ccc,
+            self.filename,
+            stream=True
+        )
+
     #==========================================================================
 
     def testEmptyCCC(self):
@@ -723,6 +756,155 @@ class TestParseCCCExceptions(unittest.TestCase):
             self.filename,
         )
 
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_ccc,
+            self.filename,
+            stream=True
+        )
+
+
+class TestFindCorrection(unittest.TestCase):
+    """Tests finding single corrections in a CCC through its byte index"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'show.ccc')
+        with open(self.filename, 'wb') as f:
+            f.write(enc(CCC_FULL))
+
+        self.xml = {}
+        for cc in cdl_convert.parse_ccc(self.filename).color_corrections:
+            self.xml[cc.id] = cc.xml
+        cdl_convert.reset_all()
+        cdl_convert.parse._CORRECTION_INDEXES.clear()
+
+    def tearDown(self):
+        for filename in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, filename))
+        os.rmdir(self.directory)
+        cdl_convert.parse._CORRECTION_INDEXES.clear()
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testFindsEveryCorrection(self):
+        """Tests each found correction matches the one parse_ccc finds"""
+        for cc_id, xml in self.xml.items():
+            cc = cdl_convert.find_correction(self.filename, cc_id)
+            self.assertEqual(xml, cc.xml)
+            self.assertEqual(self.filename, cc.file_in)
+            cdl_convert.reset_all()
+
+    #==========================================================================
+
+    def testMissing(self):
+        """Tests an id that isn't in the file returns None"""
+        self.assertEqual(
+            None, cdl_convert.find_correction(self.filename, 'banana')
+        )
+
+    #==========================================================================
+
+    def testSidecarReused(self):
+        """Tests the saved index is used instead of scanning again"""
+        cdl_convert.find_correction(self.filename, 'f51.200')
+        self.assertTrue(
+            os.path.exists(
+                self.filename + cdl_convert.parse.CORRECTION_INDEX_EXT
+            )
+        )
+        cdl_convert.parse._CORRECTION_INDEXES.clear()
+        cdl_convert.reset_all()
+
+        with mock.patch(
+            'cdl_convert.parse._build_correction_index'
+        ) as mockBuild:
+            cc = cdl_convert.find_correction(self.filename, 'f51.200')
+            self.assertFalse(mockBuild.called)
+        self.assertEqual(self.xml['f51.200'], cc.xml)
+
+    #==========================================================================
+
+    def testFileChanged(self):
+        """Tests the index is rebuilt when the file changes"""
+        cdl_convert.find_correction(self.filename, 'f51.200')
+        cdl_convert.reset_all()
+
+        with open(self.filename, 'wb') as f:
+            f.write(enc(CCC_ODD))
+
+        cc = cdl_convert.find_correction(self.filename, 'f55.100')
+        self.assertEqual(Decimal('1798787.01'), cc.sat)
+        self.assertEqual(
+            None, cdl_convert.find_correction(self.filename, 'burp_100.x12')
+        )
+
+    #==========================================================================
+
+    def testStaleOffsets(self):
+        """Tests offsets that no longer point at the correction are redone"""
+        cdl_convert.find_correction(self.filename, 'f51.200')
+        cdl_convert.reset_all()
+
+        index = cdl_convert.parse._CORRECTION_INDEXES[self.filename][1]
+        index['f51.200'] = index['014_xf_seqGrade_v01']
+
+        cc = cdl_convert.find_correction(self.filename, 'f51.200')
+        self.assertEqual(self.xml['f51.200'], cc.xml)
+
+    #==========================================================================
+
+    def testReadOnlyDirectory(self):
+        """Tests the index is still used when it can't be saved"""
+        with mock.patch('tempfile.mkstemp', side_effect=OSError):
+            cc = cdl_convert.find_correction(self.filename, 'f51.200')
+
+        self.assertEqual(self.xml['f51.200'], cc.xml)
+        self.assertEqual(['show.ccc'], os.listdir(self.directory))
+
+    #==========================================================================
+
+    def testCdl(self):
+        """Tests corrections inside ColorDecisions are found, refs aren't"""
+        with open(self.filename, 'wb') as f:
+            f.write(
+                enc(
+                    '<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<ColorDecisionList xmlns="urn:ASC:CDL:v1.01">\n'
+                    '<ColorDecision><ColorCorrectionRef ref="shot1"/>'
+                    '</ColorDecision>\n'
+                    '<ColorDecision><ColorCorrection id=\'shot&amp;1\'>'
+                    '<SatNode><Saturation>0.5</Saturation></SatNode>'
+                    '</ColorCorrection></ColorDecision>\n'
+                    '</ColorDecisionList>\n'
+                )
+            )
+
+        self.assertEqual(
+            None, cdl_convert.find_correction(self.filename, 'shot1')
+        )
+        cc = cdl_convert.find_correction(self.filename, 'shot&1')
+        self.assertEqual(Decimal('0.5'), cc.sat)
+
+    #==========================================================================
+
+    def testRegistry(self):
+        """Tests the found correction registers with a given registry"""
+        registry = cdl_convert.Registry()
+        cc = cdl_convert.find_correction(
+            self.filename, 'f51.200', registry=registry
+        )
+
+        self.assertTrue(cc.registry is registry)
+        self.assertEqual({}, cdl_convert.ColorCorrection.members)
+
 
 class TestWriteCCCFull(unittest.TestCase):
     """Tests a full write of the CCC file
@@ -783,6 +965,27 @@ class TestWriteCCCFull(unittest.TestCase):
 
     #==========================================================================
 
+    def test_write_xml(self):
+        """Tests that write_xml streams one child element per write"""
+        xml_file = mock.MagicMock()
+
+        self.ccc.write_xml(xml_file)
+
+        writes = [i[0][0] for i in xml_file.write.call_args_list]
+
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(writes)
+        )
+
+        # Declaration, collection opening, each child and the closing tag.
+        self.assertEqual(
+            len(self.ccc.all_children) + 3,
+            len(writes)
+        )
+
+    #==========================================================================
+
     def test_write(self):
         """Tests writing the ccc itself"""
         mockOpen = mock.mock_open()
@@ -794,7 +997,13 @@ class TestWriteCCCFull(unittest.TestCase):
 
         mockOpen.assert_called_once_with('bobs_big_file.ccc', 'wb')
 
-        mockOpen().write.assert_called_once_with(self.target_xml_root)
+        # Output is streamed to the file in pieces
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(
+                [i[0][0] for i in mockOpen().write.call_args_list]
+            )
+        )
 
 
 class TestWriteCCCFullAsCDL(TestWriteCCCFull):
@@ -842,7 +1051,13 @@ class TestWriteCCCFullAsCDL(TestWriteCCCFull):
 
         mockOpen.assert_called_once_with('bobs_big_file.cdl', 'wb')
 
-        mockOpen().write.assert_called_once_with(self.target_xml_root)
+        # Output is streamed to the file in pieces
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(
+                [i[0][0] for i in mockOpen().write.call_args_list]
+            )
+        )
 
 
 class TestWriteCCCOdd(TestWriteCCCFull):
@@ -928,6 +928,32 @@ class TestParseCDLOdd(TestParseCDLFull):
         self.node = cdl_convert.parse_cdl(self.filename)
 
 
+class TestParseCDLFullStream(TestParseCDLFull):
+    """Tests a full CDL parse using the streaming parser"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        super(TestParseCDLFullStream, self).setUp()
+        cdl_convert.reset_all()
+        self.node = cdl_convert.parse_cdl(self.filename, stream=True)
+
+
+class TestParseCDLOddStream(TestParseCDLOdd):
+    """Tests an odd CDL parse using the streaming parser"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        super(TestParseCDLOddStream, self).setUp()
+        cdl_convert.reset_all()
+        self.node = cdl_convert.parse_cdl(self.filename, stream=True)
+
+
 class TestParseCDLExceptions(unittest.TestCase):
     """Tests that we run into the correct exceptions with bad XMLs"""
 
@@ -961,6 +987,13 @@ class TestParseCDLExceptions(unittest.TestCase):
             self.filename,
         )
 
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_cdl,
+            self.filename,
+            stream=True
+        )
+
     #==========================================================================
 
     def testEmptyCDL(self):
@@ -981,6 +1014,13 @@ class TestParseCDLExceptions(unittest.TestCase):
             self.filename,
         )
 
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_cdl,
+            self.filename,
+            stream=True
+        )
+
     #==========================================================================
 
     def testEmptyCD(self):
@@ -1004,6 +1044,13 @@ class TestParseCDLExceptions(unittest.TestCase):
             self.filename,
         )
 
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_cdl,
+            self.filename,
+            stream=True
+        )
+
 class TestWriteCDLFull(unittest.TestCase):
     """Tests a full write of the CDL file
 
@@ -1074,7 +1121,13 @@ class TestWriteCDLFull(unittest.TestCase):
 
         mockOpen.assert_called_once_with('bobs_big_file.cdl', 'wb')
 
-        mockOpen().write.assert_called_once_with(self.target_xml_root)
+        # Output is streamed to the file in pieces
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(
+                [i[0][0] for i in mockOpen().write.call_args_list]
+            )
+        )
 
 
 class TestWriteCDLFullAsCCC(TestWriteCDLFull):
@@ -1124,7 +1177,13 @@ class TestWriteCDLFullAsCCC(TestWriteCDLFull):
 
         mockOpen.assert_called_once_with('bobs_big_file.cdl', 'wb')
 
-        mockOpen().write.assert_called_once_with(self.target_xml_root)
+        # Output is streamed to the file in pieces
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(
+                [i[0][0] for i in mockOpen().write.call_args_list]
+            )
+        )
 
 
 class TestWriteCDLOddAsCCC(TestWriteCDLFullAsCCC):
@@ -1222,7 +1281,13 @@ class TestWriteCDLOddReferenceFix(TestWriteCDLFull):
 
         mockOpen.assert_called_once_with('bobs_big_file.cdl', 'wb')
 
-        mockOpen().write.assert_called_once_with(self.target_xml_root)
+        # Output is streamed to the file in pieces
+        self.assertEqual(
+            self.target_xml_root,
+            enc('').join(
+                [i[0][0] for i in mockOpen().write.call_args_list]
+            )
+        )
 
         cdl_convert.config.HALT_ON_ERROR = False
 
@@ -21,11 +21,15 @@ except ImportError:
     import mock
 import os
 from random import randrange
+import shutil
+from stat import S_ISDIR
 try:
     from StringIO import StringIO
 except ImportError:
     from io import StringIO
 import sys
+import tempfile
+import threading
 import unittest
 
 # Grab our test's path and append the cdL_convert root directory
@@ -345,8 +349,22 @@ class TestParseArgs(unittest.TestCase):
         args = main.parse_args()
 
         self.assertEqual(
-            'inputFile.txt',
-            args.input_file
+            ['inputFile.txt'],
+            args.input_files
+        )
+
+    #==========================================================================
+
+    def testMultipleInputPositionalArgs(self):
+        """Tests that multiple inputs are all gotten"""
+
+        sys.argv = ['scriptname', 'inputFile.txt', 'dir/', '*.cc']
+
+        args = main.parse_args()
+
+        self.assertEqual(
+            ['inputFile.txt', 'dir/', '*.cc'],
+            args.input_files
         )
 
     #==========================================================================
@@ -461,6 +479,77 @@ class TestParseArgs(unittest.TestCase):
 
     #==========================================================================
 
+    def testFastMath(self):
+        """Tests that providing the --fast-math flag triggers FAST_MATH"""
+        self.assertFalse(
+            cdl_convert.config.FAST_MATH
+        )
+
+        sys.argv = ['scriptname', 'inputFile', '--fast-math']
+
+        main.parse_args()
+
+        self.assertTrue(
+            cdl_convert.config.FAST_MATH
+        )
+
+        cdl_convert.config.FAST_MATH = False
+
+    #==========================================================================
+
+    def testSkipUnchanged(self):
+        """Tests that --skip-unchanged triggers SKIP_UNCHANGED"""
+        self.assertFalse(
+            cdl_convert.config.SKIP_UNCHANGED
+        )
+
+        sys.argv = ['scriptname', 'inputFile', '--skip-unchanged']
+
+        main.parse_args()
+
+        self.assertTrue(
+            cdl_convert.config.SKIP_UNCHANGED
+        )
+
+        cdl_convert.config.SKIP_UNCHANGED = False
+
+    #==========================================================================
+
+    def testAtomic(self):
+        """Tests that --atomic triggers ATOMIC_WRITES but not FSYNC"""
+        sys.argv = ['scriptname', 'inputFile', '--atomic']
+
+        main.parse_args()
+
+        self.assertTrue(
+            cdl_convert.config.ATOMIC_WRITES
+        )
+        self.assertFalse(
+            cdl_convert.config.FSYNC
+        )
+
+        cdl_convert.config.ATOMIC_WRITES = False
+
+    #==========================================================================
+
+    def testFsync(self):
+        """Tests that --fsync triggers both FSYNC and ATOMIC_WRITES"""
+        sys.argv = ['scriptname', 'inputFile', '--fsync']
+
+        main.parse_args()
+
+        self.assertTrue(
+            cdl_convert.config.ATOMIC_WRITES
+        )
+        self.assertTrue(
+            cdl_convert.config.FSYNC
+        )
+
+        cdl_convert.config.ATOMIC_WRITES = False
+        cdl_convert.config.FSYNC = False
+
+    #==========================================================================
+
     def testSanityCheck(self):
         """Tests the sanity check --check flag to be set"""
 
@@ -500,6 +589,50 @@ class TestParseArgs(unittest.TestCase):
 
     #==========================================================================
 
+    def testCache(self):
+        """Tests that --cache was picked up correctly"""
+
+        sys.argv = ['scriptname', 'inputFile', '--cache', '/farm/cache/']
+
+        args = main.parse_args()
+
+        self.assertEqual(
+            '/farm/cache/',
+            args.cache
+        )
+
+    #==========================================================================
+
+    def testWriters(self):
+        """Tests that --writers and --writer-pool were picked up correctly"""
+
+        sys.argv = ['scriptname', 'inputFile']
+        args = main.parse_args()
+        self.assertEqual(None, args.writers)
+        self.assertEqual('thread', args.writer_pool)
+
+        sys.argv = [
+            'scriptname', 'inputFile', '--writers', '8',
+            '--writer-pool', 'process'
+        ]
+        args = main.parse_args()
+        self.assertEqual(8, args.writers)
+        self.assertEqual('process', args.writer_pool)
+
+    #==========================================================================
+
+    def testBadWriters(self):
+        """Tests that fewer than one writer is rejected"""
+
+        sys.argv = ['scriptname', 'inputFile', '--writers', '0']
+
+        self.assertRaises(
+            ValueError,
+            main.parse_args
+        )
+
+    #==========================================================================
+
     def testNoDestination(self):
         """Tests that no destination defaults to ./converted"""
 
@@ -533,7 +666,7 @@ class TestParseFile(unittest.TestCase):
     """Tests ParseFile, a convenience function"""
 
     def setUp(self):
-        self.stored_inputs = parse.INPUT_FORMATS
+        self.stored_inputs = dict(parse.INPUT_FORMATS)
 
     def tearDown(self):
         parse.INPUT_FORMATS = self.stored_inputs
@@ -611,6 +744,51 @@ class TestParseFile(unittest.TestCase):
 
         mockParse.assert_called_once_with('blah.cdl')
 
+# iter_file() =================================================================
+
+
+class TestIterFile(unittest.TestCase):
+    """Tests iter_file, the lazy counterpart to parse_file"""
+
+    def setUp(self):
+        self.stored_iters = dict(parse.ITER_FORMATS)
+
+    def tearDown(self):
+        parse.ITER_FORMATS.clear()
+        parse.ITER_FORMATS.update(self.stored_iters)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+
+    def test_derived_type(self):
+        """Tests that the iterator is chosen from the file extension"""
+        mockIter = mock.MagicMock()
+        parse.ITER_FORMATS['ccc'] = mockIter
+
+        parse.iter_file('blah.CCC')
+
+        mockIter.assert_called_once_with('blah.CCC')
+
+    #==========================================================================
+
+    def test_given_type(self):
+        """Tests that a provided filetype overrides the extension"""
+        mockIter = mock.MagicMock()
+        parse.ITER_FORMATS['rcdl'] = mockIter
+
+        parse.iter_file('blah.cdl', 'rcdl')
+
+        mockIter.assert_called_once_with('blah.cdl')
+
+    #==========================================================================
+
+    def test_all_inputs_iterable(self):
+        """Tests that every input format has a matching iterator"""
+        self.assertEqual(
+            sorted(parse.INPUT_FORMATS.keys()),
+            sorted(parse.ITER_FORMATS.keys())
+        )
+
 # main() ======================================================================
 
 
@@ -1296,6 +1474,664 @@ class TestMain(unittest.TestCase):
             [mock.call(self.cdl), mock.call(self.cdl), mock.call(self.cdl)]
         )
 
+# expand_inputs() & batch main() ==============================================
+
+
+class TestBatch(unittest.TestCase):
+    """Tests converting many input files in one run"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.files = {}
+        for name in ['a.cc', 'b.CC', 'notes.txt', 'sub/c.cc', 'sub/d.cdl']:
+            path = os.path.join(self.root, name)
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write('')
+            self.files[name] = path
+        self.inputFormats = parse.INPUT_FORMATS
+        self.sysargv = sys.argv
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    #==========================================================================
+
+    def tearDown(self):
+        parse.INPUT_FORMATS = self.inputFormats
+        sys.argv = self.sysargv
+        sys.stdout = self.stdout
+        shutil.rmtree(self.root)
+        cdl_convert.reset_all()
+        cdl_convert.config.HALT_ON_ERROR = False
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testExpandDirectory(self):
+        """Tests directories are walked for supported formats only"""
+        self.assertEqual(
+            [self.files[i] for i in ['a.cc', 'b.CC', 'sub/c.cc', 'sub/d.cdl']],
+            main.expand_inputs([self.root])
+        )
+
+    #==========================================================================
+
+    def testExpandGlob(self):
+        """Tests glob patterns are expanded and duplicates dropped"""
+        self.assertEqual(
+            [self.files['a.cc'], self.files['sub/c.cc'], 'missing.cc'],
+            main.expand_inputs(
+                [
+                    os.path.join(self.root, '*.cc'),
+                    os.path.join(self.root, '*', '*.cc'),
+                    self.files['a.cc'],
+                    'missing.cc',
+                ]
+            )
+        )
+
+    #==========================================================================
+
+    def testExpandUnmatchedGlob(self):
+        """Tests a glob with no matches is kept, so it can be reported"""
+        self.assertEqual(
+            ['nothing*.cc'],
+            main.expand_inputs(['nothing*.cc'])
+        )
+
+    #==========================================================================
+
+    def testMainBatch(self):
+        """Tests every file is converted, with registries reset between"""
+        ids = []
+
+        def fake_parse(filepath):
+            # Every file uses the same id, which would collide without
+            # a reset between files.
+            if filepath.endswith('b.CC'):
+                raise ValueError('bad file')
+            cdl = cdl_convert.ColorCorrection('sameId', filepath)
+            ids.append(cdl.id)
+            return cdl
+
+        mockInputs = dict(self.inputFormats)
+        mockInputs['cc'] = fake_parse
+        parse.INPUT_FORMATS = mockInputs
+
+        sys.argv = [
+            'scriptname', self.files['a.cc'], self.files['b.CC'],
+            self.files['sub/c.cc'], '-d', self.root, '--no-output'
+        ]
+
+        self.assertEqual(
+            1,
+            main.main()
+        )
+
+        self.assertEqual(
+            ['sameId', 'sameId'],
+            ids
+        )
+
+        output = sys.stdout.getvalue()
+        self.assertTrue(
+            'Converted 2 of 3 files.' in output
+        )
+        self.assertTrue(
+            '{0}: ValueError: bad file'.format(self.files['b.CC']) in output
+        )
+
+    #==========================================================================
+
+    def testMainBatchHalt(self):
+        """Tests that --halt stops the run at the first failed file"""
+        mockParse = mock.MagicMock(side_effect=ValueError('bad file'))
+
+        mockInputs = dict(self.inputFormats)
+        mockInputs['cc'] = mockParse
+        parse.INPUT_FORMATS = mockInputs
+
+        sys.argv = [
+            'scriptname', self.files['a.cc'], self.files['sub/c.cc'],
+            '-d', self.root, '--halt'
+        ]
+
+        self.assertRaises(
+            ValueError,
+            main.main
+        )
+
+        mockParse.assert_called_once_with(self.files['a.cc'])
+
+    #==========================================================================
+
+    def testConvertManyJobs(self):
+        """Tests a process pool converts files and reports in order"""
+        for name in ['a.cc', 'sub/c.cc']:
+            cdl = cdl_convert.ColorCorrection('sameId')
+            cdl.slope = (1.1, 1.2, 1.3)
+            cdl._file_out = self.files[name]
+            cdl_convert.write_cc(cdl)
+            cdl_convert.reset_all()
+
+        dest = os.path.join(self.root, 'out')
+        os.makedirs(dest)
+
+        results = list(
+            cdl_convert.convert_many(
+                [self.files['a.cc'], self.files['b.CC'],
+                 self.files['sub/c.cc']],
+                dest, jobs=2, output=['rcdl']
+            )
+        )
+
+        self.assertEqual(
+            [self.files['a.cc'], self.files['b.CC'], self.files['sub/c.cc']],
+            [i[0] for i in results]
+        )
+        self.assertEqual(
+            [True, False, True],
+            [i[1] is None for i in results]
+        )
+        # Both inputs share an id, which only works if each was converted
+        # with fresh registries.
+        self.assertEqual(
+            ['sameId.rcdl'],
+            os.listdir(dest)
+        )
+        self.assertTrue(
+            'Writing cdl sameId to' in sys.stdout.getvalue()
+        )
+
+    #==========================================================================
+
+    def testConvertManyBadJobs(self):
+        """Tests that fewer than one job is rejected"""
+        self.assertRaises(
+            ValueError,
+            list,
+            cdl_convert.convert_many([self.files['a.cc']], '', jobs=0)
+        )
+
+    #==========================================================================
+
+    def testConvertManyBadOption(self):
+        """Tests that options convert_file doesn't take are rejected"""
+        self.assertRaises(
+            TypeError,
+            list,
+            cdl_convert.convert_many([self.files['a.cc']], '', outputs=['cc'])
+        )
+
+    #==========================================================================
+
+    def testConvertManyKeepsMembers(self):
+        """Tests converting in this process leaves the caller's ids alone"""
+        for name in ['a.cc', 'sub/c.cc']:
+            cdl = cdl_convert.ColorCorrection('sameId')
+            cdl.slope = (1.1, 1.2, 1.3)
+            cdl._file_out = self.files[name]
+            cdl_convert.write_cc(cdl)
+            cdl_convert.reset_all()
+
+        mine = cdl_convert.ColorCorrection('sameId')
+        dest = os.path.join(self.root, 'out')
+        os.makedirs(dest)
+
+        results = list(
+            cdl_convert.convert_many(
+                [self.files['a.cc'], self.files['sub/c.cc']],
+                dest, output=['rcdl']
+            )
+        )
+
+        self.assertEqual(
+            [None, None],
+            [i[1] for i in results]
+        )
+        # Neither file's correction was renamed around ours, or each other.
+        self.assertEqual(
+            ['sameId.rcdl'],
+            os.listdir(dest)
+        )
+        self.assertEqual(
+            {'sameId': mine},
+            cdl_convert.ColorCorrection.members
+        )
+
+
+
+class TestWriteMany(unittest.TestCase):
+    """Tests writing the corrections of a collection with a pool"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.ccc = cdl_convert.ColorCollection()
+        for i in range(12):
+            cc = cdl_convert.ColorCorrection('shot{0:02d}'.format(i))
+            cc.slope = (1.0 + i / 10.0, 1.1, 1.2)
+            cc.sat = 0.5
+            cc.desc = 'grade {0}'.format(i)
+            self.ccc.append_child(cc)
+        self.ccc._file_out = os.path.join(self.root, 'shots.ccc')
+        cdl_convert.write_ccc(self.ccc)
+
+        self.sysargv = sys.argv
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    #==========================================================================
+
+    def tearDown(self):
+        sys.argv = self.sysargv
+        sys.stdout = self.stdout
+        shutil.rmtree(self.root)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def _write(self, pool):
+        """Writes every correction with 3 writers of the given pool"""
+        dest = os.path.join(self.root, pool)
+        os.makedirs(dest)
+        for cc in self.ccc.color_corrections:
+            cc.determine_dest('cc', dest)
+
+        write.write_many(
+            self.ccc.color_corrections, 'cc', workers=3,
+            processes=pool == 'process', backlog=2
+        )
+
+        self.assertEqual(
+            ['shot{0:02d}.cc'.format(i) for i in range(12)],
+            sorted(os.listdir(dest))
+        )
+
+    #==========================================================================
+
+    def testThreads(self):
+        """Tests every correction is written on a thread pool"""
+        self._write('thread')
+        for cc in self.ccc.color_corrections:
+            with open(cc.file_out, 'rb') as cc_file:
+                self.assertEqual(cc.xml_root, cc_file.read())
+
+    #==========================================================================
+
+    def testProcesses(self):
+        """Tests corrections rebuilt in worker processes write the same XML"""
+        self._write('process')
+        for cc in self.ccc.color_corrections:
+            with open(cc.file_out, 'rb') as cc_file:
+                self.assertEqual(cc.xml_root, cc_file.read())
+
+    #==========================================================================
+
+    def testFirstError(self):
+        """Tests every write finishes before the first error is raised"""
+        written = []
+
+        def fake_write(cdl):
+            if cdl.id in ['shot03', 'shot07']:
+                raise ValueError(cdl.id)
+            written.append(cdl.id)
+
+        mockOutputs = dict(write.OUTPUT_FORMATS)
+        mockOutputs['cc'] = fake_write
+
+        with mock.patch('cdl_convert.write.OUTPUT_FORMATS', mockOutputs):
+            with self.assertRaises(ValueError) as context:
+                write.write_many(
+                    self.ccc.color_corrections, 'cc', workers=3, backlog=2
+                )
+
+        self.assertEqual('shot03', str(context.exception))
+        self.assertEqual(10, len(written))
+
+    #==========================================================================
+
+    def testMainSingle(self):
+        """Tests --single fans a collection out across --writers"""
+        dest = os.path.join(self.root, 'out')
+        sys.argv = [
+            'scriptname', self.ccc.file_out, '-o', 'cc', '--single',
+            '-d', dest, '--writers', '3', '--writer-pool', 'process'
+        ]
+        cdl_convert.reset_all()
+
+        self.assertEqual(0, main.main())
+
+        self.assertEqual(
+            ['shot{0:02d}.cc'.format(i) for i in range(12)],
+            sorted(os.listdir(dest))
+        )
+        self.assertTrue(
+            'Wrote 12 cc files in' in sys.stdout.getvalue()
+        )
+
+
+
+class TestSkipUnchanged(unittest.TestCase):
+    """Tests outputs that wouldn't change aren't rewritten"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cc = cdl_convert.ColorCorrection('shot010')
+        self.cc.slope = (1.1, 1.2, 1.3)
+        self.cc.sat = 0.8
+        self.cc.determine_dest('cc', self.root)
+        cdl_convert.write_cc(self.cc)
+        self._age(self.cc.file_out)
+
+        cdl_convert.config.SKIP_UNCHANGED = True
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.config.SKIP_UNCHANGED = False
+        shutil.rmtree(self.root)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def _age(self, filepath):
+        """Sets the modification time of filepath well into the past"""
+        os.utime(filepath, (1000000000, 1000000000))
+
+    #==========================================================================
+
+    def _read(self, filepath):
+        """Returns the bytes held by filepath"""
+        with open(filepath, 'rb') as out_file:
+            return out_file.read()
+
+    #==========================================================================
+
+    def testUnchanged(self):
+        """Tests an unchanged output keeps its modification time"""
+        cdl_convert.write_cc(self.cc)
+
+        self.assertEqual(1000000000, os.path.getmtime(self.cc.file_out))
+        self.assertEqual(self.cc.xml_root, self._read(self.cc.file_out))
+
+    #==========================================================================
+
+    def testChanged(self):
+        """Tests changed outputs are written, even at the same size"""
+        self.cc.slope = (1.1, 1.2, 1.4)
+        cdl_convert.write_cc(self.cc)
+
+        self.assertNotEqual(1000000000, os.path.getmtime(self.cc.file_out))
+        self.assertEqual(self.cc.xml_root, self._read(self.cc.file_out))
+
+        self._age(self.cc.file_out)
+        self.cc.desc = 'a new note'
+        cdl_convert.write_cc(self.cc)
+
+        self.assertNotEqual(1000000000, os.path.getmtime(self.cc.file_out))
+        self.assertEqual(self.cc.xml_root, self._read(self.cc.file_out))
+
+    #==========================================================================
+
+    def testMissing(self):
+        """Tests outputs that don't exist yet are written"""
+        self.cc.determine_dest('rcdl', self.root)
+        cdl_convert.write_rnh_cdl(self.cc)
+
+        self.assertEqual(
+            b'1.1 1.2 1.3 0.0 0.0 0.0 1.0 1.0 1.0 0.8',
+            self._read(self.cc.file_out)
+        )
+
+    #==========================================================================
+
+    def testNotWrittenOnError(self):
+        """Tests a failed write leaves the existing output alone"""
+        before = self._read(self.cc.file_out)
+        with mock.patch.object(
+                cdl_convert.ColorCorrection, 'write_xml',
+                side_effect=ValueError('bad node')
+        ):
+            self.assertRaises(ValueError, cdl_convert.write_cc, self.cc)
+
+        self.assertEqual(before, self._read(self.cc.file_out))
+
+    #==========================================================================
+
+    def testCollection(self):
+        """Tests collection outputs are compared the same way"""
+        ccc = cdl_convert.ColorCollection()
+        ccc.append_child(self.cc)
+        ccc._file_out = os.path.join(self.root, 'show.ccc')
+        cdl_convert.write_ccc(ccc)
+        self._age(ccc.file_out)
+
+        cdl_convert.write_ccc(ccc)
+        self.assertEqual(1000000000, os.path.getmtime(ccc.file_out))
+
+        cdl_convert.write_cdl(ccc)
+        self.assertNotEqual(1000000000, os.path.getmtime(ccc.file_out))
+
+    #==========================================================================
+
+    def testProcesses(self):
+        """Tests writer processes skip unchanged outputs too"""
+        ccs = [self.cc]
+        for i in range(3):
+            cc = cdl_convert.ColorCorrection('shot02{0}'.format(i))
+            cc.sat = 0.5
+            cc.determine_dest('cc', self.root)
+            cdl_convert.write_cc(cc)
+            self._age(cc.file_out)
+            ccs.append(cc)
+        ccs[-1].sat = 0.6
+
+        write.write_many(ccs, 'cc', workers=2, processes=True)
+
+        self.assertEqual(
+            [True, True, True, False],
+            [os.path.getmtime(cc.file_out) == 1000000000 for cc in ccs]
+        )
+
+
+
+class TestAtomicWrites(unittest.TestCase):
+    """Tests outputs are renamed into place, and synced when asked to"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cc = cdl_convert.ColorCorrection('shot010')
+        self.cc.slope = (1.1, 1.2, 1.3)
+        self.cc.determine_dest('cc', self.root)
+
+        cdl_convert.config.ATOMIC_WRITES = True
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.config.ATOMIC_WRITES = False
+        cdl_convert.config.FSYNC = False
+        shutil.rmtree(self.root)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testWrite(self):
+        """Tests an atomic write leaves just the output, as open would"""
+        cdl_convert.write_cc(self.cc)
+
+        with open(self.cc.file_out, 'rb') as cc_file:
+            self.assertEqual(self.cc.xml_root, cc_file.read())
+        self.assertEqual(['shot010.cc'], os.listdir(self.root))
+
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(
+            0o666 & ~umask,
+            os.stat(self.cc.file_out).st_mode & 0o777
+        )
+
+    #==========================================================================
+
+    def testKeepsMode(self):
+        """Tests replacing an output keeps the mode it had"""
+        cdl_convert.write_cc(self.cc)
+        os.chmod(self.cc.file_out, 0o640)
+
+        self.cc.sat = 0.5
+        cdl_convert.write_cc(self.cc)
+
+        self.assertEqual(0o640, os.stat(self.cc.file_out).st_mode & 0o777)
+
+    #==========================================================================
+
+    def testFailedWrite(self):
+        """Tests a failed write keeps the old output and removes its temp"""
+        cdl_convert.write_cc(self.cc)
+        with open(self.cc.file_out, 'rb') as cc_file:
+            before = cc_file.read()
+
+        with mock.patch.object(
+                cdl_convert.ColorCorrection, 'write_xml',
+                side_effect=ValueError('bad node')
+        ):
+            self.assertRaises(ValueError, cdl_convert.write_cc, self.cc)
+
+        with open(self.cc.file_out, 'rb') as cc_file:
+            self.assertEqual(before, cc_file.read())
+        self.assertEqual(['shot010.cc'], os.listdir(self.root))
+
+    #==========================================================================
+
+    def testFsync(self):
+        """Tests each output and its directory are synced"""
+        cdl_convert.config.FSYNC = True
+
+        renamed = []
+
+        def fsync(handle):
+            """Records if the output was in place when a file was synced"""
+            if not S_ISDIR(os.fstat(handle).st_mode):
+                renamed.append(os.path.exists(self.cc.file_out))
+
+        with mock.patch('os.fsync', side_effect=fsync) as fsync_mock:
+            cdl_convert.write_cc(self.cc)
+
+        self.assertEqual(2, fsync_mock.call_count)
+        self.assertEqual([False], renamed)
+
+        with mock.patch('os.fsync') as fsync_mock:
+            cdl_convert.write_cc(self.cc)
+            cdl_convert.write_rnh_cdl(self.cc)
+
+        self.assertEqual(4, fsync_mock.call_count)
+
+    #==========================================================================
+
+    def testBatch(self):
+        """Tests a batch syncs each directory once, when it ends"""
+        cdl_convert.config.FSYNC = True
+        other = os.path.join(self.root, 'other')
+        os.makedirs(other)
+        ccs = []
+        for i in range(6):
+            cc = cdl_convert.ColorCorrection('shot02{0}'.format(i))
+            cc.determine_dest('cc', other if i % 2 else self.root)
+            ccs.append(cc)
+
+        synced = []
+        directories = []
+
+        def fsync(handle):
+            """Records each file synced, and which directory was synced"""
+            stat = os.fstat(handle)
+            if not S_ISDIR(stat.st_mode):
+                synced.append(handle)
+            else:
+                directories.append(os.path.samestat(stat, os.stat(other)))
+
+        with mock.patch('os.fsync', side_effect=fsync):
+            with cdl_convert.batch_writes():
+                with cdl_convert.batch_writes():
+                    cdl_convert.write_many(ccs, 'cc', workers=3)
+                self.assertEqual(6, len(synced))
+                self.assertEqual([], directories)
+
+        self.assertEqual([False, True], sorted(directories))
+        self.assertEqual(4, len(os.listdir(self.root)))
+        self.assertEqual(3, len(os.listdir(other)))
+
+    #==========================================================================
+
+    def testBatchThreadLocal(self):
+        """Tests a batch only defers syncs on the thread that opened it"""
+        cdl_convert.config.FSYNC = True
+
+        with mock.patch('os.fsync') as fsync:
+            with cdl_convert.batch_writes():
+                thread = threading.Thread(
+                    target=cdl_convert.write_cc, args=(self.cc, )
+                )
+                thread.start()
+                thread.join()
+                self.assertEqual(2, fsync.call_count)
+
+        self.assertEqual(2, fsync.call_count)
+
+    #==========================================================================
+
+    def testProcessBatch(self):
+        """Tests writer processes leave their directories to the batch"""
+        cdl_convert.config.FSYNC = True
+        chunk = [(cdl_convert.cache._dump_cc(self.cc), self.cc.file_out)]
+        settings = dict(
+            (name, getattr(cdl_convert.config, name))
+            for name in cdl_convert.config.PROCESS_SETTINGS
+        )
+
+        with mock.patch('os.fsync') as fsync:
+            outputs, directories, error = write._write_isolated(
+                'cc', chunk, settings, batched=True
+            )
+
+        self.assertEqual(1, fsync.call_count)
+        self.assertEqual([self.root], directories)
+        self.assertEqual(([], None), (outputs, error))
+
+    #==========================================================================
+
+    def testBatchWithoutFsync(self):
+        """Tests a batch only syncs anything when FSYNC is on"""
+        with mock.patch('os.fsync') as fsync:
+            with cdl_convert.batch_writes():
+                cdl_convert.write_cc(self.cc)
+
+        self.assertFalse(fsync.called)
+
 # Test Classes ================================================================
 
 # TimeCodeSegment is from my SMTPE Timecode gist at:
@@ -1666,6 +2502,53 @@ class TestToDecimal(unittest.TestCase):
             value
         )
 
+
+class TestToFloat(unittest.TestCase):
+    """Some quick tests for ToFloat"""
+
+    def testString(self):
+        """Tests string conversions"""
+        result = utils.to_float('1')
+        self.assertEqual(
+            1.0,
+            result
+        )
+        self.assertTrue(
+            type(result) is float
+        )
+
+    def testStringBad(self):
+        """Tests not a number string conversions"""
+        self.assertRaises(
+            TypeError,
+            utils.to_float,
+            'banana'
+        )
+
+    def testNotFinite(self):
+        """Tests nan and inf are rejected like they are for Decimals"""
+        for value in ['nan', 'inf', '-inf', float('nan'), float('inf')]:
+            self.assertRaises(
+                TypeError,
+                utils.to_float,
+                value
+            )
+
+    def testNumberConversion(self):
+        """Tests int and Decimal conversions"""
+        self.assertEqual(
+            [323628378921398.0, 1.25, 0.5],
+            [utils.to_float(i) for i in [323628378921398, Decimal('1.25'), 0.5]]
+        )
+
+    def testUnsupportedType(self):
+        """Tests passing an unsupported type conversions"""
+        self.assertRaises(
+            ValueError,
+            utils.to_float,
+            ('1.0', '2.0')
+        )
+
 #==============================================================================
 # FUNCTIONS
 #==============================================================================
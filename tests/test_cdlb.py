@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+"""
+Tests the binary CDLB format
+
+REQUIREMENTS:
+
+mock
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+from decimal import Decimal
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+CDL = u"""<?xml version="1.0" encoding="UTF-8"?>
+<ColorDecisionList xmlns="urn:ASC:CDL:v1.01">
+    <Description>CDL description 1</Description>
+    <Description>CDL description 2</Description>
+    <InputDescription>CDL Input Desc Text</InputDescription>
+    <ViewingDescription>CDL Viewing Desc Text</ViewingDescription>
+    <ColorDecision>
+        <Description>CD description 1</Description>
+        <InputDescription>CD Input Desc Text</InputDescription>
+        <MediaRef ref="/best/path/ever.dpx"/>
+        <ColorCorrection id="014_xf_seqGrade_v01">
+            <Description>CC description 1 é</Description>
+            <InputDescription>Input Desc Text</InputDescription>
+            <ViewingDescription>Viewing Desc Text</ViewingDescription>
+            <SOPNode>
+                <Description>Sop description 1</Description>
+                <Slope>1.014 1.0104 0.62</Slope>
+                <Offset>-0.00315 -0.00124 0.3103</Offset>
+                <Power>1.0 0.9983 1.0</Power>
+            </SOPNode>
+            <SATNode>
+                <Description>Sat description 1</Description>
+                <Saturation>1.09</Saturation>
+            </SATNode>
+        </ColorCorrection>
+    </ColorDecision>
+    <ColorDecision>
+        <MediaRef ref="http://www.google.com/logo.jpg"/>
+        <ColorCorrectionRef ref="014_xf_seqGrade_v01"/>
+    </ColorDecision>
+    <ColorDecision>
+        <ColorCorrectionRef ref="missingRef"/>
+    </ColorDecision>
+    <ColorDecision>
+        <ColorCorrection id="burp_200.x15">
+            <SatNode>
+                <Saturation>1.00000</Saturation>
+            </SatNode>
+        </ColorCorrection>
+    </ColorDecision>
+    <ColorDecision>
+        <ColorCorrection id="f51.200">
+            <SOPNode>
+                <Slope>0.12345678901234567890 1.0 1.0</Slope>
+                <Offset>0.0 0.0 0.0</Offset>
+                <Power>1.0 1.0 1.0</Power>
+            </SOPNode>
+        </ColorCorrection>
+    </ColorDecision>
+</ColorDecisionList>
+"""
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+class TestCdlbRoundTrip(unittest.TestCase):
+    """Tests writing a collection to .cdlb and reading it back"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        filepath = os.path.join(self.directory, 'show.cdl')
+        with open(filepath, 'wb') as cdl_file:
+            cdl_file.write(CDL.encode('utf-8'))
+        self.cdl = cdl_convert.parse_cdl(filepath)
+        self.cdl.determine_dest(self.directory, 'cdlb')
+        cdl_convert.write_cdlb(self.cdl)
+        cdl_convert.reset_all()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testDetermineDest(self):
+        """Tests the collection type doesn't set the .cdlb extension"""
+        self.assertEqual(
+            os.path.join(self.directory, 'show.cdlb'),
+            self.cdl.file_out
+        )
+        self.assertEqual('cdl', self.cdl.type)
+
+    #==========================================================================
+
+    def testXmlUnchanged(self):
+        """Tests the parsed .cdlb writes exactly the same XML"""
+        parsed = cdl_convert.parse_file(self.cdl.file_out)
+        self.assertEqual(self.cdl.xml, parsed.xml)
+        self.assertEqual('cdl', parsed.type)
+        self.assertEqual(self.cdl.file_out, parsed.file_in)
+
+        parsed.set_to_ccc()
+        self.cdl.set_to_ccc()
+        self.assertEqual(self.cdl.xml, parsed.xml)
+
+    #==========================================================================
+
+    def testDetails(self):
+        """Tests descriptions, MediaRefs and refs are all kept"""
+        parsed = cdl_convert.parse_cdlb(self.cdl.file_out)
+
+        self.assertEqual(
+            ['CDL description 1', 'CDL description 2'], parsed.desc
+        )
+        self.assertEqual('CDL Input Desc Text', parsed.input_desc)
+        self.assertEqual('CDL Viewing Desc Text', parsed.viewing_desc)
+        self.assertEqual(5, len(parsed.color_decisions))
+
+        decision, ref_decision, missing = parsed.color_decisions[:3]
+        self.assertTrue(decision.parent is parsed)
+        self.assertEqual('CD Input Desc Text', decision.input_desc)
+        self.assertEqual(None, decision.viewing_desc)
+        self.assertEqual('/best/path/ever.dpx', decision.media_ref.ref)
+
+        cc = decision.cc
+        self.assertTrue(cc.parent is decision)
+        self.assertEqual([u'CC description 1 é'], cc.desc)
+        self.assertEqual('Viewing Desc Text', cc.viewing_desc)
+        self.assertEqual(['Sop description 1'], cc.sop_node.desc)
+        self.assertEqual(['Sat description 1'], cc.sat_node.desc)
+
+        self.assertTrue(ref_decision.is_ref)
+        self.assertTrue(ref_decision.cc.cc is cc)
+        self.assertEqual(
+            'http://www.google.com/logo.jpg', ref_decision.media_ref.ref
+        )
+        self.assertEqual('missingRef', missing.cc.id)
+        self.assertEqual(None, missing.media_ref)
+
+    #==========================================================================
+
+    def testExactValues(self):
+        """Tests values float64 can't hold exactly come back unchanged"""
+        parsed = cdl_convert.parse_cdlb(self.cdl.file_out)
+        sat_only, precise = [
+            decision.cc for decision in parsed.color_decisions[3:]
+        ]
+
+        self.assertFalse(sat_only.has_sop)
+        self.assertEqual('1.00000', str(sat_only.sat))
+        self.assertEqual(
+            Decimal('0.12345678901234567890'), precise.slope[0]
+        )
+        self.assertEqual(
+            (Decimal('1.014'), Decimal('1.0104'), Decimal('0.62')),
+            parsed.color_decisions[0].cc.slope
+        )
+
+    #==========================================================================
+
+    def testFastMath(self):
+        """Tests a .cdlb reads back as floats under FAST_MATH"""
+        with mock.patch('cdl_convert.config.FAST_MATH', True):
+            parsed = cdl_convert.parse_cdlb(self.cdl.file_out)
+
+        cc = parsed.color_decisions[0].cc
+        self.assertEqual((1.014, 1.0104, 0.62), cc.slope)
+        self.assertEqual(1.09, cc.sat)
+
+    #==========================================================================
+
+    def testCcc(self):
+        """Tests a ccc keeps its type and its direct children"""
+        ccc = cdl_convert.ColorCollection()
+        ccc.set_to_ccc()
+        for i in range(3):
+            cc = cdl_convert.ColorCorrection('shot{0}'.format(i))
+            cc.slope = (1.1, 1.2, 1.3)
+            ccc.append_child(cc)
+        ccc._file_out = os.path.join(self.directory, 'shots.cdlb')
+        cdl_convert.write_cdlb(ccc)
+        cdl_convert.reset_all()
+
+        parsed = cdl_convert.parse_file(ccc.file_out)
+        self.assertEqual('ccc', parsed.type)
+        self.assertEqual(ccc.xml, parsed.xml)
+        self.assertTrue(parsed.color_corrections[0].parent is parsed)
+
+    #==========================================================================
+
+    def testSingleCorrection(self):
+        """Tests a single correction is written in a collection"""
+        cc = cdl_convert.ColorCorrection('shot1')
+        cc.sat = 0.5
+        cc.determine_dest('cdlb', self.directory)
+        cdl_convert.write_cdlb(cc)
+        cdl_convert.reset_all()
+
+        parsed = cdl_convert.parse_cdlb(cc.file_out)
+        self.assertEqual(['shot1'], [c.id for c in parsed.color_corrections])
+
+    #==========================================================================
+
+    def testIterFile(self):
+        """Tests iter_file yields every correction of a .cdlb"""
+        self.assertEqual(
+            ['014_xf_seqGrade_v01', 'burp_200.x15', 'f51.200'],
+            [cc.id for cc in cdl_convert.iter_file(self.cdl.file_out)]
+        )
+
+
+class TestCdlbFile(unittest.TestCase):
+    """Tests random access to a memory mapped .cdlb"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ids = ['shot{0:03d}'.format(i) for i in range(50, 0, -1)]
+        ccc = cdl_convert.ColorCollection()
+        for i, cc_id in enumerate(self.ids):
+            cc = cdl_convert.ColorCorrection(cc_id)
+            cc.slope = (1.0 + i / 100.0, 1.0, 1.0)
+            cc.desc = 'grade {0}'.format(i)
+            ccc.append_child(cc)
+        ccc._file_out = os.path.join(self.directory, 'shots.cdlb')
+        cdl_convert.write_cdlb(ccc)
+        cdl_convert.reset_all()
+
+        self.cdlb = cdl_convert.CdlbFile(ccc.file_out)
+
+    def tearDown(self):
+        self.cdlb.close()
+        shutil.rmtree(self.directory)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testIds(self):
+        """Tests ids are listed in file order"""
+        self.assertEqual(50, len(self.cdlb))
+        self.assertEqual(self.ids, self.cdlb.ids)
+        self.assertEqual('ccc', self.cdlb.type)
+
+    #==========================================================================
+
+    def testGet(self):
+        """Tests looking up a correction decodes only that one"""
+        cc = self.cdlb.get('shot040')
+
+        self.assertEqual('shot040', cc.id)
+        self.assertEqual(Decimal('1.1'), cc.slope[0])
+        self.assertEqual(['grade 10'], cc.desc)
+        self.assertEqual(
+            ['shot040'], list(cdl_convert.ColorCorrection.members.keys())
+        )
+
+    #==========================================================================
+
+    def testGetEnds(self):
+        """Tests the first and last ids in sort order are found"""
+        self.assertEqual('shot001', self.cdlb.get('shot001').id)
+        self.assertEqual('shot050', self.cdlb.get('shot050').id)
+
+    #==========================================================================
+
+    def testGetMissing(self):
+        """Tests looking up an id that isn't stored returns None"""
+        self.assertEqual(None, self.cdlb.get('shot000'))
+        self.assertEqual(None, self.cdlb.get('shot0405'))
+        self.assertEqual(None, self.cdlb.get('zebra'))
+
+    #==========================================================================
+
+    def testContextManager(self):
+        """Tests the file is closed when the with block exits"""
+        with cdl_convert.CdlbFile(self.cdlb.filepath) as cdlb:
+            self.assertEqual('shot025', cdlb.get('shot025').id)
+        self.assertTrue(cdlb._map.closed)
+
+    #==========================================================================
+
+    def testNotCdlb(self):
+        """Tests other files raise ValueError"""
+        filepath = os.path.join(self.directory, 'shots.ccc')
+        with open(filepath, 'wb') as not_cdlb:
+            not_cdlb.write(b'<?xml version="1.0" encoding="UTF-8"?>' * 4)
+        self.assertRaises(ValueError, cdl_convert.CdlbFile, filepath)
+
+        open(filepath, 'wb').close()
+        self.assertRaises(ValueError, cdl_convert.parse_cdlb, filepath)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
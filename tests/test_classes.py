@@ -12,14 +12,20 @@ mock
 #==============================================================================
 
 # Standard Imports
+import copy
 from decimal import Decimal
+from io import BytesIO
 try:
     from unittest import mock
 except ImportError:
     import mock
 import os
+import pickle
 import sys
+import tempfile
+import threading
 import unittest
+from xml.etree import ElementTree
 
 # Grab our test's path and append the cdL_convert root directory
 
@@ -362,6 +368,270 @@ class TestAscDescBase(unittest.TestCase):
             self.node.desc
         )
 
+# AscXMLBase ==================================================================
+
+
+class TestAscXMLBase(unittest.TestCase):
+    """Tests built XML is cached until a node or its children change"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cc = cdl_convert.ColorCorrection('shot1')
+        self.cc.slope = (1.1, 1.2, 1.3)
+        self.cc.sat = 0.9
+        self.ccc = cdl_convert.ColorCollection()
+        self.ccc.append_child(self.cc)
+
+    #--------------------------------------------------------------------------
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testCached(self):
+        """Tests element and xml_root are only built once"""
+        element = self.cc.element
+        xml_root = self.cc.xml_root
+
+        with mock.patch.object(
+                cdl_convert.ColorCorrection, 'build_element'
+        ) as build:
+            self.assertTrue(element is self.cc.element)
+            self.assertTrue(xml_root is self.cc.xml_root)
+            self.assertEqual(
+                xml_root[len('<?xml version="1.0" encoding="UTF-8"?>\n'):],
+                self.cc.xml
+            )
+            self.assertFalse(build.called)
+
+    #==========================================================================
+
+    def testSetters(self):
+        """Tests every setter the XML is built from rebuilds it"""
+        changes = [
+            ('slope', (2.1, 2.2, 2.3), b'<Slope>2.1 2.2 2.3</Slope>'),
+            ('offset', (0.1, 0.2, 0.3), b'<Offset>0.1 0.2 0.3</Offset>'),
+            ('power', (3.1, 3.2, 3.3), b'<Power>3.1 3.2 3.3</Power>'),
+            ('sat', 0.5, b'<Saturation>0.5</Saturation>'),
+            ('desc', 'warmer', b'<Description>warmer</Description>'),
+            ('id', 'shot2', b'id="shot2"'),
+            (
+                'input_desc', 'LogC',
+                b'<InputDescription>LogC</InputDescription>'
+            ),
+            (
+                'viewing_desc', 'Rec709',
+                b'<ViewingDescription>Rec709</ViewingDescription>'
+            ),
+        ]
+        for attr, value, expected in changes:
+            self.cc.element
+            old_xml = self.cc.xml
+            setattr(self.cc, attr, value)
+            self.assertFalse(expected in old_xml, attr)
+            self.assertTrue(expected in self.cc.xml, attr)
+            self.assertTrue(
+                expected in ElementTree.tostring(self.cc.element), attr
+            )
+
+    #==========================================================================
+
+    def testNewNode(self):
+        """Tests a SatNode created on first use rebuilds its parent"""
+        cc = cdl_convert.ColorCorrection('shot2')
+        cc.slope = 1.5
+        self.assertFalse(b'<SATNode>' in cc.xml)
+
+        self.assertEqual(Decimal('1.0'), cc.sat)
+
+        self.assertTrue(b'<SATNode>' in cc.xml)
+
+    #==========================================================================
+
+    def testParents(self):
+        """Tests changes to a child rebuild every parent above it"""
+        self.ccc.xml
+        self.cc.xml
+        self.cc.sop_node.slope = (2.1, 2.2, 2.3)
+
+        self.assertTrue(b'<Slope>2.1 2.2 2.3</Slope>' in self.cc.xml)
+        self.assertTrue(b'<Slope>2.1 2.2 2.3</Slope>' in self.ccc.xml)
+
+    #==========================================================================
+
+    def testDecision(self):
+        """Tests changes to a decision's MediaRef rebuild its collection"""
+        cdl = cdl_convert.ColorCollection()
+        cdl.set_to_cdl()
+        cc = cdl_convert.ColorCorrection('shot2')
+        cc.slope = 1.5
+        media_ref = cdl_convert.MediaRef('/show/shot2/shot2.0001.dpx')
+        cdl.append_child(cdl_convert.ColorDecision(cc, media_ref))
+        self.assertTrue(b'shot2.0001.dpx' in cdl.xml)
+
+        media_ref.filename = 'shot2.0002.dpx'
+
+        self.assertTrue(b'shot2.0002.dpx' in cdl.xml)
+
+        cdl.set_to_ccc()
+
+        self.assertTrue(b'<ColorCorrectionCollection' in cdl.xml)
+
+    #==========================================================================
+
+    def testSharedChild(self):
+        """Tests collections rebuild when a child they share is changed"""
+        old_xml = self.ccc.xml
+        copy = self.ccc.copy_collection()
+        self.assertEqual(old_xml, copy.xml)
+        self.assertTrue(self.cc.parent is copy)
+
+        self.cc.slope = (2.1, 2.2, 2.3)
+
+        self.assertTrue(b'<Slope>2.1 2.2 2.3</Slope>' in self.ccc.xml)
+        self.assertTrue(b'<Slope>2.1 2.2 2.3</Slope>' in copy.xml)
+
+    #==========================================================================
+
+    def testListChanged(self):
+        """Tests a child appended straight to a list rebuilds the collection"""
+        self.ccc.xml
+        cc = cdl_convert.ColorCorrection('shot2')
+        cc.slope = 1.5
+
+        self.ccc.color_corrections.append(cc)
+
+        self.assertTrue(b'id="shot2"' in self.ccc.xml)
+
+    #==========================================================================
+
+    def testChildrenNotCached(self):
+        """Tests building a collection doesn't cache each child's XML"""
+        self.ccc.xml
+        self.ccc.element
+
+        self.assertEqual(None, self.cc._xml_cache)
+
+    #==========================================================================
+
+    def testReferencesNotCached(self):
+        """Tests collections holding references are built every time"""
+        cdl = cdl_convert.ColorCollection()
+        cdl.set_to_cdl()
+        cdl.append_child(
+            cdl_convert.ColorDecision(cdl_convert.ColorCorrectionRef('shot1'))
+        )
+
+        self.assertTrue(b'<Slope>1.1 1.2 1.3</Slope>' in cdl.xml)
+        self.assertEqual(None, cdl._xml_cache)
+
+    #==========================================================================
+
+    def testInPlace(self):
+        """Tests lists changed in place rebuild the XML"""
+        for i in range(2, 5):
+            cc = cdl_convert.ColorCorrection('shot{0}'.format(i))
+            cc.slope = 1.5
+            self.ccc.append_child(cc)
+
+        def written_ids():
+            """Returns the ids in the order write_xml writes them"""
+            xml_file = BytesIO()
+            self.ccc.write_xml(xml_file)
+            return [
+                element.get('id')
+                for element in ElementTree.fromstring(xml_file.getvalue())
+            ]
+
+        changes = [
+            (
+                lambda ccs: ccs.sort(key=lambda cc: cc.id, reverse=True),
+                ['shot4', 'shot3', 'shot2', 'shot1'],
+            ),
+            (
+                lambda ccs: ccs.insert(0, ccs.pop()),
+                ['shot1', 'shot4', 'shot3', 'shot2'],
+            ),
+            (
+                lambda ccs: ccs.__setitem__(1, ccs.pop()),
+                ['shot1', 'shot2', 'shot3'],
+            ),
+            (lambda ccs: ccs.reverse(), ['shot3', 'shot2', 'shot1']),
+        ]
+        for change, expected in changes:
+            self.ccc.xml
+            change(self.ccc.color_corrections)
+            self.assertEqual(expected, written_ids())
+
+        self.ccc.desc.append('reel 1')
+        self.cc.desc += ['warmer']
+        self.assertTrue(b'<Description>reel 1</Description>' in self.ccc.xml)
+        self.assertTrue(b'<Description>warmer</Description>' in self.cc.xml)
+
+    #==========================================================================
+
+    def testListsCopied(self):
+        """Tests desc and children lists copy to and from plain lists"""
+        self.cc.desc = ['warmer']
+        other = cdl_convert.ColorCorrection('shot2')
+        other.desc = self.cc.desc
+
+        self.assertEqual(['warmer'], other.desc)
+        self.assertEqual(list, type(copy.deepcopy(self.cc.desc)))
+        self.assertEqual(
+            [], pickle.loads(pickle.dumps(self.ccc.color_decisions))
+        )
+
+        copied = cdl_convert.ColorCollection()
+        copied.color_corrections = self.ccc.color_corrections
+        self.assertEqual([self.cc], copied.color_corrections)
+
+    #==========================================================================
+
+    def testUnrelatedChange(self):
+        """Tests a change to an unrelated node keeps our cached XML"""
+        xml_root = self.ccc.xml_root
+        other = cdl_convert.ColorCorrection('shot2')
+
+        other.slope = 1.5
+        other.desc.append('warmer')
+
+        self.assertTrue(xml_root is self.ccc.xml_root)
+
+    #==========================================================================
+
+    def testSharedByDecisions(self):
+        """Tests decisions sharing a correction rebuild when it changes"""
+        first = cdl_convert.ColorDecision(self.cc)
+        second = cdl_convert.ColorDecision(self.cc)
+        self.assertTrue(self.cc.parent is second)
+        first.xml
+
+        self.cc.sat = 0.5
+
+        self.assertTrue(b'<Saturation>0.5</Saturation>' in first.xml)
+
+    #==========================================================================
+
+    def testWriteXml(self):
+        """Tests write_xml writes cached XML without building it again"""
+        xml_root = self.ccc.xml_root
+        xml_file = BytesIO()
+
+        with mock.patch.object(
+                cdl_convert.ColorCollection, '_build_element_parts'
+        ) as build:
+            self.ccc.write_xml(xml_file)
+            self.assertFalse(build.called)
+
+        self.assertEqual(xml_root, xml_file.getvalue())
+
 # ColorCollection==============================================================
 
 
@@ -907,6 +1177,74 @@ class TestCollectionChildMethods(unittest.TestCase):
 
     #==========================================================================
 
+    def testAppendDuplicateAfterRename(self):
+        """Tests duplicate detection follows ids renamed after appending"""
+        self.node.append_children(
+            self.color_corrections + self.color_decisions
+        )
+
+        self.color_corrections[0].id = '008'
+
+        # The old id is free again
+        self.assertTrue(
+            self.node.append_child(cdl_convert.ColorCorrection(id='001'))
+        )
+        # And the new id is recognized as a duplicate
+        self.assertFalse(
+            self.node.append_child(
+                cdl_convert.ColorDecision(self.color_corrections[0])
+            )
+        )
+
+        self.assertEqual(
+            ['001', '002', '003', '004', '005', '006', '008'],
+            self.node.id_list
+        )
+
+    #==========================================================================
+
+    def testAppendDuplicateAfterDirectAppend(self):
+        """Tests duplicate detection sees children added to lists directly"""
+        self.node.append_child(self.color_corrections[0])
+        self.node.color_corrections.append(self.color_corrections[1])
+        self.node.color_decisions.append(self.color_decisions[0])
+
+        self.assertFalse(
+            self.node.append_child(
+                cdl_convert.ColorDecision(self.color_corrections[1])
+            )
+        )
+        self.assertFalse(
+            self.node.append_child(self.color_decisions[0].cc)
+        )
+
+        self.assertEqual(
+            ['001', '002', '005'],
+            self.node.id_list
+        )
+
+    #==========================================================================
+
+    def testAppendDuplicateAfterReplace(self):
+        """Tests duplicate detection sees children replaced in place"""
+        self.node.append_children(self.color_corrections[:2])
+        self.assertEqual(['001', '002'], self.node.id_list)
+
+        self.node.color_corrections[0] = self.color_corrections[2]
+
+        # The replaced id is free again
+        self.assertTrue(self.node.append_child(self.color_corrections[0]))
+        # And the id put in its place is recognized as a duplicate
+        self.assertFalse(
+            self.node.append_child(
+                cdl_convert.ColorDecision(self.color_corrections[2])
+            )
+        )
+
+        self.assertEqual(['001', '002', '003'], self.node.id_list)
+
+    #==========================================================================
+
     def testAppendChildren(self):
         """Tries appending multiple children of different types"""
         self.node.append_children(
@@ -1507,6 +1845,29 @@ class TestColorCorrection(unittest.TestCase):
 
     #==========================================================================
 
+    def testIdNonUniqueIdSequence(self):
+        """Tests that repeated collisions count upwards past taken ids"""
+        cdl_convert.reset_all()
+
+        cdl_convert.ColorCorrection('shot', 'file')
+        cdl_convert.ColorCorrection('shot002', 'file')
+
+        self.assertEqual(
+            ['shot001', 'shot003', 'shot004'],
+            [cdl_convert.ColorCorrection('shot', 'file').id for i in range(3)]
+        )
+
+        cdl_convert.reset_all()
+
+        cdl_convert.ColorCorrection('shot', 'file')
+
+        self.assertEqual(
+            'shot001',
+            cdl_convert.ColorCorrection('shot', 'file').id
+        )
+
+    #==========================================================================
+
     def testIdNonUniqueIdOnSet(self):
         """Tests that exception raised when setting a non-unique id."""
         def setId(cdl):
@@ -3242,6 +3603,231 @@ class TestMediaRefGetSequencesPercentDigitUnderscore(TestMediaRefGetSequences):
 
         self.is_seq = True
 
+# Registry ====================================================================
+
+
+class TestRegistry(unittest.TestCase):
+    """Tests isolating node members within Registry instances"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.registry_a = cdl_convert.Registry()
+        self.registry_b = cdl_convert.Registry()
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+        cdl_convert.config.HALT_ON_ERROR = False
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testCurrentRegistryDefault(self):
+        """Tests the class level registry is used outside of any context"""
+        self.assertTrue(
+            cdl_convert.current_registry() is cdl_convert.DEFAULT_REGISTRY
+        )
+
+        cc = cdl_convert.ColorCorrection('shot1')
+
+        self.assertTrue(cc.registry is cdl_convert.DEFAULT_REGISTRY)
+        self.assertTrue(cdl_convert.ColorCorrection.members['shot1'] is cc)
+
+    #==========================================================================
+
+    def testContextManagerNesting(self):
+        """Tests the innermost registry is active, and exiting restores"""
+        with self.registry_a as registry:
+            self.assertTrue(registry is self.registry_a)
+            with self.registry_b:
+                self.assertTrue(
+                    cdl_convert.current_registry() is self.registry_b
+                )
+            self.assertTrue(cdl_convert.current_registry() is self.registry_a)
+
+        self.assertTrue(
+            cdl_convert.current_registry() is cdl_convert.DEFAULT_REGISTRY
+        )
+
+    #==========================================================================
+
+    def testSameIdInTwoRegistries(self):
+        """Tests the same id can be used once in each registry"""
+        cdl_convert.config.HALT_ON_ERROR = True
+
+        cc_a = cdl_convert.ColorCorrection('shot1', registry=self.registry_a)
+        with self.registry_b:
+            cc_b = cdl_convert.ColorCorrection('shot1')
+
+        self.assertEqual('shot1', cc_a.id)
+        self.assertEqual('shot1', cc_b.id)
+        self.assertTrue(
+            self.registry_a.members(cdl_convert.ColorCorrection)['shot1']
+            is cc_a
+        )
+        self.assertTrue(
+            self.registry_b.members(cdl_convert.ColorCorrection)['shot1']
+            is cc_b
+        )
+        self.assertEqual({}, cdl_convert.ColorCorrection.members)
+
+    #==========================================================================
+
+    def testDuplicateIdWithinRegistry(self):
+        """Tests duplicate ids are still numbered within one registry"""
+        with self.registry_a:
+            cdl_convert.ColorCorrection('shot1')
+            cc = cdl_convert.ColorCorrection('shot1')
+
+        self.assertEqual('shot1001', cc.id)
+
+    #==========================================================================
+
+    def testRenameUsesRegistry(self):
+        """Tests changing an id checks against the node's own registry"""
+        cdl_convert.config.HALT_ON_ERROR = True
+
+        cdl_convert.ColorCorrection('shot2')
+        cc = cdl_convert.ColorCorrection('shot1', registry=self.registry_a)
+        cc.id = 'shot2'
+
+        members = self.registry_a.members(cdl_convert.ColorCorrection)
+        self.assertEqual(['shot2'], list(members.keys()))
+
+    #==========================================================================
+
+    def testResolveReference(self):
+        """Tests references resolve within their registry"""
+        cc = cdl_convert.ColorCorrection('shot1', registry=self.registry_a)
+        ref = cdl_convert.ColorCorrectionRef('shot1', registry=self.registry_a)
+        default_ref = cdl_convert.ColorCorrectionRef('shot1')
+
+        self.assertTrue(ref.resolve_reference() is cc)
+        self.assertTrue(ref.cc is cc)
+        self.assertEqual(None, default_ref.resolve_reference())
+        self.assertTrue(
+            default_ref.resolve_reference(registry=self.registry_a) is cc
+        )
+
+    #==========================================================================
+
+    def testDecisionAndMediaRef(self):
+        """Tests ColorDecision and MediaRef register with the registry"""
+        with self.registry_a:
+            cc = cdl_convert.ColorCorrection('shot1')
+            media = cdl_convert.MediaRef('/bob/jim/hamburger.dpx')
+            cd = cdl_convert.ColorDecision(cc, media)
+
+        self.assertTrue(cd.registry is self.registry_a)
+        self.assertEqual(
+            [cd], self.registry_a.members(cdl_convert.ColorDecision)['shot1']
+        )
+        self.assertEqual(
+            [media],
+            self.registry_a.members(cdl_convert.MediaRef)[media.ref]
+        )
+        self.assertEqual({}, cdl_convert.ColorDecision.members)
+        self.assertEqual({}, cdl_convert.MediaRef.members)
+
+    #==========================================================================
+
+    def testParseInRegistry(self):
+        """Tests parsers register everything they build with the registry"""
+        ccc_xml = enc(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<ColorCorrectionCollection xmlns="urn:ASC:CDL:v1.01">\n'
+            '    <ColorCorrection id="shot1">\n'
+            '        <SOPNode>\n'
+            '            <Slope>1.1 1.2 1.3</Slope>\n'
+            '            <Offset>0.1 0.2 0.3</Offset>\n'
+            '            <Power>1.0 1.0 1.0</Power>\n'
+            '        </SOPNode>\n'
+            '    </ColorCorrection>\n'
+            '</ColorCorrectionCollection>\n'
+        )
+        ccc_file, filepath = tempfile.mkstemp(suffix='.ccc')
+        os.write(ccc_file, ccc_xml)
+        os.close(ccc_file)
+
+        try:
+            cdl_convert.config.HALT_ON_ERROR = True
+            col_a = cdl_convert.parse_ccc(filepath, registry=self.registry_a)
+            col_b = cdl_convert.parse_file(filepath, registry=self.registry_b)
+            # Iterating into registry_a again collides with col_a's id
+            cdl_convert.config.HALT_ON_ERROR = False
+            iterated = list(
+                cdl_convert.iter_file(filepath, registry=self.registry_a)
+            )
+        finally:
+            os.remove(filepath)
+
+        self.assertTrue(col_a.registry is self.registry_a)
+        self.assertTrue(col_b.registry is self.registry_b)
+        self.assertEqual('shot1', col_a.color_corrections[0].id)
+        self.assertEqual('shot1', col_b.color_corrections[0].id)
+        self.assertEqual('shot1001', iterated[0].id)
+        self.assertEqual(
+            [col_a], self.registry_a.members(cdl_convert.ColorCollection)
+        )
+        self.assertEqual({}, cdl_convert.ColorCorrection.members)
+        self.assertEqual([], cdl_convert.ColorCollection.members)
+
+    #==========================================================================
+
+    def testReset(self):
+        """Tests resetting a registry leaves the class members alone"""
+        cdl_convert.ColorCorrection('shot1')
+        cdl_convert.ColorCorrection('shot1', registry=self.registry_a)
+
+        self.registry_a.reset()
+
+        self.assertEqual(
+            {}, self.registry_a.members(cdl_convert.ColorCorrection)
+        )
+        self.assertEqual(['shot1'], list(cdl_convert.ColorCorrection.members))
+
+    #==========================================================================
+
+    def testThreadsDoNotShareRegistries(self):
+        """Tests registries entered on one thread aren't seen by another"""
+        cdl_convert.config.HALT_ON_ERROR = True
+        results = {}
+        errors = []
+
+        def convert(name):
+            try:
+                with cdl_convert.Registry() as registry:
+                    for i in range(200):
+                        cdl_convert.ColorCorrection('shot{0}'.format(i))
+                    results[name] = (
+                        registry,
+                        len(registry.members(cdl_convert.ColorCorrection))
+                    )
+            except Exception as err:  # pylint: disable=W0703
+                errors.append(err)
+
+        threads = [
+            threading.Thread(target=convert, args=(i,)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(4, len(set(reg for reg, count in results.values())))
+        self.assertEqual(
+            [200] * 4, [count for reg, count in results.values()]
+        )
+        self.assertEqual({}, cdl_convert.ColorCorrection.members)
+        self.assertTrue(
+            cdl_convert.current_registry() is cdl_convert.DEFAULT_REGISTRY
+        )
+
+
 # SatNode =====================================================================
 
 
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+"""
+Tests the columnar ColorCorrection store
+
+REQUIREMENTS:
+
+numpy (some tests are skipped without it)
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+from decimal import Decimal
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+class TestColumnarCollection(unittest.TestCase):
+    """Tests storing corrections in a ColumnarCollection"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.collection = cdl_convert.ColorCollection()
+
+        self.full = cdl_convert.ColorCorrection('shot1')
+        self.full.slope = (1.1, 1.2, 1.3)
+        self.full.offset = (-0.01, 0.02, 0.03)
+        self.full.power = (0.9, 1.0, 1.1)
+        self.full.sat = 0.75
+        self.full.desc = [u'first é', 'second']
+
+        self.sop_only = cdl_convert.ColorCorrection('shot2')
+        self.sop_only.slope = (2.0, 2.0, 2.0)
+
+        self.sat_only = cdl_convert.ColorCorrection('shot3')
+        self.sat_only.sat = 1.5
+
+        self.collection.append_children(
+            [self.full, self.sop_only, self.sat_only]
+        )
+        self.store = cdl_convert.ColumnarCollection.from_collection(
+            self.collection
+        )
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testLength(self):
+        """Tests every correction becomes a row"""
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(
+            ['shot1', 'shot2', 'shot3'],
+            self.store.ids
+        )
+
+    #==========================================================================
+
+    def testView(self):
+        """Tests a view reads each value back out of the store"""
+        view = self.store[0]
+
+        self.assertEqual('shot1', view.id)
+        self.assertEqual((1.1, 1.2, 1.3), view.slope)
+        self.assertEqual((-0.01, 0.02, 0.03), view.offset)
+        self.assertEqual((0.9, 1.0, 1.1), view.power)
+        self.assertEqual(0.75, view.sat)
+        self.assertEqual([u'first é', 'second'], view.desc)
+        self.assertTrue(view.has_sop)
+        self.assertTrue(view.has_sat)
+
+    #==========================================================================
+
+    def testMissingNodes(self):
+        """Tests missing nodes are stored as identity and flagged"""
+        sop_only = self.store[1]
+        sat_only = self.store[-1]
+
+        self.assertTrue(sop_only.has_sop)
+        self.assertFalse(sop_only.has_sat)
+        self.assertEqual(1.0, sop_only.sat)
+        self.assertEqual([], sop_only.desc)
+
+        self.assertFalse(sat_only.has_sop)
+        self.assertEqual((1.0, 1.0, 1.0), sat_only.slope)
+        self.assertEqual((0.0, 0.0, 0.0), sat_only.offset)
+
+    #==========================================================================
+
+    def testIndexError(self):
+        """Tests indexing past the end raises"""
+        self.assertRaises(IndexError, lambda: self.store[3])
+
+    #==========================================================================
+
+    def testGet(self):
+        """Tests looking a row up by id"""
+        self.assertEqual(1, self.store.get('shot2').index)
+        self.assertEqual(None, self.store.get('shot9'))
+
+        cc = cdl_convert.ColorCorrection('shot4')
+        self.store.append(cc)
+
+        self.assertEqual(3, self.store.get('shot4').index)
+
+    #==========================================================================
+
+    def testMaterialize(self):
+        """Tests materialized corrections write the same XML"""
+        expected = [cc.xml for cc in self.collection.color_corrections]
+        cdl_convert.reset_all()
+
+        collection = self.store.to_collection()
+
+        self.assertEqual(
+            expected,
+            [cc.xml for cc in collection.color_corrections]
+        )
+        self.assertEqual(Decimal('1.1'), collection.color_corrections[0].slope[0])
+
+    #==========================================================================
+
+    def testMaterializeRegistry(self):
+        """Tests materialized corrections register with the given registry"""
+        registry = cdl_convert.Registry()
+
+        cc = self.store[0].materialize(registry=registry)
+
+        self.assertTrue(
+            registry.members(cdl_convert.ColorCorrection)['shot1'] is cc
+        )
+
+    #==========================================================================
+
+    def testDecisions(self):
+        """Tests a cdl style collection stores its decisions' corrections"""
+        cdl_convert.reset_all()
+        collection = cdl_convert.ColorCollection()
+        cc = cdl_convert.ColorCorrection('shot1')
+        cc.sat = 0.5
+        collection.append_child(cdl_convert.ColorDecision(cc))
+        collection.append_child(
+            cdl_convert.ColorDecision(cdl_convert.ColorCorrectionRef('shot1'))
+        )
+
+        store = cdl_convert.ColumnarCollection.from_collection(collection)
+
+        self.assertEqual(['shot1', 'shot1'], store.ids)
+        self.assertEqual(0.5, store[1].sat)
+
+    #==========================================================================
+
+    def testUnresolvedReference(self):
+        """Tests an unresolved reference is skipped, or refused by append"""
+        self.collection.append_child(
+            cdl_convert.ColorDecision(cdl_convert.ColorCorrectionRef('shot9'))
+        )
+
+        store = cdl_convert.ColumnarCollection.from_collection(
+            self.collection
+        )
+
+        self.assertEqual(['shot1', 'shot2', 'shot3'], store.ids)
+        try:
+            store.append(self.collection.color_decisions[0])
+        except ValueError as err:
+            self.assertTrue("'shot9'" in str(err))
+        else:
+            self.fail('Unresolved reference did not raise')
+        self.assertEqual(3, len(store))
+
+    #==========================================================================
+
+    def testLoad(self):
+        """Tests loading a file leaves no parsed objects registered"""
+        self.collection._file_out = os.path.join(
+            tempfile.mkdtemp(), 'show.ccc'
+        )
+        cdl_convert.write_ccc(self.collection)
+        cdl_convert.reset_all()
+
+        try:
+            store = cdl_convert.ColumnarCollection.load(
+                self.collection.file_out
+            )
+        finally:
+            os.remove(self.collection.file_out)
+            os.rmdir(os.path.dirname(self.collection.file_out))
+
+        self.assertEqual(['shot1', 'shot2', 'shot3'], store.ids)
+        self.assertEqual(1.5, store[2].sat)
+        self.assertEqual({}, cdl_convert.ColorCorrection.members)
+
+    #==========================================================================
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def testValues(self):
+        """Tests the values buffer is exposed as an (N, 10) array"""
+        values = self.store.values
+
+        self.assertEqual((3, 10), values.shape)
+        numpy.testing.assert_array_equal(
+            [1.1, 1.2, 1.3, -0.01, 0.02, 0.03, 0.9, 1.0, 1.1, 0.75],
+            values[0]
+        )
+
+    #==========================================================================
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def testApplyCollection(self):
+        """Tests the store grades the same as the collection it came from"""
+        image = numpy.random.RandomState(1).rand(4, 5, 3)
+
+        numpy.testing.assert_array_equal(
+            cdl_convert.apply_collection(self.collection, image),
+            cdl_convert.apply_collection(self.store, image)
+        )
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
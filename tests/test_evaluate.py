@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+"""
+Tests applying ColorCorrections to image arrays
+
+REQUIREMENTS:
+
+numpy (tests are skipped without it)
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def reference_cdl(pixel, slope, offset, power, sat):
+    """Grades a single RGB pixel in pure python, following the ASC spec"""
+    clamp = lambda x: min(max(x, 0.0), 1.0)
+    out = [
+        clamp(pixel[i] * slope[i] + offset[i]) ** power[i] for i in range(3)
+    ]
+    luma = 0.2126 * out[0] + 0.7152 * out[1] + 0.0722 * out[2]
+    return [clamp(luma + sat * (value - luma)) for value in out]
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestApplyCDL(unittest.TestCase):
+    """Tests apply_cdl and ColorCorrection.apply"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.slope = (1.2, 0.9, 1.05)
+        self.offset = (-0.05, 0.02, 0.1)
+        self.power = (0.8, 1.1, 1.5)
+        self.sat = 0.7
+
+        self.cc = cdl_convert.ColorCorrection('shot1')
+        self.cc.slope = self.slope
+        self.cc.offset = self.offset
+        self.cc.power = self.power
+        self.cc.sat = self.sat
+
+        rand = numpy.random.RandomState(7)
+        self.image = rand.uniform(-0.1, 1.1, (17, 23, 3))
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testMatchesReference(self):
+        """Tests every pixel matches a per-pixel python implementation"""
+        expected = numpy.array([
+            [
+                reference_cdl(
+                    pixel, self.slope, self.offset, self.power, self.sat
+                ) for pixel in row
+            ] for row in self.image
+        ])
+
+        result = cdl_convert.apply_cdl(self.image, self.cc)
+
+        self.assertTrue(result is self.image)
+        numpy.testing.assert_allclose(expected, result, atol=1e-12)
+
+    #==========================================================================
+
+    def testFloat32(self):
+        """Tests float32 images stay float32 and match float64 results"""
+        image32 = self.image.astype(numpy.float32)
+
+        self.cc.apply(image32)
+        self.cc.apply(self.image)
+
+        self.assertEqual(numpy.float32, image32.dtype)
+        numpy.testing.assert_allclose(self.image, image32, atol=1e-5)
+
+    #==========================================================================
+
+    def testChunkRows(self):
+        """Tests chunked grading matches grading the whole frame"""
+        chunked = self.image.copy()
+
+        self.cc.apply(self.image)
+        self.cc.apply(chunked, chunk_rows=4)
+
+        numpy.testing.assert_array_equal(self.image, chunked)
+
+    #==========================================================================
+
+    def testIdentity(self):
+        """Tests a correction without nodes only clamps, and adds no nodes"""
+        cc = cdl_convert.ColorCorrection('shot2')
+
+        cc.apply(self.image)
+
+        self.assertEqual(0.0, self.image.min())
+        self.assertEqual(1.0, self.image.max())
+        self.assertFalse(cc.has_sop)
+        self.assertFalse(cc.has_sat)
+
+    #==========================================================================
+
+    def testBadImages(self):
+        """Tests unsupported images raise"""
+        self.assertRaises(TypeError, self.cc.apply, [[0.5, 0.5, 0.5]])
+        self.assertRaises(
+            TypeError, self.cc.apply, numpy.zeros((2, 2, 3), dtype=numpy.int32)
+        )
+        self.assertRaises(ValueError, self.cc.apply, numpy.zeros((2, 2, 4)))
+        self.assertRaises(
+            ValueError, self.cc.apply, self.image, chunk_rows=0
+        )
+
+#==============================================================================
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestApplyCollection(unittest.TestCase):
+    """Tests grading one image with every correction of a collection"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        rand = numpy.random.RandomState(3)
+        self.collection = cdl_convert.ColorCollection()
+        for i in range(7):
+            cc = cdl_convert.ColorCorrection('shot{0}'.format(i))
+            cc.slope = rand.uniform(0.8, 1.2, 3).tolist()
+            cc.offset = rand.uniform(-0.05, 0.05, 3).tolist()
+            cc.power = rand.uniform(0.8, 1.2, 3).tolist()
+            # Mix in corrections without saturation
+            if i % 3:
+                cc.sat = rand.uniform(0.5, 1.5)
+            self.collection.append_child(cc)
+
+        self.image = rand.uniform(0.0, 1.0, (9, 11, 3))
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+
+    def graded_one_by_one(self):
+        """Returns the image graded by each correction separately"""
+        return numpy.array([
+            cc.apply(self.image.copy())
+            for cc in self.collection.color_corrections
+        ])
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testMatchesSingleApply(self):
+        """Tests the stacked variants match applying each correction"""
+        original = self.image.copy()
+
+        graded = self.collection.apply(self.image)
+
+        self.assertEqual((7, 9, 11, 3), graded.shape)
+        numpy.testing.assert_allclose(
+            self.graded_one_by_one(), graded, atol=1e-12
+        )
+        numpy.testing.assert_array_equal(original, self.image)
+
+    #==========================================================================
+
+    def testMaxBytes(self):
+        """Tests a memory cap chunks the work without changing results"""
+        numpy.testing.assert_array_equal(
+            cdl_convert.apply_collection(self.collection, self.image),
+            cdl_convert.apply_collection(
+                self.collection, self.image, max_bytes=self.image.nbytes
+            )
+        )
+
+    #==========================================================================
+
+    def testMaxBytesTooSmall(self):
+        """Tests a cap that can't fit one variant raises"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.apply_collection,
+            self.collection, self.image, max_bytes=10
+        )
+
+    #==========================================================================
+
+    def testIterChunks(self):
+        """Tests iterating yields capped chunks of variants, in order"""
+        # Room for 2 outputs and their luma arrays, but not 3
+        max_bytes = self.image.nbytes * 3
+
+        chunks = list(
+            cdl_convert.iter_apply_collection(
+                self.collection, self.image, max_bytes
+            )
+        )
+
+        self.assertEqual([2, 2, 2, 1], [len(i[0]) for i in chunks])
+        self.assertEqual(
+            self.collection.color_corrections,
+            [cc for corrections, graded in chunks for cc in corrections]
+        )
+        numpy.testing.assert_allclose(
+            self.graded_one_by_one(),
+            numpy.concatenate([graded for corrections, graded in chunks]),
+            atol=1e-12
+        )
+
+    #==========================================================================
+
+    def testDecisions(self):
+        """Tests the corrections of a parsed CDL's decisions are applied"""
+        expected = self.graded_one_by_one()
+        self.collection.set_to_cdl()
+        handle, self.collection._file_out = tempfile.mkstemp(suffix='.cdl')
+        os.close(handle)
+        try:
+            cdl_convert.write_cdl(self.collection)
+            cdl_convert.reset_all()
+            cdl = cdl_convert.parse_cdl(self.collection.file_out)
+        finally:
+            os.remove(self.collection.file_out)
+        self.assertEqual([], cdl.color_corrections)
+
+        graded = cdl.apply(self.image)
+
+        self.assertEqual((7, 9, 11, 3), graded.shape)
+        numpy.testing.assert_allclose(expected, graded, atol=1e-12)
+
+    #==========================================================================
+
+    def testReferences(self):
+        """Tests references are resolved, and unresolved ones skipped"""
+        cdl = cdl_convert.ColorCollection()
+        cdl.set_to_cdl()
+        for cc_id in ['shot2', 'missing']:
+            cdl.append_child(
+                cdl_convert.ColorDecision(cdl_convert.ColorCorrectionRef(cc_id))
+            )
+
+        graded = cdl.apply(self.image)
+
+        self.assertEqual((1, 9, 11, 3), graded.shape)
+        numpy.testing.assert_allclose(
+            self.graded_one_by_one()[2], graded[0], atol=1e-12
+        )
+
+    #==========================================================================
+
+    def testList(self):
+        """Tests a plain list of corrections is accepted"""
+        ccs = self.collection.color_corrections[:2]
+
+        graded = cdl_convert.apply_collection(
+            ccs, self.image.astype(numpy.float32)
+        )
+
+        self.assertEqual(numpy.float32, graded.dtype)
+        self.assertEqual((2, 9, 11, 3), graded.shape)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
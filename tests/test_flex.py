@@ -18,6 +18,10 @@ try:
 except ImportError:
     import mock
 import os
+try:
+    from pathlib import Path
+except ImportError:  # pragma: no cover
+    Path = None
 from random import choice
 
 try:
@@ -615,6 +619,113 @@ class TestParseFLExMissingSopSat(TestParseFLExBasic):
             len(self.raw_cdls.all_children)
         )
 
+
+class TestParseFLExMalformedSop(unittest.TestCase):
+    """Tests a FLEx with a 701 record that doesn't hold nine numbers"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.file = (
+            FLEX_HEADER.format(title='Malformed') +
+            FLEX_100 +
+            FLEX_701.format(
+                slopeR='1.0', slopeG='1.0', slopeB='',
+                offsetR='0.0', offsetG='0.0', offsetB='0.0',
+                powerR='1.0', powerG='1.0', powerB='1.0',
+            )
+        )
+
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(enc(self.file))
+            self.filename = f.name
+
+    #==========================================================================
+
+    def tearDown(self):
+        os.remove(self.filename)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testRowNumber(self):
+        """Tests the error names the line of the malformed 701 record"""
+        try:
+            cdl_convert.parse_flex(self.filename)
+        except ValueError as err:
+            self.assertTrue('Line 7 of' in str(err))
+        else:
+            self.fail('Malformed ASC_SOP did not raise')
+
+
+class TestParseFLExStream(unittest.TestCase):
+    """Tests parsing a FLEx from an iterable of lines"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.slope = decimalize(1.329, 0.9833, 1.003)
+        self.offset = decimalize(0.011, 0.013, 0.11)
+        self.power = decimalize(.993, .998, 1.0113)
+
+        self.file = FLEX_HEADER.format(title='Stream') + buildFLExTake(
+            self.slope, self.offset, self.power, Decimal('1.01'),
+            'bb94', 'x103', 'line1'
+        )
+        self.filename = None
+
+    #==========================================================================
+
+    def tearDown(self):
+        if self.filename:
+            os.remove(self.filename)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testLines(self):
+        """Tests a list of lines parses like the file would"""
+        cdls = cdl_convert.parse_flex(self.file.splitlines(True))
+
+        self.assertEqual(['bb94_x103_line1'], cdls.id_list)
+        self.assertEqual(self.slope, cdls.color_corrections[0].slope)
+        self.assertEqual(None, cdls.file_in)
+
+    #==========================================================================
+
+    @unittest.skipIf(Path is None, 'pathlib is not available')
+    def testPath(self):
+        """Tests a pathlib.Path is opened as a filepath"""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+            f.write(self.file)
+            self.filename = f.name
+
+        cdls = cdl_convert.parse_flex(Path(self.filename))
+
+        self.assertEqual(['bb94_x103_line1'], cdls.id_list)
+        self.assertEqual(self.filename, cdls.file_in)
+
+    #==========================================================================
+
+    def testFallbackId(self):
+        """Tests pathless input without slates or a title numbers its ids"""
+        lines = [
+            line for line in self.file.splitlines(True)
+            if not line.startswith(('010', '110'))
+        ]
+
+        cdls = cdl_convert.parse_flex(lines)
+
+        self.assertEqual(['001'], cdls.id_list)
+
 #==============================================================================
 # FUNCTIONS
 #==============================================================================
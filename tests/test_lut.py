@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+"""
+Tests baking ColorCorrections to 3D LUT files
+
+REQUIREMENTS:
+
+numpy (tests are skipped without it)
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+from __future__ import absolute_import, print_function
+
+# Standard Imports
+import os
+import shutil
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+import sys
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+from cdl_convert import cdl_convert as main
+from cdl_convert import write
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestBakeLUT(unittest.TestCase):
+    """Tests evaluating a ColorCorrection over a lattice"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cc = cdl_convert.ColorCorrection('shot1')
+        self.cc.slope = (1.1, 1.0, 0.9)
+        self.cc.offset = (0.01, 0.0, -0.02)
+        self.cc.power = (1.0, 1.2, 0.8)
+        self.cc.sat = 0.8
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testLattice(self):
+        """Tests each lattice point is the graded input for its position"""
+        lut = cdl_convert.bake_lut(self.cc, 5)
+
+        self.assertEqual((5, 5, 5, 3), lut.shape)
+
+        pixel = numpy.array([[[0.25, 0.5, 1.0]]])
+        self.cc.apply(pixel)
+        numpy.testing.assert_allclose(pixel[0, 0], lut[1, 2, 4])
+
+    #==========================================================================
+
+    def testBadSize(self):
+        """Tests lattices need at least 2 points per axis"""
+        self.assertRaises(ValueError, cdl_convert.bake_lut, self.cc, 1)
+
+    #==========================================================================
+
+    def testFormatRows(self):
+        """Tests vectorized formatting matches python string formatting"""
+        values = numpy.random.RandomState(11).rand(1000, 2)
+        values[0] = (0.0, 1.0)
+        ints = numpy.arange(0, 4096, 4.096)[:1000]
+
+        self.assertEqual(
+            ''.join(
+                '%d %.6f %.6f\n' % (numpy.rint(i), row[0], row[1])
+                for i, row in zip(ints, values)
+            ).encode('ascii'),
+            write._format_rows(
+                [(ints, 0), (values[:, 0], 6), (values[:, 1], 6)]
+            )
+        )
+
+#==============================================================================
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestWriteLUT(unittest.TestCase):
+    """Tests the LUT output formats"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.lut_size = cdl_convert.config.LUT_SIZE
+        cdl_convert.config.LUT_SIZE = 3
+        self.directory = tempfile.mkdtemp()
+
+        self.cc = cdl_convert.ColorCorrection('shot1')
+        self.cc.slope = (2.0, 1.0, 1.0)
+        self.cc.offset = (0.0, 0.0, 0.5)
+
+    def tearDown(self):
+        cdl_convert.config.LUT_SIZE = self.lut_size
+        cdl_convert.reset_all()
+        shutil.rmtree(self.directory)
+
+    #==========================================================================
+
+    def write(self, ext):
+        """Writes self.cc to ext and returns the lines written"""
+        self.cc.determine_dest(ext, self.directory)
+        write.OUTPUT_FORMATS[ext](self.cc)
+        with open(self.cc.file_out, 'rb') as lut_file:
+            return lut_file.read().decode('ascii').splitlines()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testCube(self):
+        """Tests .cube output lists red fastest"""
+        lines = self.write('cube')
+
+        self.assertEqual('TITLE "shot1"', lines[0])
+        self.assertEqual('LUT_3D_SIZE 3', lines[1])
+        self.assertEqual(2 + 27, len(lines))
+        self.assertEqual(
+            ['0.000000 0.000000 0.500000',
+             '1.000000 0.000000 0.500000',
+             '1.000000 0.000000 0.500000',
+             '0.000000 0.500000 0.500000'],
+            lines[2:6]
+        )
+        self.assertEqual('1.000000 1.000000 1.000000', lines[-1])
+
+    #==========================================================================
+
+    def testThreeDL(self):
+        """Tests .3dl output lists 12 bit values, blue fastest"""
+        lines = self.write('3dl')
+
+        self.assertEqual('0 512 1023', lines[0])
+        self.assertEqual(1 + 27, len(lines))
+        self.assertEqual(
+            ['0 0 2048', '0 0 4095', '0 0 4095', '0 2048 2048'],
+            lines[1:5]
+        )
+
+    #==========================================================================
+
+    def testSpi3d(self):
+        """Tests .spi3d output lists lattice indices, blue fastest"""
+        lines = self.write('spi3d')
+
+        self.assertEqual(['SPILUT 1.0', '3 3', '3 3 3'], lines[:3])
+        self.assertEqual(3 + 27, len(lines))
+        self.assertEqual('0 0 1 0.000000 0.000000 1.000000', lines[4])
+        self.assertEqual('2 2 2 1.000000 1.000000 1.000000', lines[-1])
+
+    #==========================================================================
+
+    def testWriteMany(self):
+        """Tests many corrections are baked, each to its own file"""
+        ccs = [
+            cdl_convert.ColorCorrection('grade{0}'.format(i))
+            for i in range(6)
+        ]
+        for cc in ccs:
+            cc.sat = 0.5
+            cc.determine_dest('cube', self.directory)
+
+        write.write_many(ccs, 'cube')
+
+        self.assertEqual(
+            sorted('grade{0}.cube'.format(i) for i in range(6)),
+            sorted(os.listdir(self.directory))
+        )
+
+    #==========================================================================
+
+    def testConvertCollection(self):
+        """Tests each correction in a collection is baked to its own LUT"""
+        col = cdl_convert.ColorCollection()
+        for i in range(3):
+            cc = cdl_convert.ColorCorrection('grade{0}'.format(i))
+            cc.slope = (1.0, 1.1, 1.2)
+            cc.sat = 0.9
+            col.append_child(cc)
+        col._file_out = os.path.join(self.directory, 'show.ccc')
+        cdl_convert.write_ccc(col)
+        cdl_convert.reset_all()
+
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            main.convert_file(
+                col.file_out, self.directory, output=['cube', '3dl']
+            )
+        finally:
+            sys.stdout = stdout
+
+        self.assertEqual(
+            sorted(
+                ['show.ccc'] +
+                ['grade{0}.cube'.format(i) for i in range(3)] +
+                ['grade{0}.3dl'.format(i) for i in range(3)]
+            ),
+            sorted(os.listdir(self.directory))
+        )
+
+#==============================================================================
+
+
+class TestLUTArgs(unittest.TestCase):
+    """Tests the --lut-size script argument"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.lut_size = cdl_convert.config.LUT_SIZE
+        self.sysargv = sys.argv
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        cdl_convert.config.LUT_SIZE = self.lut_size
+        sys.argv = self.sysargv
+        sys.stdout = self.stdout
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testLUTSize(self):
+        """Tests --lut-size sets config.LUT_SIZE"""
+        sys.argv = ['scriptname', 'inputFile', '-o', 'cube', '--lut-size', '65']
+
+        args = main.parse_args()
+
+        self.assertEqual(['cube'], args.output)
+        self.assertEqual(65, cdl_convert.config.LUT_SIZE)
+
+    #==========================================================================
+
+    def testBadLUTSize(self):
+        """Tests a LUT size under 2 raises"""
+        sys.argv = ['scriptname', 'inputFile', '--lut-size', '1']
+
+        self.assertRaises(
+            ValueError,
+            main.parse_args
+        )
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
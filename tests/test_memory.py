@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+"""
+Tests the per object memory overhead of parsed nodes
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+from __future__ import print_function
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+CORRECTIONS = 200
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def nodes_of(cc):
+    """Returns the nodes a parsed correction is made of"""
+    return [cc, cc.sop_node, cc.sat_node]
+
+
+def slot_names(node):
+    """Returns every slot of a node, through its class hierarchy"""
+    names = set()
+    for cls in type(node).__mro__:
+        names.update(getattr(cls, '__slots__', ()))
+    return names
+
+
+def unslotted_copy(node):
+    """Returns an Unslotted holding the same attributes as node"""
+    unslotted = Unslotted()
+    for name in slot_names(node):
+        if hasattr(node, name):
+            setattr(unslotted, name, getattr(node, name))
+    return unslotted
+
+#==============================================================================
+# CLASSES
+#==============================================================================
+
+
+class Unslotted(object):  # pylint: disable=R0903
+    """Holds whatever attributes it's given in a __dict__"""
+    pass
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+class TestNodeSlots(unittest.TestCase):
+    """Tests node classes keep their attributes in __slots__"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cc = cdl_convert.ColorCorrection('shot1')
+        self.cc.slope = (1.1, 1.2, 1.3)
+        self.cc.sat = 0.9
+        self.decision = cdl_convert.ColorDecision(
+            self.cc, cdl_convert.MediaRef('/show/shot1/shot1.0001.dpx')
+        )
+        self.collection = cdl_convert.ColorCollection()
+        self.collection.set_to_cdl()
+        self.collection.append_child(self.decision)
+
+        self.nodes = [
+            self.cc,
+            self.cc.sop_node,
+            self.cc.sat_node,
+            self.decision,
+            self.decision.media_ref,
+            cdl_convert.ColorCorrectionRef('shot1'),
+            self.collection,
+        ]
+
+    def tearDown(self):
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testNoInstanceDict(self):
+        """Tests no node instance carries a __dict__"""
+        for node in self.nodes:
+            self.assertFalse(
+                hasattr(node, '__dict__'),
+                '{0} has a __dict__'.format(type(node).__name__)
+            )
+
+    #==========================================================================
+
+    def testUnknownAttribute(self):
+        """Tests setting an attribute that isn't slotted raises"""
+        for node in self.nodes:
+            self.assertRaises(
+                AttributeError, setattr, node, 'banana', 'apple'
+            )
+
+    #==========================================================================
+
+    def testOutputUnchanged(self):
+        """Tests a slotted collection still writes its XML"""
+        self.assertTrue(b'<SOPNode>' in self.collection.xml)
+        self.assertTrue(b'<MediaRef ' in self.collection.xml)
+
+    #==========================================================================
+
+    def testSmallerThanDict(self):
+        """Tests each node is smaller than the same attributes in a __dict__"""
+        for node in self.nodes:
+            unslotted = unslotted_copy(node)
+
+            slotted_size = sys.getsizeof(node)
+            dict_size = (
+                sys.getsizeof(unslotted) + sys.getsizeof(unslotted.__dict__)
+            )
+            self.assertTrue(
+                slotted_size < dict_size,
+                '{0} takes {1} bytes, {2} with a __dict__'.format(
+                    type(node).__name__, slotted_size, dict_size
+                )
+            )
+
+
+@unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+class TestParsedSize(unittest.TestCase):
+    """Measures the bytes each parsed correction keeps alive"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        col = cdl_convert.ColorCollection()
+        for i in range(CORRECTIONS):
+            cc = cdl_convert.ColorCorrection('shot{0}'.format(i))
+            cc.slope = (1.1, 1.2, 1.3)
+            cc.offset = (0.01, 0.02, 0.03)
+            cc.power = (0.9, 1.0, 1.1)
+            cc.sat = 0.9
+            col.append_child(cc)
+
+        ccc_file, self.path = tempfile.mkstemp(suffix='.ccc')
+        os.close(ccc_file)
+        col._file_out = self.path
+        cdl_convert.write_ccc(col)
+        cdl_convert.reset_all()
+
+    def tearDown(self):
+        os.remove(self.path)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testBytesPerCorrection(self):
+        """Tests slots and lazy desc lists shrink each parsed correction"""
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            col = cdl_convert.parse_ccc(self.path)
+            parsed = tracemalloc.get_traced_memory()[0] - start
+            ccs = col.color_corrections
+
+            # The desc lists of every node, as they were before being
+            # created lazily.
+            start = tracemalloc.get_traced_memory()[0]
+            for cc in ccs:
+                for node in nodes_of(cc):
+                    node.desc  # pylint: disable=W0104
+            descs = tracemalloc.get_traced_memory()[0] - start
+
+            # The same nodes holding their attributes in a __dict__, as they
+            # would without slots.
+            start = tracemalloc.get_traced_memory()[0]
+            unslotted = [
+                unslotted_copy(node) for cc in ccs for node in nodes_of(cc)
+            ]
+            dicts = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        slots = sum(
+            sys.getsizeof(node) for cc in ccs for node in nodes_of(cc)
+        )
+
+        per_cc = parsed / float(CORRECTIONS)
+        eager = (parsed + descs) / float(CORRECTIONS)
+        baseline = (parsed + descs - slots + dicts) / float(CORRECTIONS)
+        print(
+            'Bytes per parsed correction: {0:.0f} without slots, {1:.0f} '
+            'with slots, {2:.0f} with lazy desc lists'.format(
+                baseline, eager, per_cc
+            )
+        )
+
+        self.assertEqual(CORRECTIONS * 3, len(unslotted))
+        self.assertTrue(eager < baseline)
+        self.assertTrue(per_cc < eager)
+
+    #==========================================================================
+
+    def testWritingKeepsDescUnset(self):
+        """Tests building XML doesn't create empty desc lists"""
+        col = cdl_convert.parse_ccc(self.path)
+        col.xml  # pylint: disable=W0104
+
+        for cc in col.color_corrections:
+            for node in nodes_of(cc):
+                self.assertTrue(node._desc is None)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+"""
+Tests the output sinks writers can hand their output to
+
+REQUIREMENTS:
+
+mock
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import json
+import os
+import shutil
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+import sys
+import tarfile
+import tempfile
+import threading
+import unittest
+import zipfile
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert
+from cdl_convert import cdl_convert as main
+from cdl_convert import sink, write
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+
+class TestSinks(unittest.TestCase):
+    """Tests writers hand their output to the active sink"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.ccc = cdl_convert.ColorCollection()
+        for i in range(5):
+            cc = cdl_convert.ColorCorrection('shot{0:02d}'.format(i))
+            cc.slope = (1.0 + i / 10.0, 1.1, 1.2)
+            cc.determine_dest('cc', self.root)
+            self.ccc.append_child(cc)
+        self.ccc._file_out = os.path.join(self.root, 'reel1.ccc')
+        self.ccs = self.ccc.color_corrections
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.config.ATOMIC_WRITES = False
+        shutil.rmtree(self.root)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testZip(self):
+        """Tests every output and the index are written into one zip"""
+        archive = os.path.join(self.root, 'reel1.zip')
+        with cdl_convert.ZipSink(archive) as zip_sink:
+            self.assertTrue(sink.active_sink() is zip_sink)
+            for cc in self.ccs:
+                cdl_convert.write_cc(cc)
+            cdl_convert.write_ccc(self.ccc)
+        self.assertEqual(None, sink.active_sink())
+
+        self.assertEqual(['reel1.zip'], os.listdir(self.root))
+        with zipfile.ZipFile(archive) as zip_file:
+            self.assertEqual(
+                ['shot0{0}.cc'.format(i) for i in range(5)] +
+                ['reel1.ccc', 'index.json'],
+                zip_file.namelist()
+            )
+            self.assertEqual(self.ccs[3].xml_root, zip_file.read('shot03.cc'))
+            self.assertEqual(self.ccc.xml_root, zip_file.read('reel1.ccc'))
+            index = json.loads(zip_file.read('index.json').decode('utf-8'))
+
+        self.assertEqual(zip_sink.index, index)
+        self.assertEqual(['shot02.cc', 'reel1.ccc'], index['shot02'])
+
+    #==========================================================================
+
+    def testTar(self):
+        """Tests a .tgz sink writes a gzipped tar"""
+        archive = os.path.join(self.root, 'reel1.tgz')
+        with cdl_convert.TarSink(archive):
+            for cc in self.ccs:
+                cdl_convert.write_rnh_cdl(cc)
+
+        with tarfile.open(archive, 'r:gz') as tar_file:
+            self.assertEqual(
+                ['shot0{0}.cc'.format(i) for i in range(5)] + ['index.json'],
+                tar_file.getnames()
+            )
+            self.assertEqual(
+                b'1.4 1.1 1.2 0.0 0.0 0.0 1.0 1.0 1.0 1.0',
+                tar_file.extractfile('shot04.cc').read()
+            )
+
+    #==========================================================================
+
+    def testMemberNames(self):
+        """Tests members are relative to the directory, or just filenames"""
+        archive_sink = cdl_convert.MemorySink(self.root)
+
+        self.assertEqual(
+            'cc/shot01.cc',
+            archive_sink.member(os.path.join(self.root, 'cc', 'shot01.cc'))
+        )
+        self.assertEqual(
+            'shot01.cc',
+            archive_sink.member(os.path.join(self.root, '..', 'shot01.cc'))
+        )
+
+    #==========================================================================
+
+    def testAbandoned(self):
+        """Tests an error leaves no archive behind with atomic writes"""
+        cdl_convert.config.ATOMIC_WRITES = True
+        archive = os.path.join(self.root, 'reel1.zip')
+
+        def write_all():
+            with cdl_convert.ZipSink(archive):
+                cdl_convert.write_cc(self.ccs[0])
+                raise ValueError('bad grade')
+
+        self.assertRaises(ValueError, write_all)
+        self.assertEqual([], os.listdir(self.root))
+        self.assertEqual(None, sink.active_sink())
+
+    #==========================================================================
+
+    def testUnused(self):
+        """Tests an archive sink opens nothing until it's used"""
+        cdl_convert.config.ATOMIC_WRITES = True
+        archive = os.path.join(self.root, 'reel1.zip')
+
+        unused = cdl_convert.ZipSink(archive)
+        self.assertEqual([], os.listdir(self.root))
+        unused.close()
+        self.assertEqual([], os.listdir(self.root))
+
+        added = cdl_convert.ZipSink(archive)
+        added.add(self.ccs[0].file_out, b'data', ['shot00'])
+        added.close()
+        with zipfile.ZipFile(archive) as zip_file:
+            self.assertEqual(b'data', zip_file.read('shot00.cc'))
+
+    #==========================================================================
+
+    def testDirectory(self):
+        """Tests a directory sink writes files as usual, plus an index"""
+        index_path = os.path.join(self.root, 'reel1.index.json')
+        with cdl_convert.DirectorySink(self.root, index_path):
+            write.write_many(self.ccs, 'cc', workers=2)
+
+        for cc in self.ccs:
+            with open(cc.file_out, 'rb') as cc_file:
+                self.assertEqual(cc.xml_root, cc_file.read())
+        with open(index_path) as index_file:
+            self.assertEqual(
+                dict(
+                    ('shot0{0}'.format(i), ['shot0{0}.cc'.format(i)])
+                    for i in range(5)
+                ),
+                json.load(index_file)
+            )
+
+    #==========================================================================
+
+    def testMemory(self):
+        """Tests a memory sink keeps outputs without writing them"""
+        with cdl_convert.MemorySink(self.root) as memory:
+            cdl_convert.write_cc(self.ccs[1])
+
+        self.assertEqual([], os.listdir(self.root))
+        self.assertEqual(
+            [(self.ccs[1].file_out, self.ccs[1].xml_root, ['shot01'])],
+            memory.outputs
+        )
+        self.assertRaises(
+            ValueError,
+            memory.add, self.ccs[2].file_out, b'', ['shot02']
+        )
+
+    #==========================================================================
+
+    def testThreadLocal(self):
+        """Tests a sink is only active on the thread that entered it"""
+        seen = []
+
+        def write_other():
+            """Writes a correction from another thread"""
+            seen.append(sink.active_sink())
+            cdl_convert.write_cc(self.ccs[4])
+
+        with cdl_convert.MemorySink(self.root) as memory:
+            thread = threading.Thread(target=write_other)
+            thread.start()
+            thread.join()
+            write.write_many(self.ccs[:4], 'cc', workers=2)
+
+        self.assertEqual([None], seen)
+        self.assertEqual(['shot04.cc'], os.listdir(self.root))
+        self.assertEqual(
+            sorted(cc.file_out for cc in self.ccs[:4]),
+            sorted(filepath for filepath, data, ids in memory.outputs)
+        )
+
+    #==========================================================================
+
+    def testAbstract(self):
+        """Tests sinks must implement how they store outputs"""
+        self.assertRaises(TypeError, cdl_convert.OutputSink, self.root)
+        self.assertRaises(
+            TypeError, sink._ArchiveSink, os.path.join(self.root, 'a.zip')
+        )
+        self.assertEqual([], os.listdir(self.root))
+
+    #==========================================================================
+
+    def testProcesses(self):
+        """Tests writer processes send their outputs back to the sink"""
+        archive = os.path.join(self.root, 'reel1.zip')
+        with cdl_convert.ZipSink(archive):
+            write.write_many(self.ccs, 'cc', workers=2, processes=True)
+
+        self.assertEqual(['reel1.zip'], os.listdir(self.root))
+        with zipfile.ZipFile(archive) as zip_file:
+            for cc in self.ccs:
+                self.assertEqual(
+                    cc.xml_root, zip_file.read(cc.id + '.cc')
+                )
+
+
+class TestSinkScript(unittest.TestCase):
+    """Tests the --sink script option"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        ccc = cdl_convert.ColorCollection()
+        for i in range(3):
+            cc = cdl_convert.ColorCorrection('shot{0:02d}'.format(i))
+            cc.slope = (1.0 + i / 10.0, 1.1, 1.2)
+            ccc.append_child(cc)
+        ccc._file_out = os.path.join(self.root, 'reel1.ccc')
+        cdl_convert.write_ccc(ccc)
+        cdl_convert.reset_all()
+
+        self.dest = os.path.join(self.root, 'out')
+        self.sysargv = sys.argv
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    #==========================================================================
+
+    def tearDown(self):
+        sys.argv = self.sysargv
+        sys.stdout = self.stdout
+        shutil.rmtree(self.root)
+        cdl_convert.reset_all()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testParseArgs(self):
+        """Tests --sink is picked up, and only takes known sinks"""
+        sys.argv = ['scriptname', 'inputFile', '--sink', 'tgz']
+        self.assertEqual('tgz', main.parse_args().sink)
+
+        sys.argv = ['scriptname', 'inputFile']
+        self.assertEqual(None, main.parse_args().sink)
+
+    #==========================================================================
+
+    def testSingle(self):
+        """Tests --single outputs of an input all go into its archive"""
+        sys.argv = [
+            'scriptname', os.path.join(self.root, 'reel1.ccc'),
+            '-o', 'cc,rcdl', '--single', '-d', self.dest, '--sink', 'zip'
+        ]
+
+        self.assertEqual(0, main.main())
+
+        self.assertEqual(['reel1.zip'], os.listdir(self.dest))
+        with zipfile.ZipFile(os.path.join(self.dest, 'reel1.zip')) as zip_file:
+            index = json.loads(zip_file.read('index.json').decode('utf-8'))
+        self.assertEqual(['shot01.cc', 'shot01.rcdl'], index['shot01'])
+
+    #==========================================================================
+
+    def testNoOutput(self):
+        """Tests no archive is written on a dry run"""
+        sys.argv = [
+            'scriptname', os.path.join(self.root, 'reel1.ccc'),
+            '--single', '-d', self.root, '--sink', 'zip', '--no-output'
+        ]
+
+        self.assertEqual(0, main.main())
+
+        self.assertEqual(['reel1.ccc'], os.listdir(self.root))
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()